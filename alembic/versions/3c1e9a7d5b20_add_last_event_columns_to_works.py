@@ -0,0 +1,60 @@
+"""Add last event columns to works.
+
+Revision ID: 3c1e9a7d5b20
+Revises: 74f21b46ee37
+Create Date: 2026-10-18 11:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c1e9a7d5b20"
+down_revision: Union[str, None] = "74f21b46ee37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "api_works", sa.Column("last_event_date", sa.Date(), nullable=True)
+    )
+    op.add_column(
+        "api_works",
+        sa.Column("last_event_mileage", sa.Integer(), nullable=True),
+    )
+    op.add_column(
+        "api_works",
+        sa.Column(
+            "events_count", sa.Integer(), server_default="0", nullable=False
+        ),
+    )
+    op.execute(
+        """
+        UPDATE api_works
+        SET last_event_date = latest.work_date,
+            last_event_mileage = latest.mileage,
+            events_count = latest.total
+        FROM (
+            SELECT work_id, work_date, mileage,
+                   row_number() OVER (
+                       PARTITION BY work_id
+                       ORDER BY work_date DESC, mileage DESC, id DESC
+                   ) AS position,
+                   count(*) OVER (PARTITION BY work_id) AS total
+            FROM api_work_events
+        ) AS latest
+        WHERE api_works.id = latest.work_id AND latest.position = 1
+        """
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("api_works") as batch_op:
+        batch_op.drop_column("events_count")
+        batch_op.drop_column("last_event_mileage")
+        batch_op.drop_column("last_event_date")
@@ -0,0 +1,54 @@
+"""Add foreign key and composite indexes.
+
+Revision ID: 8f2d4b6a1c37
+Revises: 3c1e9a7d5b20
+Create Date: 2026-10-18 12:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8f2d4b6a1c37"
+down_revision: Union[str, None] = "3c1e9a7d5b20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        op.f("ix_api_vehicles_owner_id"),
+        "api_vehicles",
+        ["owner_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_api_works_vehicle_id", "api_works", ["vehicle_id"], unique=False
+    )
+    op.create_index(
+        "ix_api_work_events_work_id_mileage",
+        "api_work_events",
+        ["work_id", "mileage"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_api_mileage_events_vehicle_id_mileage_date",
+        "api_mileage_events",
+        ["vehicle_id", "mileage_date"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_api_mileage_events_vehicle_id_mileage_date",
+        table_name="api_mileage_events",
+    )
+    op.drop_index(
+        "ix_api_work_events_work_id_mileage", table_name="api_work_events"
+    )
+    op.drop_index("ix_api_works_vehicle_id", table_name="api_works")
+    op.drop_index(op.f("ix_api_vehicles_owner_id"), table_name="api_vehicles")
@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 
 from .auth.views import router as jwt_router
+from .export.views import router as export_router
+from .maintenance.views import router as maintenance_router
 from .mileage_events.views import router as mileage_event_router
 from .users.views import router as users_router
 from .vehicles.views import router as vehicle_router
@@ -16,3 +18,5 @@ router.include_router(router=workpattern_router)
 router.include_router(router=works_router)
 router.include_router(router=work_event_router)
 router.include_router(router=mileage_event_router)
+router.include_router(router=export_router)
+router.include_router(router=maintenance_router)
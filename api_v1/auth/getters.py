@@ -2,7 +2,9 @@ from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
 from jwt import ExpiredSignatureError, InvalidTokenError
 from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from api_v1.users.cache import user_cache
 from api_v1.users.crud import get_user_by_username
 from auth.utils import decode_jwt
 from core.config import settings
@@ -22,15 +24,17 @@ oauth_token = OAuth2PasswordBearer(
 )
 
 
-async def get_user_from_db_by_username(username: str) -> UserSchema | None:
-    async for db_session in db_handler.get_db():
-        async with db_session as session:
-            user = await get_user_by_username(
-                session=session, username=username
-            )
+async def get_user_from_db_by_username(
+    username: str, session: AsyncSession
+) -> UserSchema | None:
+    if cached_user := user_cache.get(username):
+        return cached_user
+    user = await get_user_by_username(session=session, username=username)
     if not user:
         return None
-    return UserSchema.model_validate(user)
+    user_schema = UserSchema.model_validate(user)
+    user_cache.set(username, user_schema)
+    return user_schema
 
 
 async def get_payload_from_token(
@@ -47,27 +51,43 @@ async def get_payload_from_token(
     return payload
 
 
-async def get_active_user_from_payload(
-    payload: dict = Depends(get_payload_from_token),
+async def get_user_from_payload(
+    payload: dict, session: AsyncSession, needed_token_type: str
 ) -> UserSchema:
+    username = None
     if await token_type_validation(
-        payload=payload, needed_token_type=ACCESS_TOKEN_TYPE
+        payload=payload, needed_token_type=needed_token_type
     ):
         if username := payload.get("username"):
-            if user := await get_user_from_db_by_username(username):
+            if user := await get_user_from_db_by_username(username, session):
                 return user
     logger.error(f"User {username!r} not found in db or token type incorrect.")
     raise http_unauth_exception
 
 
+async def get_active_user_from_payload(
+    payload: dict = Depends(get_payload_from_token),
+    session: AsyncSession = Depends(db_handler.get_db),
+) -> UserSchema:
+    return await get_user_from_payload(
+        payload=payload, session=session, needed_token_type=ACCESS_TOKEN_TYPE
+    )
+
+
+async def get_active_user_from_payload_read_only(
+    payload: dict = Depends(get_payload_from_token),
+    session: AsyncSession = Depends(db_handler.get_read_db),
+) -> UserSchema:
+    """Same lookup on the read session, shared with the route's own."""
+    return await get_user_from_payload(
+        payload=payload, session=session, needed_token_type=ACCESS_TOKEN_TYPE
+    )
+
+
 async def get_active_user_from_payload_for_refresh(
     payload: dict = Depends(get_payload_from_token),
+    session: AsyncSession = Depends(db_handler.get_read_db),
 ) -> UserSchema:
-    if await token_type_validation(
-        payload=payload, needed_token_type=REFRESH_TOKEN_TYPE
-    ):
-        if username := payload.get("username"):
-            if user := await get_user_from_db_by_username(username):
-                return user
-    logger.error(f"User {username!r} not found in db or token type incorrect.")
-    raise http_unauth_exception
+    return await get_user_from_payload(
+        payload=payload, session=session, needed_token_type=REFRESH_TOKEN_TYPE
+    )
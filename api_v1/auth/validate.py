@@ -1,21 +1,31 @@
 from fastapi import Depends, Form
 from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from auth.password_operators import password_validation
+from auth.password_operators import password_service
+from core.database import db_handler
 from core.schemas.users import UserSchema
 
 from .exceptions import http_forbidden_exception, http_unauth_exception
-from .getters import get_active_user_from_payload, get_user_from_db_by_username
+from .getters import (
+    get_active_user_from_payload,
+    get_active_user_from_payload_read_only,
+    get_user_from_db_by_username,
+)
 
 
 async def auth_user_validate(
-    username: str = Form(), password: str = Form()
+    username: str = Form(),
+    password: str = Form(),
+    session: AsyncSession = Depends(db_handler.get_read_db),
 ) -> UserSchema:
-    if not (user := await get_user_from_db_by_username(username)):
+    if not (user := await get_user_from_db_by_username(username, session)):
         logger.error(f"User {username!r} not found in db.")
         raise http_unauth_exception
 
-    if not password_validation(password=password, hash=user.password):
+    if not await password_service.verify(
+        password=password, hash=user.password
+    ):
         logger.error(f"User {username!r} password incorrect.")
         raise http_unauth_exception
     elif not user.is_active:
@@ -32,3 +42,10 @@ async def get_current_active_user(
         return user
     logger.error(f"Inactive user {user.username!r} try to login.")
     raise http_forbidden_exception
+
+
+async def get_current_active_user_read_only(
+    user: UserSchema = Depends(get_active_user_from_payload_read_only),
+) -> UserSchema:
+    """For routes that only read: auth reuses their read session."""
+    return await get_current_active_user(user=user)
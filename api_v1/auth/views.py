@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Cookie, Depends
 from fastapi.responses import JSONResponse
 from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.database import db_handler
 from core.schemas.users import UserSchema
 
 from .exceptions import http_unauth_exception
@@ -12,7 +14,10 @@ from .getters import (
     get_payload_from_token,
 )
 from .token import TokenInfo, create_access_token, create_refresh_token
-from .validate import auth_user_validate, get_current_active_user
+from .validate import (
+    auth_user_validate,
+    get_current_active_user_read_only,
+)
 
 router = APIRouter(
     prefix=ROUTER_PREFIX,
@@ -38,11 +43,12 @@ async def auth_user_jwt(user: UserSchema = Depends(auth_user_validate)):
 )
 async def auth_user_refresh_access_token(
     refresh_token: str | None = Cookie(default=None),
+    session: AsyncSession = Depends(db_handler.get_read_db),
 ):
     if refresh_token:
         payload: dict = await get_payload_from_token(token=refresh_token)
         user: UserSchema = await get_active_user_from_payload_for_refresh(
-            payload
+            payload=payload, session=session
         )
         if user.is_active:
             access_token = await create_access_token(user)
@@ -53,7 +59,7 @@ async def auth_user_refresh_access_token(
 @router.get("/users/me/")
 async def auth_user_get_self_info(
     payload: dict = Depends(get_payload_from_token),
-    user: UserSchema = Depends(get_current_active_user),
+    user: UserSchema = Depends(get_current_active_user_read_only),
 ):
     return {
         "username": user.username,
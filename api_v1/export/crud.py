@@ -0,0 +1,62 @@
+import datetime
+
+from sqlalchemy import Select, select
+
+from core.models import MileageEvent, Vehicle, Work, WorkEvent
+
+
+def _owner_vehicle_ids(owner_id: int) -> Select:
+    return select(Vehicle.id).where(Vehicle.owner_id == owner_id)
+
+
+def vehicles_statement(
+    since: datetime.date | None = None, owner_id: int | None = None
+) -> Select:
+    table = Vehicle.__table__
+    statement = select(table).order_by(table.c.id)
+    if since is not None:
+        statement = statement.where(
+            table.c.vehicle_last_update_date >= since
+        )
+    if owner_id is not None:
+        statement = statement.where(table.c.owner_id == owner_id)
+    return statement
+
+
+def works_statement(owner_id: int | None = None) -> Select:
+    table = Work.__table__
+    statement = select(table).order_by(table.c.id)
+    if owner_id is not None:
+        statement = statement.where(
+            table.c.vehicle_id.in_(_owner_vehicle_ids(owner_id))
+        )
+    return statement
+
+
+def mileage_events_statement(
+    since: datetime.date | None = None, owner_id: int | None = None
+) -> Select:
+    table = MileageEvent.__table__
+    statement = select(table).order_by(table.c.id)
+    if since is not None:
+        statement = statement.where(table.c.mileage_date >= since)
+    if owner_id is not None:
+        statement = statement.where(
+            table.c.vehicle_id.in_(_owner_vehicle_ids(owner_id))
+        )
+    return statement
+
+
+def work_events_statement(
+    since: datetime.date | None = None, owner_id: int | None = None
+) -> Select:
+    table = WorkEvent.__table__
+    statement = select(table).order_by(table.c.id)
+    if since is not None:
+        statement = statement.where(table.c.work_date >= since)
+    if owner_id is not None:
+        owner_works = select(Work.id).where(
+            Work.vehicle_id.in_(_owner_vehicle_ids(owner_id))
+        )
+        statement = statement.where(table.c.work_id.in_(owner_works))
+    return statement
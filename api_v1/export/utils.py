@@ -0,0 +1,70 @@
+import csv
+import datetime
+import io
+import json
+from enum import Enum
+from typing import AsyncIterator, Literal
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _json_default(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value):
+    return value.value if isinstance(value, Enum) else value
+
+
+def ndjson_chunk(keys: list[str], rows: list) -> str:
+    return "".join(
+        json.dumps(dict(zip(keys, row)), default=_json_default) + "\n"
+        for row in rows
+    )
+
+
+def csv_chunk(rows: list, buffer: io.StringIO) -> str:
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    chunk = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return chunk
+
+
+async def stream_export(
+    session_factory: async_sessionmaker,
+    statement: Select,
+    export_format: ExportFormat,
+    yield_per: int,
+) -> AsyncIterator[str]:
+    """Yield the statement rows serialized one partition at a time.
+
+    The session is opened here rather than taken from a dependency so
+    it stays open for as long as the response is being sent.
+    """
+    async with session_factory() as session:
+        result = await session.stream(
+            statement.execution_options(yield_per=yield_per)
+        )
+        keys = list(result.keys())
+        buffer = io.StringIO()
+        if export_format == "csv":
+            yield csv_chunk([keys], buffer)
+        async for rows in result.partitions():
+            if export_format == "csv":
+                yield csv_chunk(rows, buffer)
+            else:
+                yield ndjson_chunk(keys, rows)
@@ -0,0 +1,81 @@
+import datetime
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+
+from core.config import settings
+from core.database import db_handler
+
+from . import crud
+from .utils import MEDIA_TYPES, ExportFormat, stream_export
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+
+def export_response(
+    statement: Select, name: str, export_format: ExportFormat
+) -> StreamingResponse:
+    return StreamingResponse(
+        stream_export(
+            session_factory=db_handler.read_session_factory,
+            statement=statement,
+            export_format=export_format,
+            yield_per=settings.export.yield_per,
+        ),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{name}.{export_format}"'
+            )
+        },
+    )
+
+
+@router.get("/vehicles")
+async def export_vehicles(
+    since: datetime.date | None = None,
+    owner_id: int | None = None,
+    format: ExportFormat = "ndjson",
+):
+    return export_response(
+        crud.vehicles_statement(since=since, owner_id=owner_id),
+        "vehicles",
+        format,
+    )
+
+
+@router.get("/works")
+async def export_works(
+    owner_id: int | None = None,
+    format: ExportFormat = "ndjson",
+):
+    return export_response(
+        crud.works_statement(owner_id=owner_id), "works", format
+    )
+
+
+@router.get("/work_events")
+async def export_work_events(
+    since: datetime.date | None = None,
+    owner_id: int | None = None,
+    format: ExportFormat = "ndjson",
+):
+    return export_response(
+        crud.work_events_statement(since=since, owner_id=owner_id),
+        "work_events",
+        format,
+    )
+
+
+@router.get("/mileage_events")
+async def export_mileage_events(
+    since: datetime.date | None = None,
+    owner_id: int | None = None,
+    format: ExportFormat = "ndjson",
+):
+    return export_response(
+        crud.mileage_events_statement(since=since, owner_id=owner_id),
+        "mileage_events",
+        format,
+    )
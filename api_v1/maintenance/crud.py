@@ -0,0 +1,57 @@
+from sqlalchemy import Integer, Row, Select, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.models import Vehicle, Work
+
+# julianday() of 0001-01-01 is 1721425.5 and its date.toordinal() is 1.
+JULIANDAY_ORDINAL_OFFSET = 1721424.5
+
+
+async def get_vehicle_works_with_last_event(
+    session: AsyncSession, vehicle_id: int
+) -> list[Row]:
+    """Vehicle works with their last event columns, in one statement.
+
+    The vehicle is the outer side of the join, so a vehicle without
+    works gives one row with empty work columns and a missing vehicle
+    gives no rows.
+    """
+    statement = (
+        select(
+            Vehicle.vehicle_mileage,
+            Work.id.label("work_id"),
+            Work.title,
+            Work.work_type,
+            Work.interval_km,
+            Work.interval_month,
+            Work.last_event_date,
+            Work.last_event_mileage,
+        )
+        .select_from(Vehicle)
+        .outerjoin(Work, Work.vehicle_id == Vehicle.id)
+        .where(Vehicle.id == vehicle_id)
+    )
+    return list((await session.execute(statement)).all())
+
+
+def fleet_due_statement(owner_id: int | None = None) -> Select:
+    """Columns for the fleet due report, one row per work.
+
+    The last event date comes back as a date ordinal so it can go into
+    a NumPy array without building date objects.
+    """
+    statement = select(
+        Work.id.label("work_id"),
+        Work.vehicle_id,
+        Work.interval_km,
+        Work.interval_month,
+        Vehicle.vehicle_mileage,
+        Work.last_event_mileage,
+        cast(
+            func.julianday(Work.last_event_date) - JULIANDAY_ORDINAL_OFFSET,
+            Integer,
+        ).label("last_event_ordinal"),
+    ).join(Vehicle, Vehicle.id == Work.vehicle_id)
+    if owner_id is not None:
+        statement = statement.where(Vehicle.owner_id == owner_id)
+    return statement
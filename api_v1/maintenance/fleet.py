@@ -0,0 +1,187 @@
+import datetime
+import json
+from dataclasses import dataclass
+from typing import Iterator
+
+import numpy as np
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# date.toordinal() of 1970-01-01, the numpy datetime64 epoch.
+EPOCH_ORDINAL = 719163
+
+COLUMNS = (
+    "work_id",
+    "vehicle_id",
+    "interval_km",
+    "interval_month",
+    "vehicle_mileage",
+    "last_event_mileage",
+    "last_event_ordinal",
+)
+
+
+@dataclass
+class FleetColumns:
+    """Fleet works as NumPy columns; NaN marks a missing value."""
+
+    work_id: np.ndarray
+    vehicle_id: np.ndarray
+    interval_km: np.ndarray
+    interval_month: np.ndarray
+    vehicle_mileage: np.ndarray
+    last_event_mileage: np.ndarray
+    last_event_ordinal: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.work_id)
+
+
+@dataclass
+class FleetDue:
+    work_id: np.ndarray
+    vehicle_id: np.ndarray
+    due_mileage: np.ndarray
+    remaining_km: np.ndarray
+    due_date: np.ndarray
+    remaining_days: np.ndarray
+    urgency: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.work_id)
+
+
+async def load_fleet_columns(
+    session: AsyncSession, statement: Select, yield_per: int = 50000
+) -> FleetColumns:
+    """Read fleet_due_statement rows into one array per column."""
+    chunks: dict[str, list[np.ndarray]] = {name: [] for name in COLUMNS}
+    result = await session.stream(
+        statement.execution_options(yield_per=yield_per)
+    )
+    async for rows in result.partitions():
+        for name, values in zip(COLUMNS, zip(*rows)):
+            chunks[name].append(np.array(values, dtype=np.float64))
+    columns = {
+        name: (
+            np.concatenate(arrays) if arrays else np.empty(0, np.float64)
+        )
+        for name, arrays in chunks.items()
+    }
+    for name in ("work_id", "vehicle_id", "vehicle_mileage"):
+        columns[name] = columns[name].astype(np.int64)
+    return FleetColumns(**columns)
+
+
+def add_months(dates: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """Vectorized utils.add_months over datetime64[D] arrays."""
+    month_start = dates.astype("datetime64[M]")
+    day = (dates - month_start.astype("datetime64[D]")).astype(np.int64)
+    target = month_start + months.astype("timedelta64[M]")
+    target_days = target.astype("datetime64[D]")
+    month_length = (
+        (target + np.timedelta64(1, "M")).astype("datetime64[D]")
+        - target_days
+    ).astype(np.int64)
+    return target_days + np.minimum(day, month_length - 1).astype(
+        "timedelta64[D]"
+    )
+
+
+def compute_fleet_due(
+    columns: FleetColumns, today: datetime.date
+) -> FleetDue:
+    """utils.compute_work_due for every row at once."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        has_km = np.nan_to_num(columns.interval_km) > 0
+        due_mileage = np.where(
+            has_km,
+            np.nan_to_num(columns.last_event_mileage) + columns.interval_km,
+            np.nan,
+        )
+        remaining_km = due_mileage - columns.vehicle_mileage
+        km_share = remaining_km / columns.interval_km
+
+        has_date = (np.nan_to_num(columns.interval_month) > 0) & ~np.isnan(
+            columns.last_event_ordinal
+        )
+        last_date = (
+            np.where(has_date, columns.last_event_ordinal - EPOCH_ORDINAL, 0)
+            .astype(np.int64)
+            .astype("datetime64[D]")
+        )
+        months = np.where(has_date, columns.interval_month, 0).astype(
+            np.int64
+        )
+        due_days = add_months(last_date, months).astype(np.int64)
+        last_days = last_date.astype(np.int64)
+        today_days = today.toordinal() - EPOCH_ORDINAL
+        due_date = np.where(has_date, due_days, np.nan)
+        remaining_days = due_date - today_days
+        days_share = remaining_days / (due_days - last_days)
+
+        urgency = np.fmin(
+            np.where(has_km, km_share, np.nan),
+            np.where(has_date, days_share, np.nan),
+        )
+    return FleetDue(
+        work_id=columns.work_id,
+        vehicle_id=columns.vehicle_id,
+        due_mileage=due_mileage,
+        remaining_km=remaining_km,
+        due_date=due_date,
+        remaining_days=remaining_days,
+        urgency=urgency,
+    )
+
+
+def select_due(fleet_due: FleetDue, max_urgency: float) -> np.ndarray:
+    """Indexes of works at or below max_urgency, most urgent first."""
+    with np.errstate(invalid="ignore"):
+        (indexes,) = np.nonzero(fleet_due.urgency <= max_urgency)
+    order = np.lexsort(
+        (fleet_due.work_id[indexes], fleet_due.urgency[indexes])
+    )
+    return indexes[order]
+
+
+def _optional_int(value: float) -> int | None:
+    return None if np.isnan(value) else int(value)
+
+
+def iter_fleet_due_ndjson(
+    fleet_due: FleetDue, indexes: np.ndarray, chunk_size: int = 1000
+) -> Iterator[str]:
+    epoch = datetime.date.fromordinal(EPOCH_ORDINAL)
+    for start in range(0, len(indexes), chunk_size):
+        lines = []
+        for index in indexes[start : start + chunk_size].tolist():
+            due_date = fleet_due.due_date[index]
+            urgency = float(fleet_due.urgency[index])
+            lines.append(
+                json.dumps(
+                    {
+                        "work_id": int(fleet_due.work_id[index]),
+                        "vehicle_id": int(fleet_due.vehicle_id[index]),
+                        "due_mileage": _optional_int(
+                            fleet_due.due_mileage[index]
+                        ),
+                        "remaining_km": _optional_int(
+                            fleet_due.remaining_km[index]
+                        ),
+                        "due_date": (
+                            None
+                            if np.isnan(due_date)
+                            else str(
+                                epoch + datetime.timedelta(days=int(due_date))
+                            )
+                        ),
+                        "remaining_days": _optional_int(
+                            fleet_due.remaining_days[index]
+                        ),
+                        "urgency": urgency,
+                        "overdue": urgency <= 0,
+                    }
+                )
+            )
+        yield "\n".join(lines) + "\n"
@@ -0,0 +1,78 @@
+import calendar
+import datetime
+import math
+
+from sqlalchemy import Row
+
+from core.schemas.maintenance import WorkDueSchema
+
+# Due mileage dates further away than this are not forecast.
+MAX_FORECAST_DAYS = 36525
+
+
+def add_months(date: datetime.date, months: int) -> datetime.date:
+    """Shift date by months, clamping the day to the target month."""
+    month_index = date.month - 1 + months
+    year = date.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(date.day, calendar.monthrange(year, month)[1])
+    return date.replace(year=year, month=month, day=day)
+
+
+def compute_work_due(
+    row: Row,
+    vehicle_mileage: int,
+    today: datetime.date,
+    daily_rate: float | None = None,
+) -> WorkDueSchema:
+    """Next due mileage and date of a work from its latest event.
+
+    A work without events counts its mileage interval from zero and
+    has no due date. Urgency is the smallest share of an interval still
+    left: 1 right after the work is done, 0 when it is due, negative
+    when overdue. With the vehicle's forecast daily_rate, the due
+    mileage is also given as the date it should be reached.
+    """
+    work_due = WorkDueSchema(
+        work_id=row.work_id,
+        title=row.title,
+        work_type=row.work_type,
+        interval_km=row.interval_km,
+        interval_month=row.interval_month,
+        last_event_date=row.last_event_date,
+        last_event_mileage=row.last_event_mileage,
+    )
+    shares: list[float] = []
+    if row.interval_km:
+        work_due.due_mileage = (row.last_event_mileage or 0) + row.interval_km
+        work_due.remaining_km = work_due.due_mileage - vehicle_mileage
+        shares.append(work_due.remaining_km / row.interval_km)
+        if daily_rate:
+            days = math.ceil(work_due.remaining_km / daily_rate)
+            if abs(days) <= MAX_FORECAST_DAYS:
+                work_due.due_mileage_date = today + datetime.timedelta(
+                    days=days
+                )
+    if row.interval_month and row.last_event_date:
+        work_due.due_date = add_months(
+            row.last_event_date, row.interval_month
+        )
+        work_due.remaining_days = (work_due.due_date - today).days
+        interval_days = (work_due.due_date - row.last_event_date).days
+        shares.append(work_due.remaining_days / interval_days)
+    if shares:
+        work_due.urgency = min(shares)
+        work_due.overdue = work_due.urgency <= 0
+    return work_due
+
+
+def sort_by_urgency(works_due: list[WorkDueSchema]) -> list[WorkDueSchema]:
+    """Most urgent first; works without intervals go last."""
+    return sorted(
+        works_due,
+        key=lambda work_due: (
+            work_due.urgency is None,
+            work_due.urgency or 0,
+            work_due.work_id,
+        ),
+    )
@@ -0,0 +1,74 @@
+import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api_v1.mileage_events.forecast import mileage_forecaster
+from core.database import db_handler
+from core.schemas.maintenance import VehicleDueSchema
+
+from . import crud, fleet, utils
+
+router = APIRouter(tags=["Maintenance"])
+
+
+@router.get("/vehicle/{vehicle_id}/due", response_model=VehicleDueSchema)
+async def get_vehicle_due(
+    vehicle_id: int,
+    session: AsyncSession = Depends(db_handler.get_read_db),
+):
+    rows = await crud.get_vehicle_works_with_last_event(
+        session=session, vehicle_id=vehicle_id
+    )
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Vehicle with {vehicle_id!r} not found in db.",
+        )
+    vehicle_mileage = rows[0].vehicle_mileage
+    today = datetime.date.today()
+    fit = await mileage_forecaster.get_fit(
+        session=session, vehicle_id=vehicle_id
+    )
+    works_due = [
+        utils.compute_work_due(
+            row=row,
+            vehicle_mileage=vehicle_mileage,
+            today=today,
+            daily_rate=fit.daily_rate,
+        )
+        for row in rows
+        if row.work_id is not None
+    ]
+    return VehicleDueSchema(
+        vehicle_id=vehicle_id,
+        vehicle_mileage=vehicle_mileage,
+        works=utils.sort_by_urgency(works_due),
+    )
+
+
+@router.get("/fleet/due")
+async def get_fleet_due(
+    owner_id: int | None = None,
+    max_urgency: float = 0.1,
+    session: AsyncSession = Depends(db_handler.get_read_db),
+):
+    """Stream NDJSON of fleet works at or below max_urgency.
+
+    Urgency is the share of the service interval left, so the default
+    0.1 returns overdue works and those within the last tenth of their
+    interval, most urgent first.
+    """
+    columns = await fleet.load_fleet_columns(
+        session=session,
+        statement=crud.fleet_due_statement(owner_id=owner_id),
+    )
+    fleet_due = fleet.compute_fleet_due(
+        columns=columns, today=datetime.date.today()
+    )
+    indexes = fleet.select_due(fleet_due=fleet_due, max_urgency=max_urgency)
+    return StreamingResponse(
+        fleet.iter_fleet_due_ndjson(fleet_due=fleet_due, indexes=indexes),
+        media_type="application/x-ndjson",
+    )
@@ -1,10 +1,17 @@
-from sqlalchemy import Result, desc, select
+from collections import defaultdict
+
+from sqlalchemy import Row, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api_v1.vehicles.utils import update_vehicle_mileage_from_event
-from core.models import MileageEvent
+from api_v1.vehicles.utils import (
+    raise_vehicles_mileage,
+    update_vehicle_mileage_from_event,
+)
+from core.models import MileageEvent, Vehicle
+from core.pagination import Page, PageParams, SortKey, paginate
 from core.schemas.mileage_events import (
     MileageEventCreate,
+    MileageEventFilter,
     MileageEventSchema,
     MileageEventUpdate,
 )
@@ -19,10 +26,10 @@ async def get_mileage_event_by_id(
 async def create_mileage_event(
     session: AsyncSession, mileage_event_data: MileageEventCreate
 ) -> MileageEvent:
+    """Add the event and raise vehicle mileage; the caller commits."""
     mileage_event = MileageEvent(**mileage_event_data.model_dump())
     session.add(mileage_event)
-    await session.commit()
-    await session.refresh(mileage_event)
+    await session.flush()
 
     await update_vehicle_mileage_from_event(
         session=session,
@@ -32,18 +39,100 @@ async def create_mileage_event(
     return mileage_event
 
 
+async def create_mileage_events_batch(
+    session: AsyncSession, events_data: list[MileageEventCreate]
+) -> list[int | None]:
+    """Insert events of existing vehicles and raise their mileage.
+
+    Returns the new event id per item, None where the vehicle does not
+    exist. The caller commits.
+    """
+    vehicle_ids = {event.vehicle_id for event in events_data}
+    existing_ids = set(
+        await session.scalars(
+            select(Vehicle.id).where(Vehicle.id.in_(vehicle_ids))
+        )
+    )
+    rows: list[dict] = []
+    mileage_by_vehicle: dict[int, int] = {}
+    for event in events_data:
+        if event.vehicle_id not in existing_ids:
+            continue
+        rows.append(event.model_dump())
+        if event.mileage > mileage_by_vehicle.get(event.vehicle_id, -1):
+            mileage_by_vehicle[event.vehicle_id] = event.mileage
+    if not rows:
+        return [None] * len(events_data)
+    # Without sort_by_parameter_order the rows go in a few multi-row
+    # INSERT .. RETURNING statements, but SQLite returns them in no set
+    # order. Ids are matched back by the inserted values; items with
+    # equal values are interchangeable.
+    returned = await session.execute(
+        insert(MileageEvent.__table__).returning(
+            MileageEvent.id,
+            MileageEvent.vehicle_id,
+            MileageEvent.mileage_date,
+            MileageEvent.mileage,
+        ),
+        rows,
+    )
+    ids_by_values: dict[tuple, list[int]] = defaultdict(list)
+    for event_id, *values in returned:
+        ids_by_values[tuple(values)].append(event_id)
+    await raise_vehicles_mileage(
+        session=session, mileage_by_vehicle=mileage_by_vehicle
+    )
+    return [
+        (
+            ids_by_values[
+                (event.vehicle_id, event.mileage_date, event.mileage)
+            ].pop()
+            if event.vehicle_id in existing_ids
+            else None
+        )
+        for event in events_data
+    ]
+
+
+MILEAGE_EVENTS_SORT_KEYS = [
+    SortKey(MileageEvent.mileage_date, descending=True),
+    SortKey(MileageEvent.id, descending=True),
+]
+
+
 async def get_vehicle_mileage_events(
-    vehicle_id: int, session: AsyncSession
-) -> list[MileageEvent]:
+    vehicle_id: int,
+    session: AsyncSession,
+    page: PageParams = PageParams(),
+    filters: MileageEventFilter = MileageEventFilter(),
+) -> Page:
+    statement = select(MileageEvent).where(
+        MileageEvent.vehicle_id == vehicle_id
+    )
+    if filters.date_from is not None:
+        statement = statement.where(
+            MileageEvent.mileage_date >= filters.date_from
+        )
+    if filters.date_to is not None:
+        statement = statement.where(
+            MileageEvent.mileage_date <= filters.date_to
+        )
+    return await paginate(
+        session, statement, MILEAGE_EVENTS_SORT_KEYS, page
+    )
+
+
+async def get_latest_mileage_readings(
+    session: AsyncSession, vehicle_id: int, limit: int
+) -> list[Row]:
+    """(mileage_date, mileage) of the vehicle, newest first."""
     statement = (
-        select(MileageEvent)
+        select(MileageEvent.mileage_date, MileageEvent.mileage)
         .where(MileageEvent.vehicle_id == vehicle_id)
-        .order_by(desc(getattr(MileageEvent, "mileage_date")))
+        .order_by(MileageEvent.mileage_date.desc(), MileageEvent.id.desc())
+        .limit(limit)
     )
-    result: Result = await session.execute(statement)
-    mileage_events_list: list = list(result.scalars().all())
-
-    return mileage_events_list
+    return list((await session.execute(statement)).all())
 
 
 async def update_mileage_event(
@@ -0,0 +1,119 @@
+import bisect
+import datetime
+import statistics
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.cache import TTLCache
+from core.config import settings
+
+from . import crud
+
+# Readings as (date.toordinal(), mileage), oldest first.
+Readings = tuple[tuple[int, int], ...]
+
+
+@dataclass(frozen=True)
+class MileageFit:
+    """Theil-Sen line through the latest mileage readings of a vehicle."""
+
+    readings: Readings = ()
+    daily_rate: float | None = None
+    intercept: float | None = None
+
+    def predict(self, date: datetime.date) -> int | None:
+        if self.daily_rate is None:
+            return None
+        ordinal = date.toordinal()
+        mileage = round(self.intercept + self.daily_rate * ordinal)
+        last_ordinal, last_mileage = self.readings[-1]
+        if ordinal >= last_ordinal:
+            # The odometer never goes back past the latest reading.
+            mileage = max(mileage, last_mileage)
+        return mileage
+
+
+def fit_readings(readings: Readings) -> MileageFit:
+    """Median of pairwise slopes, so single bad readings do not move it.
+
+    Readings of the same day give no slope; without two distinct days
+    the fit has no rate. A negative rate is clamped to zero.
+    """
+    slopes = [
+        (mileage - other_mileage) / (ordinal - other_ordinal)
+        for index, (ordinal, mileage) in enumerate(readings)
+        for other_ordinal, other_mileage in readings[:index]
+        if ordinal != other_ordinal
+    ]
+    if not slopes:
+        return MileageFit(readings=readings)
+    daily_rate = max(statistics.median(slopes), 0.0)
+    intercept = statistics.median(
+        mileage - daily_rate * ordinal for ordinal, mileage in readings
+    )
+    return MileageFit(
+        readings=readings, daily_rate=daily_rate, intercept=intercept
+    )
+
+
+class MileageForecaster:
+    """Per-vehicle mileage fits over a sliding window of readings.
+
+    A fit is loaded from the latest window_size readings on first use
+    and cached. New readings are merged into the cached window and only
+    that window is refitted. Callers update the cache after the reading
+    is committed, and invalidate it when readings change or go away.
+    """
+
+    def __init__(self, window_size: int, cache: TTLCache):
+        self.window_size = window_size
+        self._fits = cache
+
+    def clear(self) -> None:
+        self._fits.clear()
+
+    def get_stats(self) -> dict[str, int | float]:
+        return self._fits.get_stats()
+
+    def invalidate(self, vehicle_id: int) -> None:
+        self._fits.delete(vehicle_id)
+
+    async def get_fit(
+        self, session: AsyncSession, vehicle_id: int
+    ) -> MileageFit:
+        fit = self._fits.get(vehicle_id)
+        if fit is None:
+            rows = await crud.get_latest_mileage_readings(
+                session=session, vehicle_id=vehicle_id, limit=self.window_size
+            )
+            fit = fit_readings(
+                tuple(
+                    (row.mileage_date.toordinal(), row.mileage)
+                    for row in reversed(rows)
+                )
+            )
+            self._fits.set(vehicle_id, fit)
+        return fit
+
+    def add_reading(
+        self, vehicle_id: int, mileage_date: datetime.date, mileage: int
+    ) -> None:
+        """Merge a committed reading into the cached window, if any."""
+        fit: MileageFit | None = self._fits.get(vehicle_id)
+        if fit is None:
+            return
+        readings = list(fit.readings)
+        bisect.insort(readings, (mileage_date.toordinal(), mileage))
+        self._fits.set(
+            vehicle_id, fit_readings(tuple(readings[-self.window_size :]))
+        )
+
+
+mileage_forecaster = MileageForecaster(
+    window_size=settings.forecast.window_size,
+    cache=TTLCache(
+        maxsize=settings.forecast.cache_size,
+        ttl=settings.forecast.cache_ttl,
+    ),
+)
@@ -0,0 +1,131 @@
+import json
+
+from fastapi import HTTPException, Request, status
+from pydantic import TypeAdapter, ValidationError
+
+from core.config import settings
+from core.schemas.mileage_events import MileageEventCreate
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl")
+
+events_adapter = TypeAdapter(list[MileageEventCreate])
+
+
+def _check_batch_size(size: int) -> None:
+    if size > settings.ingest.mileage_batch_max_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=(
+                "Batch is limited to "
+                f"{settings.ingest.mileage_batch_max_size} mileage events."
+            ),
+        )
+
+
+def _check_batch_bytes(size: int) -> None:
+    if size > settings.ingest.mileage_batch_max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=(
+                "Batch body is limited to "
+                f"{settings.ingest.mileage_batch_max_bytes} bytes."
+            ),
+        )
+
+
+async def read_batch_body(request: Request) -> bytes:
+    """Read the body, refusing an oversized one before it is parsed."""
+    if content_length := request.headers.get("content-length"):
+        if not content_length.isdigit():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid Content-Length header.",
+            )
+        _check_batch_bytes(int(content_length))
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        _check_batch_bytes(len(body))
+    return bytes(body)
+
+
+def _error_message(e: ValidationError) -> str:
+    error = e.errors()[0]
+    location = ".".join(map(str, error["loc"]))
+    return f"{location}: {error['msg']}" if location else error["msg"]
+
+
+def _load_items(body: bytes) -> list:
+    try:
+        items = json.loads(body)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Body is not valid JSON or NDJSON.",
+        )
+    if not isinstance(items, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Expected a JSON array of mileage events.",
+        )
+    return items
+
+
+def validate_batch_items(
+    items: list,
+) -> tuple[dict[int, MileageEventCreate], dict[int, str]]:
+    """Split raw items into valid events and errors, keyed by index."""
+    events: dict[int, MileageEventCreate] = {}
+    errors: dict[int, str] = {}
+    for index, item in enumerate(items):
+        try:
+            events[index] = MileageEventCreate.model_validate(item)
+        except ValidationError as e:
+            errors[index] = _error_message(e)
+    return events, errors
+
+
+def validate_ndjson_lines(
+    body: bytes,
+) -> tuple[int, dict[int, MileageEventCreate], dict[int, str]]:
+    """Validate NDJSON one line at a time, blank lines skipped.
+
+    A line that is not valid JSON fails only its own item; errors name
+    the line number in the body.
+    """
+    lines = [
+        (number, line)
+        for number, line in enumerate(body.splitlines(), start=1)
+        if line.strip()
+    ]
+    _check_batch_size(len(lines))
+    events: dict[int, MileageEventCreate] = {}
+    errors: dict[int, str] = {}
+    for index, (number, line) in enumerate(lines):
+        try:
+            events[index] = MileageEventCreate.model_validate_json(line)
+        except ValidationError as e:
+            errors[index] = f"line {number}: {_error_message(e)}"
+    return len(lines), events, errors
+
+
+def parse_batch_body(
+    body: bytes, content_type: str
+) -> tuple[int, dict[int, MileageEventCreate], dict[int, str]]:
+    """Decode a JSON array or NDJSON body of mileage events.
+
+    Returns the item count, valid events and errors keyed by index. A
+    JSON array is validated in one pass; items are only validated one
+    by one to report errors when that pass fails.
+    """
+    _check_batch_bytes(len(body))
+    if content_type.startswith(NDJSON_MEDIA_TYPES):
+        return validate_ndjson_lines(body)
+    try:
+        events = events_adapter.validate_json(body)
+    except ValidationError:
+        items = _load_items(body)
+        _check_batch_size(len(items))
+        return len(items), *validate_batch_items(items)
+    _check_batch_size(len(events))
+    return len(events), dict(enumerate(events)), {}
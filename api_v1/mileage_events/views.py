@@ -1,15 +1,23 @@
-from fastapi import APIRouter, Depends, status
+from functools import partial
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import db_handler
+from core.pagination import Page, PageParams, get_page_params
 from core.schemas.mileage_events import (
+    MileageEventBatchItem,
+    MileageEventBatchResult,
     MileageEventCreate,
+    MileageEventFilter,
     MileageEventSchema,
     MileageEventUpdate,
 )
 
-from . import crud
+from . import crud, utils
 from .dependencies import get_mileage_work_event_by_id_or_exception
+from .forecast import mileage_forecaster
 
 router = APIRouter(prefix="/mileage_events", tags=["Mileage Events"])
 
@@ -20,20 +28,69 @@ router = APIRouter(prefix="/mileage_events", tags=["Mileage Events"])
 async def create_mileage_event(
     milage_event_data: MileageEventCreate,
     # user: User = Depends(get_current_active_user),
-    session: AsyncSession = Depends(db_handler.get_db),
 ):
-    return await crud.create_mileage_event(
-        session=session, mileage_event_data=milage_event_data
+    mileage_event = await db_handler.writer.submit(
+        partial(
+            crud.create_mileage_event, mileage_event_data=milage_event_data
+        )
+    )
+    mileage_forecaster.add_reading(
+        vehicle_id=mileage_event.vehicle_id,
+        mileage_date=mileage_event.mileage_date,
+        mileage=mileage_event.mileage,
+    )
+    return mileage_event
+
+
+@router.post("/batch", response_model=MileageEventBatchResult)
+async def create_mileage_events_batch(request: Request):
+    """Ingest a JSON array or NDJSON body of mileage events at once."""
+    size, events, errors = utils.parse_batch_body(
+        body=await utils.read_batch_body(request),
+        content_type=request.headers.get("content-type", ""),
+    )
+    new_ids: list[int | None] = []
+    if events:
+        new_ids = await db_handler.writer.submit(
+            partial(
+                crud.create_mileage_events_batch,
+                events_data=list(events.values()),
+            )
+        )
+    results = {
+        index: MileageEventBatchItem(index=index, error=error)
+        for index, error in errors.items()
+    }
+    for index, event_id in zip(events, new_ids):
+        if event_id:
+            event = events[index]
+            mileage_forecaster.add_reading(
+                vehicle_id=event.vehicle_id,
+                mileage_date=event.mileage_date,
+                mileage=event.mileage,
+            )
+        results[index] = MileageEventBatchItem(
+            index=index,
+            id=event_id,
+            error=None if event_id else "Vehicle not found.",
+        )
+    created = sum(1 for item in results.values() if item.id is not None)
+    return MileageEventBatchResult(
+        created=created,
+        failed=size - created,
+        results=[results[index] for index in range(size)],
     )
 
 
-@router.get("/{vehicle_id}/")
+@router.get("/{vehicle_id}/", response_model=Page[MileageEventSchema])
 async def get_vehicle_mileage_events(
     vehicle_id: int,
-    session: AsyncSession = Depends(db_handler.get_db),
+    filters: Annotated[MileageEventFilter, Query()],
+    page: PageParams = Depends(get_page_params),
+    session: AsyncSession = Depends(db_handler.get_read_db),
 ):
     return await crud.get_vehicle_mileage_events(
-        vehicle_id=vehicle_id, session=session
+        vehicle_id=vehicle_id, session=session, page=page, filters=filters
     )
 
 
@@ -45,11 +102,13 @@ async def update_mileage_event(
     ),
     session: AsyncSession = Depends(db_handler.get_db),
 ):
-    return await crud.update_mileage_event(
+    mileage_event = await crud.update_mileage_event(
         session=session,
         mileage_event=mileage_event,
         mileage_event_update=mileage_event_update,
     )
+    mileage_forecaster.invalidate(mileage_event.vehicle_id)
+    return mileage_event
 
 
 @router.delete("/{mileage_event_id}/", status_code=status.HTTP_204_NO_CONTENT)
@@ -59,6 +118,7 @@ async def delete_mileage_event(
     ),
     session: AsyncSession = Depends(db_handler.get_db),
 ) -> None:
-    return await crud.delete_mileage_event(
+    await crud.delete_mileage_event(
         session=session, mileage_event=mileage_event
     )
+    mileage_forecaster.invalidate(mileage_event.vehicle_id)
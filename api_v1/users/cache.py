@@ -0,0 +1,6 @@
+from core.cache import TTLCache
+from core.config import settings
+
+user_cache = TTLCache(
+    maxsize=settings.cache.user_cache_size, ttl=settings.cache.user_cache_ttl
+)
@@ -1,16 +1,18 @@
 from sqlalchemy import Result, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from auth.password_operators import password_hasher
+from auth.password_operators import password_service
 from core.models import User
+from core.pagination import Page, PageParams, SortKey, paginate
 from core.schemas.users import UserCreate, UserSchema, UserUpdatePart
 
+from .cache import user_cache
 
-async def get_users(session: AsyncSession) -> list[User]:
-    statement = select(User).order_by(User.id)
-    result: Result = await session.execute(statement)
-    users_list: list = list(result.scalars().all())
-    return users_list
+
+async def get_users(
+    session: AsyncSession, page: PageParams = PageParams()
+) -> Page:
+    return await paginate(session, select(User), [SortKey(User.id)], page)
 
 
 async def get_user(session: AsyncSession, user_id: int) -> User | None:
@@ -20,7 +22,9 @@ async def get_user(session: AsyncSession, user_id: int) -> User | None:
 async def create_user(session: AsyncSession, user_data: UserCreate) -> User:
     user_data_dict = user_data.model_dump()
     unhased_password = user_data_dict.pop("password")
-    user_data_dict.update(password=password_hasher.hash(unhased_password))
+    user_data_dict.update(
+        password=await password_service.hash(unhased_password)
+    )
     user = User(**user_data_dict)
     session.add(user)
     await session.commit()
@@ -31,17 +35,21 @@ async def create_user(session: AsyncSession, user_data: UserCreate) -> User:
 async def update_user(
     session: AsyncSession, user: UserSchema, user_update: UserUpdatePart
 ) -> UserSchema:
+    old_username = user.username
     for name, value in user_update.model_dump(
         exclude_unset=True, exclude_none=True
     ).items():
         setattr(user, name, value)
     await session.commit()
+    user_cache.delete(old_username)
+    user_cache.delete(user.username)
     return user
 
 
 async def delete_user(session: AsyncSession, user: UserSchema) -> None:
     await session.delete(user)
     await session.commit()
+    user_cache.delete(user.username)
 
 
 async def get_user_by_username(
@@ -3,6 +3,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import db_handler
+from core.pagination import Page, PageParams, get_page_params
 from core.schemas.users import UserCreate, UserSchema, UserUpdatePart
 
 from . import crud
@@ -11,11 +12,12 @@ from .utils import user_by_id
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
-@router.get("/", response_model=list[UserSchema])
+@router.get("/", response_model=Page[UserSchema])
 async def get_users(
-    session: AsyncSession = Depends(db_handler.get_db),
+    page: PageParams = Depends(get_page_params),
+    session: AsyncSession = Depends(db_handler.get_read_db),
 ):
-    return await crud.get_users(session=session)
+    return await crud.get_users(session=session, page=page)
 
 
 @router.post(
@@ -37,7 +39,7 @@ async def create_user(
 @router.get("/username/{username}/")
 async def get_user_by_username(
     username: str,
-    session: AsyncSession = Depends(db_handler.get_db),
+    session: AsyncSession = Depends(db_handler.get_read_db),
 ):
     user_instance = await crud.get_user_by_username(
         session=session, username=username
@@ -1,45 +1,99 @@
-from sqlalchemy import Result, select
+from sqlalchemy import Select, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api_v1.works.utils import create_works_on_create_vehicle
+from api_v1.works.utils import create_works_on_create_vehicles
 from core.models import Vehicle
-from core.schemas.vehicles import VehicleCreate, VehicleSchema, VehicleUpdate
+from core.pagination import Page, PageParams, SortKey, paginate
+from core.schemas.vehicles import (
+    VehicleCreate,
+    VehicleFilter,
+    VehicleSchema,
+    VehicleUpdate,
+)
 from core.vin import VIN_Type
 
+from .vin_filter import vin_filter
+
+
+async def create_vehicles(
+    session: AsyncSession, vehicles_data: list[VehicleCreate], owner_id: int
+) -> list[Vehicle]:
+    """Insert vehicles with their default works in one transaction."""
+    vehicles_rows: list[dict] = []
+    for vehicle_data in vehicles_data:
+        vehicle_data_dump: dict = vehicle_data.model_dump()
+        vin_code: str = vehicle_data_dump.get("vin_code", "")
+        vehicle_data_dump.update(owner_id=owner_id, vin_code=vin_code.upper())
+        vehicles_rows.append(vehicle_data_dump)
+    # sort_by_parameter_order would make SQLite insert row by row, so
+    # the returned vehicles are put back in order by their unique VINs.
+    vehicles_by_vin = {
+        vehicle.vin_code: vehicle
+        for vehicle in await session.scalars(
+            insert(Vehicle).returning(Vehicle), vehicles_rows
+        )
+    }
+    vehicles_list = [vehicles_by_vin[row["vin_code"]] for row in vehicles_rows]
+    await create_works_on_create_vehicles(
+        vehicle_ids=[vehicle.id for vehicle in vehicles_list], session=session
+    )
+    # Added before the commit: a failed commit leaves a false positive,
+    # never a false negative.
+    for vehicle in vehicles_list:
+        vin_filter.add(vehicle.vin_code)
+    await session.commit()
+    if vin_filter.needs_rebuild:
+        await vin_filter.rebuild(session)
+    return vehicles_list
+
 
 async def create_vehicle(
     session: AsyncSession, vehicle_data: VehicleCreate, owner_id: int
 ) -> Vehicle:
-    vehicle_data_dump: dict = vehicle_data.model_dump()
-    vin_code: str = vehicle_data_dump.get("vin_code", "")
-    vehicle_data_dump.update(owner_id=owner_id, vin_code=vin_code.upper())
-    vehicle_instance = Vehicle(**vehicle_data_dump)
-
-    session.add(vehicle_instance)
-    await session.commit()
-    await session.refresh(vehicle_instance)
-    await create_works_on_create_vehicle(
-        vehicle_id=vehicle_instance.id, session=session
+    vehicles_list = await create_vehicles(
+        session=session, vehicles_data=[vehicle_data], owner_id=owner_id
     )
-    return vehicle_instance
+    return vehicles_list[0]
 
 
-async def get_all_vehicles(session: AsyncSession) -> list[Vehicle]:
-    statement = select(Vehicle).order_by(Vehicle.id)
-    result: Result = await session.execute(statement)
-    vehicles_list: list = list(result.scalars().all())
-    return vehicles_list
+VEHICLES_SORT_KEYS = [SortKey(Vehicle.id)]
+
+
+def filter_vehicles(statement: Select, filters: VehicleFilter) -> Select:
+    if filters.owner_id is not None:
+        statement = statement.where(Vehicle.owner_id == filters.owner_id)
+    if filters.vehicle_manufacturer is not None:
+        statement = statement.where(
+            Vehicle.vehicle_manufacturer == filters.vehicle_manufacturer
+        )
+    if filters.vehicle_model is not None:
+        statement = statement.where(
+            Vehicle.vehicle_model == filters.vehicle_model
+        )
+    if filters.year_from is not None:
+        statement = statement.where(Vehicle.vehicle_year >= filters.year_from)
+    if filters.year_to is not None:
+        statement = statement.where(Vehicle.vehicle_year <= filters.year_to)
+    return statement
+
+
+async def get_all_vehicles(
+    session: AsyncSession,
+    page: PageParams = PageParams(),
+    filters: VehicleFilter = VehicleFilter(),
+) -> Page:
+    statement = filter_vehicles(select(Vehicle), filters)
+    return await paginate(session, statement, VEHICLES_SORT_KEYS, page)
 
 
 async def get_user_vehicles(
-    user_id: int, session: AsyncSession
-) -> list[Vehicle]:
-    statement = (
-        select(Vehicle).where(Vehicle.owner_id == user_id).order_by(Vehicle.id)
-    )
-    result: Result = await session.execute(statement)
-    vehicles_list: list = list(result.scalars().all())
-    return vehicles_list
+    user_id: int,
+    session: AsyncSession,
+    page: PageParams = PageParams(),
+    filters: VehicleFilter = VehicleFilter(),
+) -> Page:
+    filters = filters.model_copy(update={"owner_id": user_id})
+    return await get_all_vehicles(session=session, page=page, filters=filters)
 
 
 async def get_vehicle_by_id(
@@ -53,11 +107,17 @@ async def update_vehicle(
     vehicle: VehicleSchema,
     vehicle_update: VehicleUpdate,
 ) -> VehicleSchema:
+    old_vin_code = vehicle.vin_code
     for name, value in vehicle_update.model_dump(
         exclude_unset=True, exclude_none=True
     ).items():
         setattr(vehicle, name, value)
+    vin_changed = vehicle.vin_code != old_vin_code
+    if vin_changed:
+        vin_filter.add(vehicle.vin_code)
     await session.commit()
+    if vin_changed:
+        vin_filter.remove(old_vin_code)
     return vehicle
 
 
@@ -66,6 +126,7 @@ async def delete_vehicle(
 ) -> None:
     await session.delete(vehicle)
     await session.commit()
+    vin_filter.remove(vehicle.vin_code)
 
 
 async def get_vehicle_by_vin(session: AsyncSession, vin: VIN_Type):
@@ -1,14 +1,55 @@
+import json
+
+from sqlalchemy import ScalarSelect, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from . import crud
+from core.models import Vehicle
 
 
 async def update_vehicle_mileage_from_event(
-    session: AsyncSession, vehicle_id: int, event_mileage: int
+    session: AsyncSession,
+    vehicle_id: int | ScalarSelect,
+    event_mileage: int,
+) -> None:
+    """Raise vehicle mileage to event_mileage in one conditional UPDATE."""
+    statement = (
+        update(Vehicle)
+        .where(
+            Vehicle.id == vehicle_id,
+            Vehicle.vehicle_mileage < event_mileage,
+        )
+        .values(vehicle_mileage=event_mileage)
+        .execution_options(synchronize_session=False)
+    )
+    await session.execute(statement)
+
+
+async def raise_vehicles_mileage(
+    session: AsyncSession, mileage_by_vehicle: dict[int, int]
 ) -> None:
-    vehicle_instance = await crud.get_vehicle_by_id(
-        vehicle_id=vehicle_id, session=session
+    """Raise each vehicle mileage to the given value if it is higher.
+
+    One set-based UPDATE .. FROM the pairs, passed as a single JSON
+    parameter and unpacked by json_each; rows already at or above the
+    value are not touched, so their last update date stays as it was.
+    """
+    if not mileage_by_vehicle:
+        return
+    # A VALUES list would be recompiled for every call, bound by bound.
+    pairs = func.json_each(
+        json.dumps(list(mileage_by_vehicle.items()))
+    ).table_valued("value")
+    new_mileage = select(
+        func.json_extract(pairs.c.value, "$[0]").label("vehicle_id"),
+        func.json_extract(pairs.c.value, "$[1]").label("mileage"),
+    ).cte("new_mileage")
+    table = Vehicle.__table__
+    statement = (
+        update(table)
+        .where(
+            table.c.id == new_mileage.c.vehicle_id,
+            table.c.vehicle_mileage < new_mileage.c.mileage,
+        )
+        .values(vehicle_mileage=new_mileage.c.mileage)
     )
-    if vehicle_instance and vehicle_instance.vehicle_mileage < event_mileage:
-        vehicle_instance.vehicle_mileage = event_mileage
-        await session.commit()
+    await session.execute(statement)
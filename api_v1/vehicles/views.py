@@ -1,14 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import datetime
+from typing import Annotated
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api_v1.auth.validate import get_current_active_user
+from api_v1.mileage_events.forecast import mileage_forecaster
 from core.database import db_handler
+from core.config import settings
+from core.pagination import Page, PageParams, get_page_params
+from core.schemas.mileage_events import MileageForecastSchema
 from core.schemas.users import UserSchema
-from core.schemas.vehicles import VehicleCreate, VehicleSchema, VehicleUpdate
-from core.vin import vin_code_validator
+from core.schemas.vehicles import (
+    VehicleCreate,
+    VehicleFilter,
+    VehicleSchema,
+    VehicleUpdate,
+    VinDecodeSchema,
+    VinValidationItem,
+    VinValidationResult,
+)
+from core.vin import vin_code_validator, vin_error
+from core.vin_decoder import vin_decoder
 
 from . import crud
+from .vin_batch import validate_vins
+from .vin_filter import vin_filter
 from .dependencies import get_vehicle_by_id_or_exceprion
 
 router = APIRouter(prefix="/vehicle", tags=["Vehicles"])
@@ -33,11 +51,79 @@ async def create_vehicle(
         )
 
 
-@router.get("/", response_model=list[VehicleSchema])
-async def get_all_vehicles(
+@router.post(
+    "/bulk",
+    response_model=list[VehicleSchema],
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_vehicles_bulk(
+    vehicles_data: Annotated[
+        list[VehicleCreate], Body(min_length=1, max_length=1000)
+    ],
+    user: UserSchema = Depends(get_current_active_user),
     session: AsyncSession = Depends(db_handler.get_db),
 ):
-    return await crud.get_all_vehicles(session=session)
+    try:
+        return await crud.create_vehicles(
+            session=session, vehicles_data=vehicles_data, owner_id=user.id
+        )
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Incorrect incoming data.",
+        )
+
+
+@router.post("/vin/validate", response_model=VinValidationResult)
+async def validate_vin_codes(
+    vin_codes: Annotated[
+        list[str],
+        Body(min_length=1, max_length=settings.ingest.vin_batch_max_size),
+    ],
+    checksum: bool = True,
+):
+    """Validate many VINs at once; invalid ones get the reason."""
+    errors = validate_vins(
+        vin_codes=vin_codes, checksum_verification=checksum
+    )
+    invalid = len(errors) - errors.count(None)
+    return VinValidationResult(
+        valid=len(errors) - invalid,
+        invalid=invalid,
+        results=[
+            VinValidationItem(vin=vin_code, valid=error is None, error=error)
+            for vin_code, error in zip(vin_codes, errors)
+        ],
+    )
+
+
+@router.get("/vin/{vin_code}/decode", response_model=VinDecodeSchema)
+async def decode_vin_code(vin_code: str, checksum: bool = True):
+    """Manufacturer, region and model year from the VIN, offline."""
+    error = vin_error(vin_code=vin_code, checksum_verification=checksum)
+    if error is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=error
+        )
+    decoded = vin_decoder.decode(vin_code)
+    return VinDecodeSchema(
+        vin=vin_code.upper(),
+        wmi=decoded.wmi,
+        region=decoded.region,
+        manufacturer=decoded.manufacturer,
+        model_year=decoded.model_year,
+    )
+
+
+@router.get("/", response_model=Page[VehicleSchema])
+async def get_all_vehicles(
+    filters: Annotated[VehicleFilter, Query()],
+    page: PageParams = Depends(get_page_params),
+    session: AsyncSession = Depends(db_handler.get_read_db),
+):
+    return await crud.get_all_vehicles(
+        session=session, page=page, filters=filters
+    )
 
 
 @router.get("/{vehicle_id}/")
@@ -47,12 +133,16 @@ async def get_vehicle_by_id(
     return vehicle
 
 
-@router.get("/by_user_id/{user_id}/", response_model=list[VehicleSchema])
+@router.get("/by_user_id/{user_id}/", response_model=Page[VehicleSchema])
 async def get_user_vehicles(
     user_id: int,
-    session: AsyncSession = Depends(db_handler.get_db),
+    filters: Annotated[VehicleFilter, Query()],
+    page: PageParams = Depends(get_page_params),
+    session: AsyncSession = Depends(db_handler.get_read_db),
 ):
-    return await crud.get_user_vehicles(user_id=user_id, session=session)
+    return await crud.get_user_vehicles(
+        user_id=user_id, session=session, page=page, filters=filters
+    )
 
 
 @router.patch("/{vehicle_id}/")
@@ -71,13 +161,44 @@ async def delete_vehicle(
     vehicle: VehicleSchema = Depends(get_vehicle_by_id_or_exceprion),
     session: AsyncSession = Depends(db_handler.get_db),
 ) -> None:
-    return await crud.delete_vehicle(session=session, vehicle=vehicle)
+    await crud.delete_vehicle(session=session, vehicle=vehicle)
+    mileage_forecaster.invalidate(vehicle.id)
+
+
+@router.get(
+    "/{vehicle_id}/mileage_forecast", response_model=MileageForecastSchema
+)
+async def get_mileage_forecast(
+    vehicle_id: int,
+    date: datetime.date | None = None,
+    session: AsyncSession = Depends(db_handler.get_read_db),
+):
+    """Expected odometer reading on date, today by default."""
+    fit = await mileage_forecaster.get_fit(
+        session=session, vehicle_id=vehicle_id
+    )
+    if not fit.readings and not await crud.get_vehicle_by_id(
+        vehicle_id=vehicle_id, session=session
+    ):
+        mileage_forecaster.invalidate(vehicle_id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Vehicle with {vehicle_id!r} not found in db.",
+        )
+    forecast_date = date or datetime.date.today()
+    return MileageForecastSchema(
+        vehicle_id=vehicle_id,
+        date=forecast_date,
+        readings=len(fit.readings),
+        daily_rate=fit.daily_rate,
+        mileage=fit.predict(forecast_date),
+    )
 
 
 @router.get("/by_vin/{vehicle_vin}/", response_model=VehicleSchema)
 async def get_vehicle_by_vin(
     vehicle_vin: str,
-    session: AsyncSession = Depends(db_handler.get_db),
+    session: AsyncSession = Depends(db_handler.get_read_db),
 ):
     try:
         vin_code_validator(vin_code=vehicle_vin)
@@ -86,10 +207,17 @@ async def get_vehicle_by_vin(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="VIN Code format is incorrect or checksum is not valid.",
         )
+    # The filter only sees this process's writes, so an absent VIN is
+    # still looked up; its answer is checked against the db's.
+    might_contain = vin_filter.might_contain(vehicle_vin)
     result = await crud.get_vehicle_by_vin(session=session, vin=vehicle_vin)
-    if not result:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Vehicle with VIN {vehicle_vin} not found.",
-        )
-    return result
+    if result:
+        if not might_contain:
+            vin_filter.record_false_negative(result.vin_code)
+        return result
+    if might_contain:
+        vin_filter.record_false_positive()
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Vehicle with VIN {vehicle_vin} not found.",
+    )
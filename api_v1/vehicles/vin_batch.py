@@ -0,0 +1,70 @@
+import numpy as np
+
+from core.vin import (
+    INVALID_VIN_VALUE,
+    VIN_CHARACTERS_ERROR,
+    VIN_CHECK_DIGIT_INDEX,
+    VIN_CHECK_DIGITS,
+    VIN_CHECKSUM_ERROR,
+    VIN_LENGTH,
+    VIN_LENGTH_ERROR,
+    VIN_VALUES,
+    VIN_WEIGHTS,
+    vin_error,
+)
+
+# Below this many VINs the per-VIN loop is faster than building arrays.
+NUMPY_MIN_BATCH = 128
+
+_VALUES = np.frombuffer(VIN_VALUES, dtype=np.uint8)
+_WEIGHTS = np.array(VIN_WEIGHTS, dtype=np.int32)
+_CHECK_DIGITS = np.frombuffer(VIN_CHECK_DIGITS.encode(), dtype=np.uint8)
+
+
+def vin_errors_numpy(
+    vin_codes: list[str], checksum_verification: bool = True
+) -> list[str | None]:
+    """core.vin.vin_error for every VIN, with one array pass for all.
+
+    VINs of the right length and ASCII only go into one (n, 17) byte
+    matrix; the rest fail on length or characters without it.
+    """
+    errors: list[str | None] = [None] * len(vin_codes)
+    indexes: list[int] = []
+    for index, vin_code in enumerate(vin_codes):
+        if len(vin_code) != VIN_LENGTH:
+            errors[index] = VIN_LENGTH_ERROR
+        elif not vin_code.isascii():
+            errors[index] = VIN_CHARACTERS_ERROR
+        else:
+            indexes.append(index)
+    if not indexes:
+        return errors
+    codes = np.frombuffer(
+        "".join(vin_codes[index] for index in indexes).encode("ascii"),
+        dtype=np.uint8,
+    ).reshape(-1, VIN_LENGTH)
+    values = _VALUES[codes]
+    bad_characters = (values == INVALID_VIN_VALUE).any(axis=1)
+    bad_checksum = np.zeros(len(indexes), dtype=bool)
+    if checksum_verification:
+        check_digits = _CHECK_DIGITS[(values @ _WEIGHTS) % 11]
+        bad_checksum = check_digits != codes[:, VIN_CHECK_DIGIT_INDEX]
+    for position in np.flatnonzero(bad_characters | bad_checksum).tolist():
+        errors[indexes[position]] = (
+            VIN_CHARACTERS_ERROR
+            if bad_characters[position]
+            else VIN_CHECKSUM_ERROR
+        )
+    return errors
+
+
+def validate_vins(
+    vin_codes: list[str], checksum_verification: bool = True
+) -> list[str | None]:
+    """Error per VIN, None for a valid one."""
+    if len(vin_codes) >= NUMPY_MIN_BATCH:
+        return vin_errors_numpy(vin_codes, checksum_verification)
+    return [
+        vin_error(vin_code, checksum_verification) for vin_code in vin_codes
+    ]
@@ -0,0 +1,134 @@
+from loguru import logger
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.bloom import CountingBloomFilter
+from core.config import settings
+from core.models import Vehicle
+
+
+class VinFilter:
+    """Counting Bloom filter of stored VINs for negative lookups.
+
+    Rebuilt from api_vehicles at startup and kept current by the
+    vehicles crud. Until the first rebuild, and when disabled, every VIN
+    may be present. Writes from other processes and from outside the
+    API are not seen, so a VIN reported absent is still looked up in
+    the db; the ones found there are counted as false negatives and
+    added back.
+    """
+
+    def __init__(self, error_rate: float, min_capacity: int):
+        self.error_rate = error_rate
+        self.min_capacity = min_capacity
+        self._filter: CountingBloomFilter | None = None
+        # VINs added while a rebuild scans the table, None otherwise.
+        self._added_during_rebuild: list[str] | None = None
+        self.lookups: int = 0
+        self.misses: int = 0
+        self.false_positives: int = 0
+        self.false_negatives: int = 0
+
+    async def rebuild(self, session: AsyncSession) -> None:
+        """Size for twice the stored VINs, then add them all.
+
+        VINs added meanwhile may be missing from the scan's snapshot, so
+        they are replayed into the new filter before it is swapped in.
+        Removals are not replayed: that could drop a VIN the snapshot
+        never had, and a stale entry is only a false positive.
+        """
+        if self._added_during_rebuild is not None:
+            return
+        self._added_during_rebuild = []
+        try:
+            bloom_filter = await self._build(session)
+            for vin_code in self._added_during_rebuild:
+                bloom_filter.add(vin_code)
+            self._filter = bloom_filter
+        finally:
+            self._added_during_rebuild = None
+        logger.info(
+            f"VIN filter built: {len(bloom_filter)} VINs, "
+            f"{bloom_filter.size} bytes."
+        )
+
+    async def _build(self, session: AsyncSession) -> CountingBloomFilter:
+        vehicles_count = await session.scalar(
+            select(func.count()).select_from(Vehicle)
+        )
+        bloom_filter = CountingBloomFilter(
+            capacity=max(2 * vehicles_count, self.min_capacity),
+            error_rate=self.error_rate,
+        )
+        vin_codes = await session.stream_scalars(
+            select(Vehicle.vin_code).execution_options(yield_per=10000)
+        )
+        async for vin_code in vin_codes:
+            bloom_filter.add(vin_code)
+        return bloom_filter
+
+    def clear(self) -> None:
+        self._filter = None
+
+    @property
+    def needs_rebuild(self) -> bool:
+        return (
+            self._filter is not None
+            and len(self._filter) > self._filter.capacity
+        )
+
+    def add(self, vin_code: str) -> None:
+        if self._added_during_rebuild is not None:
+            self._added_during_rebuild.append(vin_code)
+        if self._filter is not None:
+            self._filter.add(vin_code)
+
+    def remove(self, vin_code: str) -> None:
+        if self._filter is not None:
+            self._filter.remove(vin_code)
+
+    def might_contain(self, vin_code: str) -> bool:
+        self.lookups += 1
+        if self._filter is None or vin_code in self._filter:
+            return True
+        self.misses += 1
+        return False
+
+    def record_false_positive(self) -> None:
+        """Count a VIN the filter let through that the db did not have."""
+        if self._filter is not None:
+            self.false_positives += 1
+
+    def record_false_negative(self, vin_code: str) -> None:
+        """Count a VIN reported absent that the db had, and add it."""
+        self.false_negatives += 1
+        self.add(vin_code)
+
+    def get_stats(self) -> dict[str, int | float]:
+        bloom_filter = self._filter
+        true_negatives = self.misses - self.false_negatives
+        negatives = self.false_positives + true_negatives
+        return {
+            "items": len(bloom_filter) if bloom_filter else 0,
+            "capacity": bloom_filter.capacity if bloom_filter else 0,
+            "size_bytes": bloom_filter.size if bloom_filter else 0,
+            "hash_count": bloom_filter.hash_count if bloom_filter else 0,
+            "estimated_false_positive_rate": (
+                bloom_filter.estimated_false_positive_rate
+                if bloom_filter
+                else 0.0
+            ),
+            "lookups": self.lookups,
+            "misses": self.misses,
+            "false_positives": self.false_positives,
+            "false_negatives": self.false_negatives,
+            "false_positive_rate": (
+                self.false_positives / negatives if negatives else 0.0
+            ),
+        }
+
+
+vin_filter = VinFilter(
+    error_rate=settings.cache.vin_filter_error_rate,
+    min_capacity=settings.cache.vin_filter_min_capacity,
+)
@@ -1,13 +1,27 @@
-from sqlalchemy import select
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    Row,
+    case,
+    cast,
+    func,
+    literal,
+    select,
+    union_all,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.models import WorkEvent
+from core.models import Work, WorkEvent
+from core.pagination import Page, PageParams, SortKey, paginate
 from core.schemas.work_events import (
     WorkEventCreate,
+    WorkEventFilter,
     WorkEventSchema,
     WorkEventUpdate,
 )
 
+from api_v1.works.last_event import record_new_event, refresh_last_event
+
 from .utils import update_vehicle_mileage_from_work_event
 
 
@@ -20,24 +34,38 @@ async def get_event_by_id(
 async def create_work_event(
     session: AsyncSession, event_data: WorkEventCreate
 ) -> WorkEvent:
+    """Add the event, update its work and vehicle; the caller commits."""
     event = WorkEvent(**event_data.model_dump())
     session.add(event)
-    await session.commit()
-    await session.refresh(event)
+    await session.flush()
     await update_vehicle_mileage_from_work_event(
         work_id=event.work_id, event_mileage=event.mileage, session=session
     )
+    await record_new_event(
+        session=session,
+        work_id=event.work_id,
+        work_date=event.work_date,
+        mileage=event.mileage,
+    )
 
     return event
 
 
-async def get_work_events_by_work_id(work_id: int, session: AsyncSession):
-    statement = (
-        select(WorkEvent)
-        .where(WorkEvent.work_id == work_id)
-        .order_by(WorkEvent.mileage)
-    )
-    return list(await session.scalars(statement=statement))
+WORK_EVENTS_SORT_KEYS = [SortKey(WorkEvent.mileage), SortKey(WorkEvent.id)]
+
+
+async def get_work_events_page(
+    work_id: int,
+    session: AsyncSession,
+    page: PageParams = PageParams(),
+    filters: WorkEventFilter = WorkEventFilter(),
+) -> Page:
+    statement = select(WorkEvent).where(WorkEvent.work_id == work_id)
+    if filters.date_from is not None:
+        statement = statement.where(WorkEvent.work_date >= filters.date_from)
+    if filters.date_to is not None:
+        statement = statement.where(WorkEvent.work_date <= filters.date_to)
+    return await paginate(session, statement, WORK_EVENTS_SORT_KEYS, page)
 
 
 async def update_work_event(
@@ -47,6 +75,8 @@ async def update_work_event(
 ) -> WorkEventSchema:
     for name, value in event_update.model_dump(exclude_unset=True).items():
         setattr(event, name, value)
+    await session.flush()
+    await refresh_last_event(session=session, work_ids=[event.work_id])
     await session.commit()
     return event
 
@@ -55,4 +85,97 @@ async def delete_work_event(
     session: AsyncSession, event: WorkEventSchema
 ) -> None:
     await session.delete(event)
+    await session.flush()
+    await refresh_last_event(session=session, work_ids=[event.work_id])
     await session.commit()
+
+
+def _percentile(value, position, total, fraction: float):
+    """Linear interpolation between the two closest ranks, per group."""
+    rank = (total - 1) * fraction
+    lower = cast(rank, Integer)
+    weight = rank - lower
+    return func.sum(
+        case(
+            (position == lower, value * (1 - weight)),
+            (position == lower + 1, value * weight),
+            else_=0,
+        )
+    )
+
+
+async def get_interval_stats(
+    session: AsyncSession, works_filter: ColumnElement[bool]
+) -> list[Row]:
+    """Interval statistics of the works matching works_filter.
+
+    One row per work and interval kind: "km" between events ordered by
+    mileage, "days" between events ordered by date. A work with fewer
+    than two events gives one row with an empty kind, a missing work
+    gives no rows.
+    """
+    work_ids = select(Work.id).where(works_filter)
+    day = func.julianday(WorkEvent.work_date)
+    intervals = union_all(
+        select(
+            WorkEvent.work_id,
+            literal("km").label("kind"),
+            (
+                WorkEvent.mileage
+                - func.lag(WorkEvent.mileage).over(
+                    partition_by=WorkEvent.work_id,
+                    order_by=(WorkEvent.mileage, WorkEvent.id),
+                )
+            ).label("value"),
+        ).where(WorkEvent.work_id.in_(work_ids)),
+        select(
+            WorkEvent.work_id,
+            literal("days").label("kind"),
+            (
+                day
+                - func.lag(day).over(
+                    partition_by=WorkEvent.work_id,
+                    order_by=(WorkEvent.work_date, WorkEvent.id),
+                )
+            ).label("value"),
+        ).where(WorkEvent.work_id.in_(work_ids)),
+    ).subquery()
+    group = (intervals.c.work_id, intervals.c.kind)
+    ranked = (
+        select(
+            *group,
+            intervals.c.value,
+            (
+                func.row_number().over(
+                    partition_by=group, order_by=intervals.c.value
+                )
+                - 1
+            ).label("position"),
+            func.count().over(partition_by=group).label("total"),
+        )
+        .where(intervals.c.value.is_not(None))
+        .subquery()
+    )
+    value, position, total = ranked.c.value, ranked.c.position, ranked.c.total
+    stats = (
+        select(
+            ranked.c.work_id,
+            ranked.c.kind,
+            func.count().label("count"),
+            func.avg(value).label("mean"),
+            _percentile(value, position, total, 0.5).label("median"),
+            _percentile(value, position, total, 0.9).label("p90"),
+            func.min(value).label("min"),
+            func.max(value).label("max"),
+            func.avg(value * value).label("mean_square"),
+        )
+        .group_by(ranked.c.work_id, ranked.c.kind)
+        .subquery()
+    )
+    statement = (
+        select(Work.id.label("work_id"), *list(stats.c)[1:])
+        .outerjoin(stats, stats.c.work_id == Work.id)
+        .where(works_filter)
+        .order_by(Work.id, stats.c.kind)
+    )
+    return list((await session.execute(statement)).all())
@@ -1,34 +1,51 @@
-from loguru import logger
+import math
+
+from sqlalchemy import Row, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api_v1.vehicles.utils import update_vehicle_mileage_from_event
-from api_v1.works.crud import get_work_by_id
-from core.models import WorkEvent
+from core.models import Work
+from core.schemas.work_events import (
+    IntervalStatsSchema,
+    WorkIntervalStatsSchema,
+)
 
 
-async def get_average_mileage_interval(events_list: list[WorkEvent]) -> int:
-    mileages_list = sorted([event.mileage for event in events_list])
-    event_counter = len(mileages_list)
-    if event_counter <= 0:
-        return 0
-    elif event_counter == 1:
-        return mileages_list[0]
-    previous_mileage = mileages_list[0]
-    mileage_delta_sum: int = 0
-    for mileage in mileages_list:
-        mileage_delta_sum += mileage - previous_mileage
-        previous_mileage = mileage
-    return mileage_delta_sum // (event_counter - 1)
+def build_interval_stats(rows: list[Row]) -> list[WorkIntervalStatsSchema]:
+    """Fold crud.get_interval_stats rows into one schema per work."""
+    works: dict[int, WorkIntervalStatsSchema] = {}
+    for row in rows:
+        work_stats = works.setdefault(
+            row.work_id, WorkIntervalStatsSchema(work_id=row.work_id)
+        )
+        if row.kind is None:
+            continue
+        # Population variance, as numpy.std computes it.
+        variance = max(row.mean_square - row.mean * row.mean, 0.0)
+        setattr(
+            work_stats,
+            row.kind,
+            IntervalStatsSchema(
+                count=row.count,
+                mean=row.mean,
+                median=row.median,
+                p90=row.p90,
+                min=row.min,
+                max=row.max,
+                stddev=math.sqrt(variance),
+            ),
+        )
+    return list(works.values())
 
 
 async def update_vehicle_mileage_from_work_event(
     work_id: int, event_mileage: int, session: AsyncSession
 ) -> None:
-    if work := await get_work_by_id(work_id=work_id, session=session):
-        await update_vehicle_mileage_from_event(
-            session=session,
-            vehicle_id=work.vehicle_id,
-            event_mileage=event_mileage,
-        )
-    else:
-        logger.error(f"Work with id {work_id} not found in db.")
+    work_vehicle_id = (
+        select(Work.vehicle_id).where(Work.id == work_id).scalar_subquery()
+    )
+    await update_vehicle_mileage_from_event(
+        session=session,
+        vehicle_id=work_vehicle_id,
+        event_mileage=event_mileage,
+    )
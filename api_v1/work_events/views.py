@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, status
+from functools import partial
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import db_handler
-from core.models import WorkEvent
+from core.models import Work
+from core.pagination import Page, PageParams, get_page_params
 from core.schemas.work_events import (
     WorkEventCreate,
+    WorkEventFilter,
     WorkEventSchema,
     WorkEventUpdate,
+    WorkIntervalStatsSchema,
 )
 
 from . import crud, utils
@@ -21,9 +27,10 @@ router = APIRouter(prefix="/work_events", tags=["Work Events"])
 async def create_work_event(
     event_data: WorkEventCreate,
     # user: User = Depends(get_current_active_user),
-    session: AsyncSession = Depends(db_handler.get_db),
 ):
-    return await crud.create_work_event(session=session, event_data=event_data)
+    return await db_handler.writer.submit(
+        partial(crud.create_work_event, event_data=event_data)
+    )
 
 
 @router.patch("/{event_id}/")
@@ -52,22 +59,59 @@ async def get_work_event_by_id(
     return work_event
 
 
-@router.get("/by_work_id/{work_id}/")
+@router.get("/by_work_id/{work_id}/", response_model=Page[WorkEventSchema])
 async def get_work_events_by_work_id(
     work_id: int,
-    session: AsyncSession = Depends(db_handler.get_db),
+    filters: Annotated[WorkEventFilter, Query()],
+    page: PageParams = Depends(get_page_params),
+    session: AsyncSession = Depends(db_handler.get_read_db),
 ):
-    return await crud.get_work_events_by_work_id(
-        session=session, work_id=work_id
+    return await crud.get_work_events_page(
+        work_id=work_id, session=session, page=page, filters=filters
     )
 
 
-@router.get("/average_interval/{work_id}/")
-async def get_average_interval_km_for_event(
+@router.get(
+    "/interval_stats/{work_id}/", response_model=WorkIntervalStatsSchema
+)
+async def get_work_interval_stats(
     work_id: int,
-    session: AsyncSession = Depends(db_handler.get_db),
+    session: AsyncSession = Depends(db_handler.get_read_db),
 ):
-    events_list: list[WorkEvent] = await crud.get_work_events_by_work_id(
-        session=session, work_id=work_id
+    rows = await crud.get_interval_stats(
+        session=session, works_filter=Work.id == work_id
+    )
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Work with {work_id!r} not found in db.",
+        )
+    return utils.build_interval_stats(rows)[0]
+
+
+@router.get(
+    "/interval_stats/by_vehicle/{vehicle_id}/",
+    response_model=list[WorkIntervalStatsSchema],
+)
+async def get_vehicle_interval_stats(
+    vehicle_id: int,
+    session: AsyncSession = Depends(db_handler.get_read_db),
+):
+    """Interval statistics of every work of the vehicle in one query."""
+    rows = await crud.get_interval_stats(
+        session=session, works_filter=Work.vehicle_id == vehicle_id
+    )
+    return utils.build_interval_stats(rows)
+
+
+@router.get("/average_interval/{work_id}/", deprecated=True)
+async def get_average_interval_km_for_event(
+    work_id: int,
+    session: AsyncSession = Depends(db_handler.get_read_db),
+) -> int:
+    """Mean km interval, rounded down; use /interval_stats/ instead."""
+    rows = await crud.get_interval_stats(
+        session=session, works_filter=Work.id == work_id
     )
-    return await utils.get_average_mileage_interval(events_list=events_list)
+    km_mean = next((row.mean for row in rows if row.kind == "km"), None)
+    return 0 if km_mean is None else int(km_mean)
@@ -0,0 +1,40 @@
+from types import MappingProxyType
+from typing import Mapping
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.models.workpattern import WorkPattern
+
+
+class WorkPatternCatalog:
+    """Immutable in-memory snapshot of work patterns.
+
+    Keeps ready-made Work insert rows, so creating a vehicle's works
+    needs no read query and no Pydantic validation. Rebuilt at startup
+    and by the workpatterns crud after every change.
+    """
+
+    def __init__(self):
+        self._work_rows: tuple[Mapping, ...] = ()
+
+    def __len__(self) -> int:
+        return len(self._work_rows)
+
+    async def rebuild(self, session: AsyncSession) -> None:
+        statement = select(
+            WorkPattern.title,
+            WorkPattern.interval_month,
+            WorkPattern.interval_km,
+        ).order_by(WorkPattern.id)
+        result = await session.execute(statement)
+        self._work_rows = tuple(
+            MappingProxyType(dict(row, note=""))
+            for row in result.mappings()
+        )
+
+    def get_work_rows(self, vehicle_id: int) -> list[dict]:
+        return [dict(row, vehicle_id=vehicle_id) for row in self._work_rows]
+
+
+work_pattern_catalog = WorkPatternCatalog()
@@ -1,13 +1,16 @@
-from sqlalchemy import Result, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.models.workpattern import WorkPattern
+from core.pagination import Page, PageParams, SortKey, paginate
 from core.schemas.workpattern import (
     WorkPatternBase,
     WorkPatternSchema,
     WorkPatternUpdate,
 )
 
+from .catalog import work_pattern_catalog
+
 
 async def create_workpattern(
     session: AsyncSession, work_pattern_data: WorkPatternBase
@@ -16,14 +19,16 @@ async def create_workpattern(
     session.add(work_pattern)
     await session.commit()
     await session.refresh(work_pattern)
+    await work_pattern_catalog.rebuild(session)
     return work_pattern
 
 
-async def get_all_workpatterns(session: AsyncSession) -> list[WorkPattern]:
-    statement = select(WorkPattern).order_by(WorkPattern.id)
-    result: Result = await session.execute(statement)
-    workpatterns_list: list = list(result.scalars().all())
-    return workpatterns_list
+async def get_all_workpatterns(
+    session: AsyncSession, page: PageParams = PageParams()
+) -> Page:
+    return await paginate(
+        session, select(WorkPattern), [SortKey(WorkPattern.id)], page
+    )
 
 
 async def get_workpattern_by_id(
@@ -42,6 +47,7 @@ async def update_workpattern(
     ).items():
         setattr(workpattern, name, value)
     await session.commit()
+    await work_pattern_catalog.rebuild(session)
     return workpattern
 
 
@@ -50,3 +56,4 @@ async def delete_workpattern(
 ) -> None:
     await session.delete(workpattern)
     await session.commit()
+    await work_pattern_catalog.rebuild(session)
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import db_handler
+from core.pagination import Page, PageParams, get_page_params
 from core.schemas.workpattern import (
     WorkPatternBase,
     WorkPatternSchema,
@@ -27,11 +28,12 @@ async def create_workpattern(
     )
 
 
-@router.get("/", response_model=list[WorkPatternSchema])
+@router.get("/", response_model=Page[WorkPatternSchema])
 async def get_all_workpatterns(
-    session: AsyncSession = Depends(db_handler.get_db),
+    page: PageParams = Depends(get_page_params),
+    session: AsyncSession = Depends(db_handler.get_read_db),
 ):
-    return await crud.get_all_workpatterns(session=session)
+    return await crud.get_all_workpatterns(session=session, page=page)
 
 
 @router.get("/{workpattern_id}/")
@@ -1,7 +1,8 @@
-from sqlalchemy import Result, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.models.works import Work
+from core.models.works import Work, WorkType
+from core.pagination import Page, PageParams, SortKey, paginate
 from core.schemas.works import WorkBase, WorkSchema, WorkUpdate
 
 
@@ -14,14 +15,15 @@ async def create_work(session: AsyncSession, work_data: WorkBase) -> Work:
 
 
 async def get_works_by_vehicle_id(
-    session: AsyncSession, vehicle_id: int
-) -> list[Work]:
-    statement = (
-        select(Work).where(Work.vehicle_id == vehicle_id).order_by(Work.id)
-    )
-    result: Result = await session.execute(statement)
-    workpatterns_list: list = list(result.scalars().all())
-    return workpatterns_list
+    session: AsyncSession,
+    vehicle_id: int,
+    page: PageParams = PageParams(),
+    work_type: WorkType | None = None,
+) -> Page:
+    statement = select(Work).where(Work.vehicle_id == vehicle_id)
+    if work_type is not None:
+        statement = statement.where(Work.work_type == work_type)
+    return await paginate(session, statement, [SortKey(Work.id)], page)
 
 
 async def get_work_by_id(work_id: int, session: AsyncSession) -> Work | None:
@@ -0,0 +1,113 @@
+"""Maintain the denormalized last event columns of works.
+
+Usage: python -m api_v1.works.last_event
+
+Run as a module it recomputes last_event_date, last_event_mileage and
+events_count of every work from the events table.
+"""
+
+import asyncio
+import datetime
+
+from sqlalchemy import and_, case, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import db_handler
+from core.models import Work, WorkEvent
+
+
+async def record_new_event(
+    session: AsyncSession,
+    work_id: int,
+    work_date: datetime.date,
+    mileage: int,
+) -> None:
+    """Count a new event and make it the last one if it is the latest.
+
+    Events are ordered by (work_date, mileage, id), so a new event wins
+    a tie with the current last one.
+    """
+    is_latest = or_(
+        Work.last_event_date.is_(None),
+        Work.last_event_date < work_date,
+        and_(
+            Work.last_event_date == work_date,
+            Work.last_event_mileage <= mileage,
+        ),
+    )
+    statement = (
+        update(Work)
+        .where(Work.id == work_id)
+        .values(
+            events_count=Work.events_count + 1,
+            last_event_date=case(
+                (is_latest, work_date), else_=Work.last_event_date
+            ),
+            last_event_mileage=case(
+                (is_latest, mileage), else_=Work.last_event_mileage
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await session.execute(statement)
+
+
+async def refresh_last_event(
+    session: AsyncSession, work_ids: list[int] | None = None
+) -> None:
+    """Recompute the columns from events, for work_ids or every work.
+
+    Two set-based statements: reset the selected works, then copy the
+    latest event and count of each work from one window query.
+    """
+    reset = update(Work).values(
+        last_event_date=None, last_event_mileage=None, events_count=0
+    )
+    events = select(
+        WorkEvent.work_id,
+        WorkEvent.work_date,
+        WorkEvent.mileage,
+        func.row_number()
+        .over(
+            partition_by=WorkEvent.work_id,
+            order_by=(
+                WorkEvent.work_date.desc(),
+                WorkEvent.mileage.desc(),
+                WorkEvent.id.desc(),
+            ),
+        )
+        .label("position"),
+        func.count().over(partition_by=WorkEvent.work_id).label("total"),
+    )
+    if work_ids is not None:
+        reset = reset.where(Work.id.in_(work_ids))
+        events = events.where(WorkEvent.work_id.in_(work_ids))
+    events = events.subquery()
+    copy_latest = (
+        update(Work)
+        .where(Work.id == events.c.work_id, events.c.position == 1)
+        .values(
+            last_event_date=events.c.work_date,
+            last_event_mileage=events.c.mileage,
+            events_count=events.c.total,
+        )
+    )
+    for statement in (reset, copy_latest):
+        await session.execute(
+            statement.execution_options(synchronize_session=False)
+        )
+
+
+async def repair() -> None:
+    async with db_handler.session_factory() as session:
+        await refresh_last_event(session)
+        await session.commit()
+        works_count = await session.scalar(
+            select(func.count()).select_from(Work)
+        )
+    await db_handler.engine.dispose()
+    print(f"Recomputed last event columns of {works_count} works.")
+
+
+if __name__ == "__main__":
+    asyncio.run(repair())
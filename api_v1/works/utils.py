@@ -1,19 +1,24 @@
 from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api_v1.workpatterns.crud import get_all_workpatterns
+from api_v1.workpatterns.catalog import work_pattern_catalog
 from core.models.works import Work
-from core.schemas.workpattern import WorkPatternSchema
+
+
+async def create_works_on_create_vehicles(
+    vehicle_ids: list[int], session: AsyncSession
+) -> None:
+    """Insert default works for the vehicles; the caller commits."""
+    works_rows = [
+        work_row
+        for vehicle_id in vehicle_ids
+        for work_row in work_pattern_catalog.get_work_rows(vehicle_id)
+    ]
+    if works_rows:
+        await session.execute(insert(Work), works_rows)
 
 
 async def create_works_on_create_vehicle(
     vehicle_id: int, session: AsyncSession
 ) -> None:
-    workpatterns_list = await get_all_workpatterns(session=session)
-    wp_dicts_list = []
-    for workpattern in workpatterns_list:
-        wp_dict = WorkPatternSchema.model_validate(workpattern).model_dump()
-        wp_dict.update(vehicle_id=vehicle_id, note="")
-        wp_dicts_list.append(wp_dict)
-    await session.execute(insert(Work), wp_dicts_list)
-    await session.commit()
+    await create_works_on_create_vehicles([vehicle_id], session)
@@ -4,6 +4,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
 from core.database import db_handler
+from core.models.works import WorkType
+from core.pagination import Page, PageParams, get_page_params
 from core.schemas.works import WorkBase, WorkSchema, WorkUpdate
 
 from . import crud
@@ -36,13 +38,15 @@ async def get_work_by_id(
     return work
 
 
-@router.get("/vehicle_id/{vehicle_id}/")
+@router.get("/vehicle_id/{vehicle_id}/", response_model=Page[WorkSchema])
 async def get_works_by_vehice_id(
     vehicle_id: int,
-    session: AsyncSession = Depends(db_handler.get_db),
+    work_type: WorkType | None = None,
+    page: PageParams = Depends(get_page_params),
+    session: AsyncSession = Depends(db_handler.get_read_db),
 ):
     return await crud.get_works_by_vehicle_id(
-        session=session, vehicle_id=vehicle_id
+        session=session, vehicle_id=vehicle_id, page=page, work_type=work_type
     )
 
 
@@ -0,0 +1,70 @@
+"""Pick argon2 cost parameters that hit a target hash latency on this host.
+
+Usage: python -m auth.calibrate --target-ms 50 --max-memory-mib 64
+"""
+
+import argparse
+import time
+
+from argon2 import PasswordHasher
+
+
+def measure_hash_ms(
+    time_cost: int, memory_cost: int, parallelism: int, rounds: int = 3
+) -> float:
+    hasher = PasswordHasher(
+        time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism
+    )
+    hasher.hash("calibration-password")
+    started = time.perf_counter()
+    for _ in range(rounds):
+        hasher.hash("calibration-password")
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+def calibrate(
+    target_ms: float,
+    max_memory_kib: int,
+    parallelism: int,
+    min_memory_kib: int = 8192,
+) -> tuple[int, int, float]:
+    """Return (time_cost, memory_cost, latency_ms) for the target.
+
+    Memory is preferred over iterations, as recommended by RFC 9106:
+    start at the largest allowed memory, halve it while a single pass
+    is already too slow, then add passes while under the target.
+    """
+    memory_cost = max_memory_kib
+    latency = measure_hash_ms(1, memory_cost, parallelism)
+    while latency > target_ms and memory_cost // 2 >= min_memory_kib:
+        memory_cost //= 2
+        latency = measure_hash_ms(1, memory_cost, parallelism)
+    time_cost = 1
+    while True:
+        next_latency = measure_hash_ms(time_cost + 1, memory_cost, parallelism)
+        if next_latency > target_ms:
+            break
+        time_cost += 1
+        latency = next_latency
+    return time_cost, memory_cost, latency
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target-ms", type=float, default=50.0)
+    parser.add_argument("--max-memory-mib", type=int, default=64)
+    parser.add_argument("--parallelism", type=int, default=4)
+    args = parser.parse_args()
+    time_cost, memory_cost, latency = calibrate(
+        target_ms=args.target_ms,
+        max_memory_kib=args.max_memory_mib * 1024,
+        parallelism=args.parallelism,
+    )
+    print(f"# measured {latency:.1f} ms per hash")
+    print(f"ARGON2_TIME_COST={time_cost}")
+    print(f"ARGON2_MEMORY_COST={memory_cost}")
+    print(f"ARGON2_PARALLELISM={args.parallelism}")
+
+
+if __name__ == "__main__":
+    main()
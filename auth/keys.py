@@ -0,0 +1,172 @@
+"""JWT signing keys: ES256, EdDSA and RS256 in a key ring selected by kid.
+
+Usage:
+    python -m auth.keys generate --algorithm ES256 [--kid KID]
+    python -m auth.keys list
+
+Every *.pem private key in settings.auth.keys_dir is loaded, the
+algorithm follows from the key type. Tokens are signed with the active
+key and carry its kid header. The active key is JWT_ACTIVE_KID, or the
+last kid by name: generated kids start with a timestamp, so that is
+the newest key. Any key still in the ring verifies tokens, so rotation
+is: generate a key, switch JWT_ACTIVE_KID, delete the old file once
+its tokens have expired. Without a keys dir the legacy private.pem is
+used as kid "default". With JWT_ALGORITHM set, loading fails unless the
+active key has that algorithm.
+"""
+
+import argparse
+import datetime
+from dataclasses import dataclass
+from pathlib import Path
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from jwt import InvalidTokenError
+
+from core.config import settings
+
+SUPPORTED_ALGORITHMS: tuple[str, ...] = ("RS256", "ES256", "EdDSA")
+DEFAULT_ALGORITHM = "RS256"
+LEGACY_KID = "default"
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    algorithm: str
+    private_key: object | None
+    public_key: object
+
+
+def generate_private_key(algorithm: str):
+    if algorithm == "RS256":
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    if algorithm == "ES256":
+        return ec.generate_private_key(ec.SECP256R1())
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    raise ValueError(f"Unsupported JWT algorithm {algorithm!r}.")
+
+
+def get_key_algorithm(private_key) -> str:
+    if isinstance(private_key, rsa.RSAPrivateKey):
+        return "RS256"
+    if isinstance(private_key, ec.EllipticCurvePrivateKey) and isinstance(
+        private_key.curve, ec.SECP256R1
+    ):
+        return "ES256"
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        return "EdDSA"
+    raise ValueError(f"Unsupported key type {type(private_key).__name__}.")
+
+
+def make_signing_key(kid: str, private_key) -> SigningKey:
+    return SigningKey(
+        kid=kid,
+        algorithm=get_key_algorithm(private_key),
+        private_key=private_key,
+        public_key=private_key.public_key(),
+    )
+
+
+class KeyRing:
+    def __init__(self, keys: list[SigningKey], active_kid: str):
+        self.keys: dict[str, SigningKey] = {key.kid: key for key in keys}
+        if active_kid not in self.keys:
+            raise ValueError(f"Active key {active_kid!r} is not in key ring.")
+        self.active: SigningKey = self.keys[active_kid]
+
+    def sign(self, payload: dict) -> str:
+        return jwt.encode(
+            payload=payload,
+            key=self.active.private_key,
+            algorithm=self.active.algorithm,
+            headers={"kid": self.active.kid},
+        )
+
+    def verify(self, token: str | bytes) -> dict:
+        """Verify with the key named by kid, pinned to its algorithm."""
+        kid = jwt.get_unverified_header(token).get("kid", LEGACY_KID)
+        if not (key := self.keys.get(kid)):
+            raise InvalidTokenError(f"Unknown signing key {kid!r}.")
+        return jwt.decode(
+            jwt=token, key=key.public_key, algorithms=[key.algorithm]
+        )
+
+
+def load_private_key(path: Path):
+    return serialization.load_pem_private_key(path.read_bytes(), password=None)
+
+
+def load_key_ring(
+    keys_dir: Path = settings.auth.keys_dir,
+    active_kid: str | None = settings.auth.active_kid,
+    algorithm: str | None = settings.auth.algorithm,
+) -> KeyRing:
+    key_files = sorted(keys_dir.glob("*.pem")) if keys_dir.is_dir() else []
+    if not key_files:
+        legacy_key = load_private_key(settings.auth.private_key_path)
+        key_ring = KeyRing(
+            [make_signing_key(LEGACY_KID, legacy_key)], LEGACY_KID
+        )
+    else:
+        keys = [
+            make_signing_key(path.stem, load_private_key(path))
+            for path in key_files
+        ]
+        key_ring = KeyRing(keys, active_kid or key_files[-1].stem)
+    if algorithm and key_ring.active.algorithm != algorithm:
+        raise ValueError(
+            f"Active key {key_ring.active.kid!r} is "
+            f"{key_ring.active.algorithm}, JWT_ALGORITHM is {algorithm}."
+        )
+    return key_ring
+
+
+def write_private_key(private_key, keys_dir: Path, kid: str) -> Path:
+    keys_dir.mkdir(parents=True, exist_ok=True)
+    path = keys_dir / f"{kid}.pem"
+    path.write_bytes(
+        private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+    )
+    path.chmod(0o600)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    generate = commands.add_parser("generate")
+    generate.add_argument(
+        "--algorithm",
+        choices=SUPPORTED_ALGORITHMS,
+        default=settings.auth.algorithm or DEFAULT_ALGORITHM,
+    )
+    generate.add_argument("--kid")
+    commands.add_parser("list")
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        kid = args.kid or datetime.datetime.now(datetime.UTC).strftime(
+            f"%Y%m%d%H%M%S-{args.algorithm.lower()}"
+        )
+        path = write_private_key(
+            generate_private_key(args.algorithm), settings.auth.keys_dir, kid
+        )
+        print(f"{kid}: {path}")
+        print(f"Activate with JWT_ACTIVE_KID={kid}")
+    else:
+        key_ring = load_key_ring()
+        for kid, key in key_ring.keys.items():
+            active = " (active)" if key is key_ring.active else ""
+            print(f"{kid}: {key.algorithm}{active}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,25 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+
 from argon2 import PasswordHasher
 from argon2.exceptions import VerificationError, VerifyMismatchError
 from loguru import logger
 
-password_hasher = PasswordHasher()
+from core.config import settings
+from core.metrics import PASSWORD_HASHING_DURATION
+
+password_hasher = PasswordHasher(
+    time_cost=settings.password_hashing.time_cost,
+    memory_cost=settings.password_hashing.memory_cost,
+    parallelism=settings.password_hashing.parallelism,
+)
+
+
+class PasswordHashingBusyError(Exception):
+    """Raised when no hashing slot frees up within the queue timeout."""
 
 
 def get_password_hash(unhashed_password: str) -> str:
@@ -19,3 +36,69 @@ def password_validation(password: str, hash: str) -> bool:
             f"Verification fails for other reasons. {exception_trace}"
         )
     return True
+
+
+class PasswordHashingService:
+    """Run argon2 in a thread pool so it doesn't block the event loop.
+
+    argon2-cffi releases the GIL while hashing. At most max_concurrency
+    calls run or wait in the pool; callers that can't get a slot within
+    queue_timeout seconds get PasswordHashingBusyError.
+    """
+
+    def __init__(
+        self, workers: int, max_concurrency: int, queue_timeout: float
+    ):
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="argon2"
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def _run(
+        self, operation: str, function: Callable[..., Any], *args
+    ) -> Any:
+        try:
+            await asyncio.wait_for(
+                self._semaphore.acquire(), timeout=self.queue_timeout
+            )
+        except TimeoutError:
+            logger.error("Password hashing queue timeout.")
+            raise PasswordHashingBusyError("Password hashing is busy.")
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, partial(function, *args)
+            )
+        finally:
+            self._semaphore.release()
+            PASSWORD_HASHING_DURATION.labels(operation).observe(
+                time.perf_counter() - started
+            )
+
+    async def hash(self, unhashed_password: str) -> str:
+        return await self._run("hash", get_password_hash, unhashed_password)
+
+    async def verify(self, password: str, hash: str) -> bool:
+        return await self._run(
+            "verify", password_validation, password, hash
+        )
+
+
+password_service = PasswordHashingService(
+    workers=settings.password_hashing.workers,
+    max_concurrency=settings.password_hashing.max_concurrency,
+    queue_timeout=settings.password_hashing.queue_timeout,
+)
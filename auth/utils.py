@@ -1,16 +1,24 @@
 import datetime
+import hashlib
+import time
 
-import jwt
-
+from auth.keys import load_key_ring
+from core.cache import TTLCache
 from core.config import settings
+from core.metrics import JWT_DURATION
+
+key_ring = load_key_ring()
+
+verified_tokens_cache = TTLCache(
+    maxsize=settings.cache.token_cache_size,
+    ttl=settings.auth.access_token_expire_minutes * 60,
+)
 
 
 async def encode_jwt(
     payload: dict,
     expire_minutes: int = settings.auth.access_token_expire_minutes,
     expire_days: int | None = None,
-    key: str = settings.auth.private_key_path.read_text(),
-    algorithm: str = settings.auth.algorithm,
 ) -> str:
     to_encode = payload.copy()
     now_time = datetime.datetime.now(datetime.UTC)
@@ -18,16 +26,22 @@ async def encode_jwt(
     if expire_days:
         expire_time = now_time + datetime.timedelta(days=expire_days)
     to_encode.update(iat=now_time, exp=expire_time)
-    encoded_data: str = jwt.encode(
-        payload=to_encode, key=key, algorithm=algorithm
-    )
+    with JWT_DURATION.labels("sign").time():
+        encoded_data: str = key_ring.sign(to_encode)
     return encoded_data
 
 
-async def decode_jwt(
-    token: str | bytes,
-    key: str = settings.auth.public_key_path.read_text(),
-    algorithm: str = settings.auth.algorithm,
-) -> dict:
-    decoded_data: dict = jwt.decode(jwt=token, key=key, algorithms=[algorithm])
+async def decode_jwt(token: str | bytes) -> dict:
+    """Verify token; verified payloads are cached until their exp."""
+    if isinstance(token, str):
+        token = token.encode()
+    token_digest = hashlib.sha256(token).digest()
+    if payload := verified_tokens_cache.get(token_digest):
+        return payload.copy()
+    with JWT_DURATION.labels("verify").time():
+        decoded_data: dict = key_ring.verify(token)
+    if expire_at := decoded_data.get("exp"):
+        verified_tokens_cache.set(
+            token_digest, decoded_data.copy(), ttl=expire_at - time.time()
+        )
     return decoded_data
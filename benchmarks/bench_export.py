@@ -0,0 +1,116 @@
+"""Memory profile of the streaming mileage events export.
+
+Usage: python -m benchmarks.bench_export [--rows 1000000] [--format csv]
+       [--yield-per 1000] [--compare-list]
+
+Fills a temporary SQLite database with mileage events, then streams
+them through api_v1.export.utils.stream_export while sampling RSS after
+every chunk. With --compare-list it also loads the same rows as ORM
+objects, the way the list endpoints used to, for comparison.
+"""
+
+import argparse
+import asyncio
+import datetime
+import os
+import tempfile
+import time
+
+from sqlalchemy import insert, select
+
+from api_v1.export.crud import mileage_events_statement
+from api_v1.export.utils import stream_export
+from core.database import DatabaseHandler
+from core.models import BaseDbModel, MileageEvent
+
+INSERT_CHUNK = 50_000
+
+
+def rss_mib() -> float:
+    with open("/proc/self/statm") as statm:
+        resident_pages = int(statm.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+async def fill(handler: DatabaseHandler, rows: int) -> None:
+    async with handler.engine.begin() as connection:
+        await connection.run_sync(BaseDbModel.metadata.create_all)
+        start_date = datetime.date(2000, 1, 1)
+        for offset in range(0, rows, INSERT_CHUNK):
+            await connection.execute(
+                insert(MileageEvent),
+                [
+                    {
+                        "vehicle_id": index % 1000 + 1,
+                        "mileage_date": start_date
+                        + datetime.timedelta(days=index % 9000),
+                        "mileage": index,
+                    }
+                    for index in range(
+                        offset, min(offset + INSERT_CHUNK, rows)
+                    )
+                ],
+            )
+
+
+async def run(rows: int, export_format: str, yield_per: int, compare: bool):
+    with tempfile.TemporaryDirectory() as directory:
+        handler = DatabaseHandler(
+            url=f"sqlite+aiosqlite:///{directory}/bench.sqlite3",
+            echo=False,
+            pragmas={"journal_mode": "WAL", "synchronous": "NORMAL"},
+        )
+        started = time.perf_counter()
+        await fill(handler, rows)
+        print(f"filled {rows} rows in {time.perf_counter() - started:.1f} s")
+
+        baseline = peak = rss_mib()
+        exported_bytes = 0
+        started = time.perf_counter()
+        async for chunk in stream_export(
+            session_factory=handler.read_session_factory,
+            statement=mileage_events_statement(),
+            export_format=export_format,
+            yield_per=yield_per,
+        ):
+            exported_bytes += len(chunk)
+            peak = max(peak, rss_mib())
+        elapsed = time.perf_counter() - started
+        print(
+            f"stream {export_format}: {exported_bytes / 2**20:.1f} MiB in "
+            f"{elapsed:.1f} s, RSS {baseline:.1f} -> peak {peak:.1f} MiB "
+            f"(+{peak - baseline:.1f})"
+        )
+
+        if compare:
+            baseline = rss_mib()
+            started = time.perf_counter()
+            async with handler.read_session_factory() as session:
+                events = list(await session.scalars(select(MileageEvent)))
+                peak = rss_mib()
+            elapsed = time.perf_counter() - started
+            print(
+                f"list {len(events)} ORM rows in {elapsed:.1f} s, "
+                f"RSS {baseline:.1f} -> {peak:.1f} MiB "
+                f"(+{peak - baseline:.1f})"
+            )
+        await handler.engine.dispose()
+        await handler.read_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument(
+        "--format", choices=("ndjson", "csv"), default="ndjson"
+    )
+    parser.add_argument("--yield-per", type=int, default=1000)
+    parser.add_argument("--compare-list", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(
+        run(args.rows, args.format, args.yield_per, args.compare_list)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Fleet due report: vectorized computation against a per-vehicle loop.
+
+Usage: python -m benchmarks.bench_fleet_due [--vehicles 100000]
+       [--works-per-vehicle 13] [--naive-vehicles 2000]
+
+Fills a temporary SQLite database and its last event columns, then
+times:
+- loading fleet_due_statement into NumPy columns,
+- compute_fleet_due and select_due over the whole fleet,
+- the naive loop: one get_vehicle_works_with_last_event query and
+  compute_work_due per vehicle, on --naive-vehicles vehicles.
+"""
+
+import argparse
+import asyncio
+import datetime
+import random
+import tempfile
+import time
+
+from sqlalchemy import insert
+
+from api_v1.maintenance.crud import (
+    fleet_due_statement,
+    get_vehicle_works_with_last_event,
+)
+from api_v1.maintenance.fleet import (
+    compute_fleet_due,
+    load_fleet_columns,
+    select_due,
+)
+from api_v1.maintenance.utils import compute_work_due
+from api_v1.works.last_event import refresh_last_event
+from core.config import SQLITE_PRAGMA_PROFILES
+from core.database import DatabaseHandler
+from core.models import BaseDbModel, Vehicle, Work, WorkEvent
+from core.models.works import WorkType
+
+INSERT_CHUNK = 50_000
+
+
+async def insert_chunked(connection, model, rows) -> None:
+    for offset in range(0, len(rows), INSERT_CHUNK):
+        await connection.execute(
+            insert(model), rows[offset : offset + INSERT_CHUNK]
+        )
+
+
+async def fill(handler: DatabaseHandler, vehicles: int, works: int) -> None:
+    today = datetime.date.today()
+    async with handler.engine.begin() as connection:
+        await connection.run_sync(BaseDbModel.metadata.create_all)
+        await insert_chunked(
+            connection,
+            Vehicle,
+            [
+                {
+                    "id": vehicle_id,
+                    "owner_id": vehicle_id % 100 + 1,
+                    "vin_code": f"{vehicle_id:017d}",
+                    "vehicle_manufacturer": "",
+                    "vehicle_model": "",
+                    "vehicle_body": "",
+                    "vehicle_year": 2020,
+                    "vehicle_mileage": random.randint(0, 300000),
+                    "vehicle_last_update_date": today,
+                }
+                for vehicle_id in range(1, vehicles + 1)
+            ],
+        )
+        await insert_chunked(
+            connection,
+            Work,
+            [
+                {
+                    "id": work_id,
+                    "vehicle_id": (work_id - 1) // works + 1,
+                    "title": "",
+                    "interval_km": random.choice([None, 10000, 60000]),
+                    "interval_month": random.choice([None, 12, 24]),
+                    "work_type": WorkType.MAINTENANCE,
+                    "note": "",
+                }
+                for work_id in range(1, vehicles * works + 1)
+            ],
+        )
+        await insert_chunked(
+            connection,
+            WorkEvent,
+            [
+                {
+                    "work_id": work_id,
+                    "work_date": today
+                    - datetime.timedelta(days=random.randint(0, 1000)),
+                    "mileage": random.randint(0, 300000),
+                    "part_price": 0,
+                    "work_price": 0,
+                    "note": "",
+                }
+                for work_id in range(1, vehicles * works + 1, 2)
+            ],
+        )
+    async with handler.session_factory() as session:
+        await refresh_last_event(session)
+        await session.commit()
+
+
+async def run(vehicles: int, works: int, naive_vehicles: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        handler = DatabaseHandler(
+            url=f"sqlite+aiosqlite:///{directory}/bench.sqlite3",
+            echo=False,
+            pragmas=SQLITE_PRAGMA_PROFILES["balanced"],
+        )
+        started = time.perf_counter()
+        await fill(handler, vehicles, works)
+        print(
+            f"filled {vehicles} vehicles, {vehicles * works} works in "
+            f"{time.perf_counter() - started:.1f} s"
+        )
+        today = datetime.date.today()
+
+        async with handler.read_session_factory() as session:
+            started = time.perf_counter()
+            columns = await load_fleet_columns(
+                session=session, statement=fleet_due_statement()
+            )
+            loaded = time.perf_counter() - started
+            started = time.perf_counter()
+            fleet_due = compute_fleet_due(columns=columns, today=today)
+            indexes = select_due(fleet_due=fleet_due, max_urgency=0.1)
+            computed = time.perf_counter() - started
+        rows = len(columns)
+        print(
+            f"load columns: {rows / loaded:12.0f} rows/s ({loaded:.2f} s)"
+        )
+        print(
+            f"vectorized:   {rows / computed:12.0f} rows/s "
+            f"({computed:.3f} s, {len(indexes)} due)"
+        )
+        print(
+            f"load+compute: {rows / (loaded + computed):12.0f} rows/s"
+        )
+
+        naive_rows = 0
+        started = time.perf_counter()
+        async with handler.read_session_factory() as session:
+            for vehicle_id in range(1, naive_vehicles + 1):
+                vehicle_rows = await get_vehicle_works_with_last_event(
+                    session=session, vehicle_id=vehicle_id
+                )
+                for row in vehicle_rows:
+                    compute_work_due(
+                        row=row,
+                        vehicle_mileage=row.vehicle_mileage,
+                        today=today,
+                    )
+                naive_rows += len(vehicle_rows)
+        elapsed = time.perf_counter() - started
+        print(
+            f"per-vehicle:  {naive_rows / elapsed:12.0f} rows/s "
+            f"({naive_vehicles} vehicles in {elapsed:.2f} s)"
+        )
+        await handler.engine.dispose()
+        await handler.read_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vehicles", type=int, default=100_000)
+    parser.add_argument("--works-per-vehicle", type=int, default=13)
+    parser.add_argument("--naive-vehicles", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(
+        run(args.vehicles, args.works_per_vehicle, args.naive_vehicles)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Per-request cost of bearer token verification.
+
+Usage: python -m benchmarks.bench_jwt [--number 2000]
+
+Compares decoding with the PEM text (PyJWT parses the key on every
+call), with a preloaded key object, and through auth.utils.decode_jwt
+where repeated tokens hit the verified-token cache.
+"""
+
+import argparse
+import asyncio
+import time
+
+import jwt
+
+from cryptography.hazmat.primitives import serialization
+
+from auth.utils import decode_jwt, encode_jwt, key_ring, verified_tokens_cache
+
+
+def report(name: str, seconds: float, number: int) -> None:
+    print(f"{name:<28} {seconds / number * 1e6:10.1f} us/decode")
+
+
+async def run(number: int) -> None:
+    token = await encode_jwt({"sub": "bench", "username": "bench"})
+    public_key = key_ring.active.public_key
+    algorithm = key_ring.active.algorithm
+    pem_key = public_key.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+
+    started = time.perf_counter()
+    for _ in range(number):
+        jwt.decode(jwt=token, key=pem_key, algorithms=[algorithm])
+    report("PEM text (before)", time.perf_counter() - started, number)
+
+    started = time.perf_counter()
+    for _ in range(number):
+        jwt.decode(jwt=token, key=public_key, algorithms=[algorithm])
+    report("parsed key object", time.perf_counter() - started, number)
+
+    verified_tokens_cache.clear()
+    started = time.perf_counter()
+    for _ in range(number):
+        await decode_jwt(token)
+    report("decode_jwt with cache", time.perf_counter() - started, number)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000)
+    asyncio.run(run(parser.parse_args().number))
+
+
+if __name__ == "__main__":
+    main()
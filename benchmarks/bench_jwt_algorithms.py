@@ -0,0 +1,50 @@
+"""Sign/verify throughput of the supported JWT algorithms.
+
+Usage: python -m benchmarks.bench_jwt_algorithms [--seconds 1.0]
+"""
+
+import argparse
+import time
+
+from auth.keys import (
+    SUPPORTED_ALGORITHMS,
+    KeyRing,
+    generate_private_key,
+    make_signing_key,
+)
+
+PAYLOAD = {
+    "type": "access",
+    "sub": "bench",
+    "user_id": 1,
+    "username": "bench",
+    "exp": 2**31,
+}
+
+
+def ops_per_second(function, seconds: float) -> float:
+    operations = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        function()
+        operations += 1
+    return operations / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=1.0)
+    seconds = parser.parse_args().seconds
+    print(f"{'algorithm':<10} {'sign ops/s':>12} {'verify ops/s':>14}")
+    for algorithm in SUPPORTED_ALGORITHMS:
+        key = make_signing_key(algorithm, generate_private_key(algorithm))
+        key_ring = KeyRing([key], active_kid=algorithm)
+        token = key_ring.sign(PAYLOAD)
+        sign_rate = ops_per_second(lambda: key_ring.sign(PAYLOAD), seconds)
+        verify_rate = ops_per_second(lambda: key_ring.verify(token), seconds)
+        print(f"{algorithm:<10} {sign_rate:>12.0f} {verify_rate:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Cost of recording request metrics.
+
+Usage: python -m benchmarks.bench_metrics [--number 100000]
+
+Drives a bare ASGI app that sends a small response, directly and
+through MetricsMiddleware, and reports the difference per request.
+Run with PROMETHEUS_MULTIPROC_DIR set to an empty directory to time the
+multiprocess mode, where every update is written to a shared file.
+"""
+
+import argparse
+import asyncio
+import time
+
+from core.metrics import is_multiprocess
+from core.middleware import MetricsMiddleware
+
+
+class Route:
+    path = "/api/v1/vehicle/{vehicle_id}/"
+
+
+async def app(scope, receive, send) -> None:
+    scope["route"] = Route
+    await send({"type": "http.response.start", "status": 200})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive() -> dict:
+    return {"type": "http.request"}
+
+
+async def send(message: dict) -> None:
+    pass
+
+
+async def time_requests(asgi_app, number: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/vehicle/1/"}
+    started = time.perf_counter()
+    for _ in range(number):
+        await asgi_app(dict(scope), receive, send)
+    return time.perf_counter() - started
+
+
+async def run(number: int) -> None:
+    bare = await time_requests(app, number)
+    measured = await time_requests(MetricsMiddleware(app), number)
+    mode = "multiprocess" if is_multiprocess() else "single process"
+    print(f"{mode}: {(measured - bare) / number * 1e6:.2f} us/request")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=100_000)
+    asyncio.run(run(parser.parse_args().number))
+
+
+if __name__ == "__main__":
+    main()
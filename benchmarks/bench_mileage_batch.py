@@ -0,0 +1,124 @@
+"""Throughput of batched mileage ingestion.
+
+Usage: python -m benchmarks.bench_mileage_batch [--readings 200000]
+       [--batch 5000] [--vehicles 1000]
+
+Parses NDJSON batches, validates them and commits each through
+create_mileage_events_batch on a temporary SQLite database, the way
+POST /mileage_events/batch does. Prints readings per second, then the
+same rate for one create_mileage_event commit per reading.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import tempfile
+import time
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api_v1.mileage_events.crud import (
+    create_mileage_event,
+    create_mileage_events_batch,
+)
+from api_v1.mileage_events.utils import parse_batch_body
+from core.config import SQLITE_PRAGMA_PROFILES
+from core.database import DatabaseHandler
+from core.models import BaseDbModel, Vehicle
+from core.schemas.mileage_events import MileageEventCreate
+
+
+def ndjson_batch(start: int, size: int, vehicles: int) -> bytes:
+    today = str(datetime.date.today())
+    return "\n".join(
+        json.dumps(
+            {
+                "vehicle_id": index % vehicles + 1,
+                "mileage_date": today,
+                "mileage": index,
+            }
+        )
+        for index in range(start, start + size)
+    ).encode()
+
+
+async def prepare(handler: DatabaseHandler, vehicles: int) -> None:
+    async with handler.engine.begin() as connection:
+        await connection.run_sync(BaseDbModel.metadata.create_all)
+        await connection.execute(
+            insert(Vehicle),
+            [
+                {
+                    "owner_id": 1,
+                    "vin_code": f"{index:017d}",
+                    "vehicle_manufacturer": "",
+                    "vehicle_model": "",
+                    "vehicle_body": "",
+                    "vehicle_year": 2020,
+                    "vehicle_mileage": 0,
+                    "vehicle_last_update_date": datetime.date.today(),
+                }
+                for index in range(vehicles)
+            ],
+        )
+
+
+async def run(readings: int, batch: int, vehicles: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        handler = DatabaseHandler(
+            url=f"sqlite+aiosqlite:///{directory}/bench.sqlite3",
+            echo=False,
+            pragmas=SQLITE_PRAGMA_PROFILES["balanced"],
+        )
+        await prepare(handler, vehicles)
+        bodies = [
+            ndjson_batch(start, min(batch, readings - start), vehicles)
+            for start in range(0, readings, batch)
+        ]
+
+        started = time.perf_counter()
+        for body in bodies:
+            _, events, _ = parse_batch_body(body, "application/x-ndjson")
+            async with AsyncSession(handler.engine) as session:
+                await create_mileage_events_batch(
+                    session=session, events_data=list(events.values())
+                )
+                await session.commit()
+        elapsed = time.perf_counter() - started
+        print(
+            f"batch of {batch}: {readings / elapsed:10.0f} readings/s "
+            f"({elapsed:.1f} s)"
+        )
+
+        single = min(readings, 2000)
+        started = time.perf_counter()
+        for index in range(single):
+            async with AsyncSession(handler.engine) as session:
+                await create_mileage_event(
+                    session=session,
+                    mileage_event_data=MileageEventCreate(
+                        vehicle_id=index % vehicles + 1,
+                        mileage_date=datetime.date.today(),
+                        mileage=readings + index,
+                    ),
+                )
+                await session.commit()
+        elapsed = time.perf_counter() - started
+        print(f"one per commit: {single / elapsed:10.0f} readings/s")
+        await handler.engine.dispose()
+        await handler.read_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--readings", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=5000)
+    parser.add_argument("--vehicles", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.readings, args.batch, args.vehicles))
+
+
+if __name__ == "__main__":
+    main()
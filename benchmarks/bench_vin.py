@@ -0,0 +1,91 @@
+"""VIN validation throughput.
+
+Usage: python -m benchmarks.bench_vin [--number 100000]
+
+Times core.vin.vin_code_validator per VIN, as VIN_Type runs it, and
+the batch validate_vins on the per-VIN loop and the NumPy path. All
+VINs are valid so every one goes through the checksum. Then times
+VIN decoding per lookup, with and without the LRU cache, on WMIs
+taken from the bundled index.
+"""
+
+import argparse
+import random
+import time
+
+from api_v1.vehicles.vin_batch import vin_errors_numpy
+from core.vin import (
+    ALLOWED_VIN_LETTERS,
+    vin_checksum_calc,
+    vin_code_validator,
+    vin_error,
+)
+from core.vin_decoder import (
+    WMI_INDEX_PATH,
+    WMI_LENGTH,
+    WMI_RECORD_SIZE,
+    vin_decoder,
+)
+
+
+def random_vin() -> str:
+    characters = random.choices("0123456789" + ALLOWED_VIN_LETTERS, k=17)
+    characters[8] = vin_checksum_calc("".join(characters))
+    return "".join(characters)
+
+
+def report(name: str, seconds: float, number: int) -> None:
+    print(f"{name:<28} {number / seconds:12.0f} VINs/s")
+
+
+def report_latency(name: str, seconds: float, number: int) -> None:
+    print(f"{name:<28} {seconds / number * 1e6:12.2f} us/VIN")
+
+
+def run(number: int) -> None:
+    vin_codes = [random_vin() for _ in range(number)]
+
+    started = time.perf_counter()
+    for vin_code in vin_codes:
+        vin_code_validator(vin_code)
+    report("vin_code_validator", time.perf_counter() - started, number)
+
+    started = time.perf_counter()
+    errors = [vin_error(vin_code) for vin_code in vin_codes]
+    report("batch, per-VIN loop", time.perf_counter() - started, number)
+    assert errors.count(None) == number
+
+    started = time.perf_counter()
+    errors = vin_errors_numpy(vin_codes)
+    report("batch, NumPy", time.perf_counter() - started, number)
+    assert errors.count(None) == number
+
+    index = WMI_INDEX_PATH.read_bytes()
+    known_wmis = [
+        index[offset : offset + WMI_LENGTH].decode()
+        for offset in range(0, len(index), WMI_RECORD_SIZE)
+    ]
+    wmis = random.choices(known_wmis, k=number)
+    started = time.perf_counter()
+    for wmi in wmis:
+        vin_decoder._find_manufacturer(wmi)
+    report_latency("WMI index search", time.perf_counter() - started, number)
+    decode_vin_codes = [
+        wmi + vin_code[WMI_LENGTH:] for wmi, vin_code in zip(wmis, vin_codes)
+    ]
+    started = time.perf_counter()
+    for vin_code in decode_vin_codes:
+        vin_decoder.decode(vin_code)
+    report_latency(
+        "decode with LRU cache", time.perf_counter() - started, number
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=100_000)
+    run(parser.parse_args().number)
+
+
+if __name__ == "__main__":
+    main()
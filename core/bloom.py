@@ -0,0 +1,64 @@
+import math
+from hashlib import blake2b
+
+# Counters stop here and are never decremented again.
+MAX_COUNTER = 255
+
+
+class CountingBloomFilter:
+    """Set membership with false positives only, supporting removal.
+
+    Every key sets hash_count one-byte counters chosen by double
+    hashing of a 128-bit blake2b digest. Removing a key that was never
+    added breaks the no-false-negative guarantee, so callers remove
+    only keys they know are present.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.size = math.ceil(
+            -self.capacity * math.log(error_rate) / math.log(2) ** 2
+        )
+        self.hash_count = max(
+            round(self.size / self.capacity * math.log(2)), 1
+        )
+        self.items: int = 0
+        self._counters = bytearray(self.size)
+
+    def __len__(self) -> int:
+        return self.items
+
+    def _positions(self, key: str) -> list[int]:
+        digest = int.from_bytes(
+            blake2b(key.encode(), digest_size=16).digest(), "little"
+        )
+        first, second = digest & (2**64 - 1), (digest >> 64) | 1
+        return [
+            (first + index * second) % self.size
+            for index in range(self.hash_count)
+        ]
+
+    def add(self, key: str) -> None:
+        counters = self._counters
+        for position in self._positions(key):
+            if counters[position] < MAX_COUNTER:
+                counters[position] += 1
+        self.items += 1
+
+    def remove(self, key: str) -> None:
+        counters = self._counters
+        for position in self._positions(key):
+            if 0 < counters[position] < MAX_COUNTER:
+                counters[position] -= 1
+        self.items = max(self.items - 1, 0)
+
+    def __contains__(self, key: str) -> bool:
+        counters = self._counters
+        return all(counters[position] for position in self._positions(key))
+
+    @property
+    def estimated_false_positive_rate(self) -> float:
+        return (
+            1 - math.exp(-self.hash_count * self.items / self.size)
+        ) ** self.hash_count
@@ -1,9 +1,10 @@
 import os
 from pathlib import Path
+from typing import Literal
 
 from dotenv import load_dotenv
 from loguru import logger
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 
 BASE_DIR = Path(__file__).parent.parent
@@ -13,11 +14,41 @@ load_dotenv()
 LOGLEVEL: str = os.getenv("LOGLEVEL", "DEBUG")
 LOGFILE: str = os.getenv("LOGFILE", "main.log")
 ERROR_LOGFILE: str = os.getenv("ERROR_LOGFILE", "error.log")
+# Worker processes the server runs, as uvicorn and gunicorn read it.
+WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", 1))
 
 logger.add(LOGFILE, level=LOGLEVEL, rotation="5 MB")
 logger.add(ERROR_LOGFILE, level="ERROR", rotation="1 MB")
 
 
+SQLITE_PRAGMA_PROFILES: dict[str, dict[str, str | int]] = {
+    "durable": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "mmap_size": 0,
+        "cache_size": -2000,
+        "temp_store": "DEFAULT",
+    },
+    "balanced": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 128 * 1024 * 1024,
+        "cache_size": -16000,
+        "temp_store": "MEMORY",
+    },
+    "throughput": {
+        "busy_timeout": 10000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64000,
+        "temp_store": "MEMORY",
+    },
+}
+
+
 class SQLiteDBSettings(BaseModel):
     _db_path: str = os.path.join(
         BASE_DIR, os.getenv("DB_FILENAME", "db.sqlite3")
@@ -25,12 +56,36 @@ class SQLiteDBSettings(BaseModel):
 
     url: str = f"sqlite+aiosqlite:///{_db_path}"
     echo: bool = bool(int(os.getenv("DB_ECHO", 0)))
+    profile: Literal["durable", "balanced", "throughput"] = Field(
+        default=os.getenv("DB_PROFILE", "balanced"), validate_default=True
+    )
+    foreign_keys: bool = bool(int(os.getenv("DB_FOREIGN_KEYS", 0)))
+    writer_queue_size: int = int(os.getenv("DB_WRITER_QUEUE_SIZE", 1000))
+    writer_max_batch: int = int(os.getenv("DB_WRITER_MAX_BATCH", 100))
+    writer_enqueue_timeout: float = float(
+        os.getenv("DB_WRITER_ENQUEUE_TIMEOUT", 5.0)
+    )
+    read_pool_size: int = int(os.getenv("DB_READ_POOL_SIZE", 10))
+    # Identical statements run this many times in one request are
+    # logged as N+1 patterns; 0 disables the check.
+    n_plus_one_threshold: int = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", 0))
+
+    @property
+    def pragmas(self) -> dict[str, str | int]:
+        """PRAGMAs applied to every new SQLite connection."""
+        pragmas = dict(SQLITE_PRAGMA_PROFILES[self.profile])
+        pragmas.update(foreign_keys="ON" if self.foreign_keys else "OFF")
+        return pragmas
 
 
 class AuthJWT(BaseModel):
     private_key_path: Path = BASE_DIR / ".secrets" / "private.pem"
-    public_key_path: Path = BASE_DIR / ".secrets" / "public.pem"
-    algorithm: str = "RS256"
+    keys_dir: Path = BASE_DIR / ".secrets" / "keys"
+    active_kid: str | None = os.getenv("JWT_ACTIVE_KID")
+    # Algorithm the active key must have; unset accepts the key's own.
+    algorithm: Literal["RS256", "ES256", "EdDSA"] | None = Field(
+        default=os.getenv("JWT_ALGORITHM"), validate_default=True
+    )
     access_token_expire_minutes: int = int(
         os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15")
     )
@@ -39,10 +94,72 @@ class AuthJWT(BaseModel):
     )
 
 
+class PasswordHashingSettings(BaseModel):
+    workers: int = int(os.getenv("ARGON2_WORKERS", os.cpu_count() or 1))
+    max_concurrency: int = int(os.getenv("ARGON2_MAX_CONCURRENCY", 16))
+    queue_timeout: float = float(os.getenv("ARGON2_QUEUE_TIMEOUT", 2.0))
+    time_cost: int = int(os.getenv("ARGON2_TIME_COST", 3))
+    memory_cost: int = int(os.getenv("ARGON2_MEMORY_COST", 65536))
+    parallelism: int = int(os.getenv("ARGON2_PARALLELISM", 4))
+
+
+class CacheSettings(BaseModel):
+    user_cache_size: int = int(os.getenv("USER_CACHE_SIZE", 1024))
+    user_cache_ttl: float = float(os.getenv("USER_CACHE_TTL", 60))
+    token_cache_size: int = int(os.getenv("TOKEN_CACHE_SIZE", 4096))
+    vin_decoder_cache_size: int = int(
+        os.getenv("VIN_DECODER_CACHE_SIZE", 4096)
+    )
+    # Per process: forced off with several workers, see build_vin_filter.
+    vin_filter_enabled: bool = bool(int(os.getenv("VIN_FILTER_ENABLED", 0)))
+    vin_filter_error_rate: float = float(
+        os.getenv("VIN_FILTER_ERROR_RATE", 0.01)
+    )
+    vin_filter_min_capacity: int = int(
+        os.getenv("VIN_FILTER_MIN_CAPACITY", 100000)
+    )
+
+
+class IngestSettings(BaseModel):
+    mileage_batch_max_size: int = int(
+        os.getenv("INGEST_MILEAGE_BATCH_MAX_SIZE", 10000)
+    )
+    mileage_batch_max_bytes: int = int(
+        os.getenv("INGEST_MILEAGE_BATCH_MAX_BYTES", 4 * 1024 * 1024)
+    )
+    vin_batch_max_size: int = int(
+        os.getenv("INGEST_VIN_BATCH_MAX_SIZE", 100000)
+    )
+
+
+class ExportSettings(BaseModel):
+    yield_per: int = int(os.getenv("EXPORT_YIELD_PER", 1000))
+
+
+class ForecastSettings(BaseModel):
+    window_size: int = int(os.getenv("FORECAST_WINDOW_SIZE", 30))
+    cache_size: int = int(os.getenv("FORECAST_CACHE_SIZE", 10000))
+    cache_ttl: float = float(os.getenv("FORECAST_CACHE_TTL", 3600))
+
+
+class MetricsSettings(BaseModel):
+    # Shared directory for multiprocess mode, read by prometheus_client
+    # itself. It must be emptied before the workers start.
+    multiproc_dir: str | None = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    # Seconds between writes of request totals to multiproc_dir.
+    flush_interval: float = float(os.getenv("METRICS_FLUSH_INTERVAL", 1.0))
+
+
 class Settings(BaseSettings):
     api_v1_prefix: str
     db: SQLiteDBSettings = SQLiteDBSettings()
     auth: AuthJWT = AuthJWT()
+    password_hashing: PasswordHashingSettings = PasswordHashingSettings()
+    cache: CacheSettings = CacheSettings()
+    ingest: IngestSettings = IngestSettings()
+    export: ExportSettings = ExportSettings()
+    forecast: ForecastSettings = ForecastSettings()
+    metrics: MetricsSettings = MetricsSettings()
 
 
 settings = Settings(
@@ -1,9 +1,24 @@
+import asyncio
+import time
 from asyncio import current_task
-from typing import AsyncGenerator, AsyncIterator
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    TypeVar,
+)
 
 from loguru import logger
+from sqlalchemy import event, insert, text
 from sqlalchemy.exc import DatabaseError, IntegrityError
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
     AsyncSession,
     async_scoped_session,
     async_sessionmaker,
@@ -12,10 +27,345 @@ from sqlalchemy.ext.asyncio import (
 
 from .config import settings
 
+T = TypeVar("T")
+WriteWork = Callable[[AsyncSession], Awaitable[Any]]
+
+
+@dataclass
+class RequestDBStats:
+    connections: int = 0
+    transactions: int = 0
+    statements: int = 0
+    db_time: float = 0.0
+    rows: int = 0
+    # SQL text -> executions, kept only when N+1 detection is on.
+    statement_counts: Counter[str] | None = None
+
+    def repeated_statements(self, threshold: int) -> dict[str, int]:
+        """Statements executed at least threshold times."""
+        if not self.statement_counts:
+            return {}
+        return {
+            statement: count
+            for statement, count in self.statement_counts.items()
+            if count >= threshold
+        }
+
+
+request_db_stats: ContextVar[RequestDBStats | None] = ContextVar(
+    "request_db_stats", default=None
+)
+
+
+def _count_connection(*args) -> None:
+    if stats := request_db_stats.get():
+        stats.connections += 1
+
+
+def _count_transaction(*args) -> None:
+    if stats := request_db_stats.get():
+        stats.transactions += 1
+
+
+def _count_statement(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    if stats := request_db_stats.get():
+        stats.statements += 1
+        if stats.statement_counts is not None:
+            stats.statement_counts[statement] += 1
+        context.request_stats_started = time.perf_counter()
+
+
+def _time_statement(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    if stats := request_db_stats.get():
+        started = getattr(context, "request_stats_started", None)
+        if started is not None:
+            stats.db_time += time.perf_counter() - started
+        # The aiosqlite cursor adapter buffers result rows in its private
+        # _rows during execute; streamed results are not counted.
+        # SQLAlchemy is pinned to 2.0.x and test_request_stats_count_rows
+        # fails if the attribute goes away.
+        if cursor.description is not None:
+            stats.rows += len(getattr(cursor, "_rows", ()))
+
+
+class WriteQueueFullError(Exception):
+    """Raised when a unit can't be queued within the enqueue timeout."""
+
+
+@dataclass
+class WriteUnit:
+    future: asyncio.Future
+    work: WriteWork | None = None
+    model: Any = None
+    rows: list[dict] = field(default_factory=list)
+    stats: RequestDBStats | None = field(
+        default_factory=request_db_stats.get
+    )
+
+
+@dataclass
+class WriteQueueMetrics:
+    commits: int = 0
+    units: int = 0
+    coalesced_rows: int = 0
+    failed_batches: int = 0
+    last_batch_size: int = 0
+    max_batch_size: int = 0
+
+
+class WriteQueue:
+    """Serialize writes through one connection owned by a writer task.
+
+    Units of work are taken from a bounded queue and group-committed:
+    everything queued while a transaction runs goes into the next one.
+    A unit receives the writer session and must not commit it.
+
+    When a batch fails it is rolled back and every unit is replayed in
+    its own transaction to isolate the failing one, so a unit may run
+    more than once: it must be idempotent and have no side effects
+    outside the session.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        max_size: int = 1000,
+        max_batch: int = 100,
+        enqueue_timeout: float = 5.0,
+    ):
+        self.engine = engine
+        self.max_size = max_size
+        self.max_batch = max_batch
+        self.enqueue_timeout = enqueue_timeout
+        self.metrics = WriteQueueMetrics()
+        self._queue: asyncio.Queue[WriteUnit | None] | None = None
+        self._task: asyncio.Task | None = None
+        self._connection: AsyncConnection | None = None
+        self._closing: bool = False
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    @property
+    def is_running(self) -> bool:
+        return (
+            not self._closing
+            and self._task is not None
+            and not self._task.done()
+        )
+
+    def get_metrics(self) -> dict[str, int | float]:
+        metrics = self.metrics
+        return {
+            "queue_depth": self.queue_depth,
+            "commits": metrics.commits,
+            "units": metrics.units,
+            "coalesced_rows": metrics.coalesced_rows,
+            "failed_batches": metrics.failed_batches,
+            "last_batch_size": metrics.last_batch_size,
+            "max_batch_size": metrics.max_batch_size,
+            "mean_batch_size": (
+                metrics.units / metrics.commits if metrics.commits else 0
+            ),
+        }
+
+    async def start(self) -> None:
+        if self.is_running:
+            return
+        self._closing = False
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._connection = await self.engine.connect()
+        self._task = asyncio.create_task(self._run(), name="db-writer")
+
+    async def stop(self) -> None:
+        if self._queue is None or self._task is None:
+            return
+        self._closing = True
+        await self._queue.put(None)
+        await self._task
+        while not self._queue.empty():
+            if unit := self._queue.get_nowait():
+                self._resolve(
+                    unit, exception=RuntimeError("Database writer stopped.")
+                )
+        if self._connection is not None:
+            await self._connection.close()
+        self._queue = self._task = self._connection = None
+        self._closing = False
+
+    async def _enqueue(self, unit: WriteUnit) -> None:
+        try:
+            await asyncio.wait_for(
+                self._queue.put(unit), timeout=self.enqueue_timeout
+            )
+        except TimeoutError:
+            logger.error(
+                f"Writer queue is full ({self.queue_depth} units waiting)."
+            )
+            raise WriteQueueFullError("Database writer queue is full.")
+
+    async def submit(self, work: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        """Run work in the writer transaction and wait for its commit."""
+        if not self.is_running:
+            return await self._run_standalone(work)
+        unit = WriteUnit(
+            future=asyncio.get_running_loop().create_future(), work=work
+        )
+        await self._enqueue(unit)
+        return await unit.future
+
+    async def submit_insert(self, model: Any, rows: list[dict]) -> None:
+        """Queue plain inserts; rows for one model are coalesced per batch."""
+        if not self.is_running:
+
+            async def work(session: AsyncSession) -> None:
+                await session.execute(insert(model), rows)
+
+            return await self._run_standalone(work)
+        unit = WriteUnit(
+            future=asyncio.get_running_loop().create_future(),
+            model=model,
+            rows=rows,
+        )
+        await self._enqueue(unit)
+        await unit.future
+
+    async def _run_standalone(self, work: WriteWork) -> Any:
+        async with AsyncSession(
+            bind=self.engine, autoflush=False, expire_on_commit=False
+        ) as session:
+            result = await work(session)
+            await session.commit()
+        return result
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            unit = await self._queue.get()
+            if unit is None:
+                break
+            batch = [unit]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                unit = self._queue.get_nowait()
+                if unit is None:
+                    stopping = True
+                    break
+                batch.append(unit)
+            try:
+                await self._commit_batch(batch)
+            except Exception as e:
+                logger.error(f"Writer batch failed. Exception: {e}")
+                for unit in batch:
+                    self._resolve(unit, exception=e)
+
+    async def _commit_batch(self, batch: list[WriteUnit]) -> None:
+        try:
+            results = await self._execute(batch)
+        except Exception as e:
+            logger.debug(f"Writer batch rolled back, replaying units: {e}")
+            self.metrics.failed_batches += 1
+            for unit in batch:
+                try:
+                    result = (await self._execute([unit]))[0]
+                except Exception as unit_error:
+                    self._resolve(unit, exception=unit_error)
+                else:
+                    self._resolve(unit, result=result)
+            return
+        for unit, result in zip(batch, results):
+            self._resolve(unit, result=result)
+
+    @staticmethod
+    def _resolve(
+        unit: WriteUnit,
+        result: Any = None,
+        exception: BaseException | None = None,
+    ) -> None:
+        if unit.future.done():
+            return
+        if exception is not None:
+            unit.future.set_exception(exception)
+        else:
+            unit.future.set_result(result)
+
+    async def _execute(self, batch: list[WriteUnit]) -> list[Any]:
+        results: list[Any] = [None] * len(batch)
+        rows_by_model: dict[Any, list[dict]] = {}
+        async with AsyncSession(
+            bind=self._connection, autoflush=False, expire_on_commit=False
+        ) as session:
+            try:
+                for index, unit in enumerate(batch):
+                    if unit.work is None:
+                        rows_by_model.setdefault(unit.model, []).extend(
+                            unit.rows
+                        )
+                    else:
+                        # Statements of the unit count towards the
+                        # request that submitted it.
+                        token = request_db_stats.set(unit.stats)
+                        try:
+                            results[index] = await unit.work(session)
+                        finally:
+                            request_db_stats.reset(token)
+                for model, rows in rows_by_model.items():
+                    await session.execute(insert(model), rows)
+                await session.commit()
+            except BaseException:
+                await session.rollback()
+                raise
+        self.metrics.commits += 1
+        self.metrics.units += len(batch)
+        self.metrics.coalesced_rows += sum(map(len, rows_by_model.values()))
+        self.metrics.last_batch_size = len(batch)
+        self.metrics.max_batch_size = max(
+            self.metrics.max_batch_size, len(batch)
+        )
+        return results
+
 
 class DatabaseHandler:
-    def __init__(self, url: str, echo: bool):
+    def __init__(
+        self,
+        url: str,
+        echo: bool,
+        pragmas: dict[str, str | int] | None = None,
+        writer_queue_size: int = 1000,
+        writer_max_batch: int = 100,
+        writer_enqueue_timeout: float = 5.0,
+        read_pool_size: int = 10,
+    ):
+        self.pragmas: dict[str, str | int] = pragmas or {}
         self.engine = create_async_engine(url=url, echo=echo)
+        event.listen(self.engine.sync_engine, "connect", self._set_pragmas)
+        self.read_engine = create_async_engine(
+            url=url, echo=echo, pool_size=read_pool_size
+        )
+        event.listen(
+            self.read_engine.sync_engine, "connect", self._set_read_pragmas
+        )
+        self.read_session_factory = async_sessionmaker(
+            bind=self.read_engine,
+            autoflush=False,
+            autocommit=False,
+            expire_on_commit=False,
+        )
+        for engine in (self.engine, self.read_engine):
+            event.listen(
+                engine.sync_engine.pool, "checkout", _count_connection
+            )
+            event.listen(engine.sync_engine, "begin", _count_transaction)
+            event.listen(
+                engine.sync_engine, "before_cursor_execute", _count_statement
+            )
+            event.listen(
+                engine.sync_engine, "after_cursor_execute", _time_statement
+            )
         self.session_factory = async_sessionmaker(
             bind=self.engine,
             autoflush=False,
@@ -25,6 +375,34 @@ class DatabaseHandler:
         self.scoped_session = async_scoped_session(
             session_factory=self.session_factory, scopefunc=current_task
         )
+        self.writer = WriteQueue(
+            engine=self.engine,
+            max_size=writer_queue_size,
+            max_batch=writer_max_batch,
+            enqueue_timeout=writer_enqueue_timeout,
+        )
+
+    def _set_pragmas(self, dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma, value in self.pragmas.items():
+            cursor.execute(f"PRAGMA {pragma}={value}")
+        cursor.close()
+
+    def _set_read_pragmas(self, dbapi_connection, connection_record) -> None:
+        self._set_pragmas(dbapi_connection, connection_record)
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    async def get_pragmas_report(self) -> dict[str, str | int]:
+        """Read back PRAGMAs in effect and log them."""
+        report: dict[str, str | int] = {}
+        async with self.engine.connect() as connection:
+            for pragma in self.pragmas:
+                result = await connection.execute(text(f"PRAGMA {pragma}"))
+                report[pragma] = result.scalar_one()
+        logger.info(f"SQLite PRAGMAs in effect: {report}")
+        return report
 
     async def get_db(self) -> AsyncIterator[AsyncSession]:
         session = self.scoped_session()
@@ -43,5 +421,24 @@ class DatabaseHandler:
         finally:
             await session.close()
 
+    async def get_read_db(self) -> AsyncIterator[AsyncSession]:
+        """Session from the read-only pool, for endpoints that never write."""
+        session = self.read_session_factory()
+        try:
+            yield session
+        except DatabaseError as e:
+            logger.error(f"Database error. Exception: {e}")
+            raise
+        finally:
+            await session.close()
 
-db_handler = DatabaseHandler(url=settings.db.url, echo=settings.db.echo)
+
+db_handler = DatabaseHandler(
+    url=settings.db.url,
+    echo=settings.db.echo,
+    pragmas=settings.db.pragmas,
+    writer_queue_size=settings.db.writer_queue_size,
+    writer_max_batch=settings.db.writer_max_batch,
+    writer_enqueue_timeout=settings.db.writer_enqueue_timeout,
+    read_pool_size=settings.db.read_pool_size,
+)
@@ -2,7 +2,9 @@ from loguru import logger
 from sqlalchemy import delete, insert
 from sqlalchemy.exc import IntegrityError
 
-from core.config import BASE_DIR
+from api_v1.vehicles.vin_filter import vin_filter
+from api_v1.workpatterns.catalog import work_pattern_catalog
+from core.config import BASE_DIR, WEB_CONCURRENCY, settings
 from core.database import db_handler
 from core.models.workpattern import WorkPattern
 from core.utils import (
@@ -23,4 +25,19 @@ async def add_workpatterns_models_to_db() -> None:
                 await session.execute(insert(WorkPattern), wp_data)
                 await session.commit()
             except IntegrityError as e:
+                await session.rollback()
                 logger.error(f"Table is not empty. {e}")
+            await work_pattern_catalog.rebuild(session)
+
+
+async def build_vin_filter() -> None:
+    vin_filter.clear()
+    if not settings.cache.vin_filter_enabled:
+        return
+    if settings.metrics.multiproc_dir or WEB_CONCURRENCY > 1:
+        logger.warning(
+            "VIN filter disabled: it would miss other workers' writes."
+        )
+        return
+    async with db_handler.read_session_factory() as session:
+        await vin_filter.rebuild(session)
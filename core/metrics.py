@@ -0,0 +1,459 @@
+"""Prometheus metrics.
+
+HTTP request metrics are kept by RequestMetrics in plain Python objects,
+so recording a request stays within a few microseconds. With
+PROMETHEUS_MULTIPROC_DIR set, each worker writes its totals to that
+shared directory every flush_interval seconds, from a thread, and when
+it stops. The worker serving /metrics sums the files of all workers;
+requests in progress of workers that are gone are not counted.
+
+argon2 and JWT timings are prometheus_client histograms, which share
+the same directory in multiprocess mode.
+
+Stats that components already keep in process (DB pools, caches, the
+VIN filter, the write queue) are read by StatsCollector at scrape time.
+Under several workers these only describe the worker serving the scrape
+and carry its pid as a label.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Iterable
+
+from loguru import logger
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.metrics_core import (
+    CounterMetricFamily,
+    GaugeMetricFamily,
+    HistogramMetricFamily,
+    Metric,
+)
+from prometheus_client.registry import Collector
+from prometheus_client.utils import floatToGoString
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .config import settings
+
+StatsGetter = Callable[[], dict[str, int | float]]
+
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+SIZE_BUCKETS = (100, 1000, 10_000, 100_000, 1_000_000, 10_000_000)
+# RS256 signing takes about a millisecond, verifying tens of microseconds.
+JWT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005)
+
+REQUEST_METRICS_FILE_PREFIX = "http_requests_"
+
+PASSWORD_HASHING_DURATION = Histogram(
+    "password_hashing_duration_seconds",
+    "argon2 hash and verify time in the thread pool.",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+JWT_DURATION = Histogram(
+    "jwt_duration_seconds",
+    "JWT signing and signature verification time.",
+    ["operation"],
+    buckets=JWT_BUCKETS,
+)
+
+
+def is_multiprocess() -> bool:
+    return bool(settings.metrics.multiproc_dir)
+
+
+def is_process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class BucketCounts:
+    """Histogram observations counted per bucket, not cumulatively.
+
+    The last count is for observations above the highest bound.
+    """
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+def add_histogram(
+    metric: HistogramMetricFamily,
+    labels: list[str],
+    bounds: tuple[float, ...],
+    counts: list[int],
+    total: float,
+) -> None:
+    buckets, cumulative = [], 0
+    for bound, count in zip((*bounds, float("inf")), counts):
+        cumulative += count
+        buckets.append((floatToGoString(bound), cumulative))
+    metric.add_metric(labels, buckets, total)
+
+
+class RequestMetrics(Collector):
+    """Request count, latency and response size per route, and requests
+    in progress."""
+
+    def __init__(self, multiproc_dir: str | None, flush_interval: float):
+        self.multiproc_dir = Path(multiproc_dir) if multiproc_dir else None
+        self.flush_interval = flush_interval
+        self.in_progress: int = 0
+        self._requests: dict[tuple[str, str, int], int] = {}
+        self._routes: dict[tuple[str, str], tuple] = {}
+        self._flushed_at: float = 0.0
+        self._flushing: bool = False
+        self._pid: int | None = None
+        self._path: Path | None = None
+        # Snapshots are numbered so a slow write never replaces a newer.
+        self._write_lock = threading.Lock()
+        self._snapshot_number: int = 0
+        self._written_number: int = 0
+
+    @property
+    def path(self) -> Path | None:
+        """This process's file: pid and a random id, so a worker that
+        gets the pid of a dead one does not take over its totals."""
+        if self.multiproc_dir is None:
+            return None
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._path = self.multiproc_dir / (
+                f"{REQUEST_METRICS_FILE_PREFIX}{self._pid}_"
+                f"{uuid.uuid4().hex}.json"
+            )
+        return self._path
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status_code: int,
+        duration: float,
+        size: int,
+    ) -> None:
+        request_key = (method, route, status_code)
+        self._requests[request_key] = self._requests.get(request_key, 0) + 1
+        if (histograms := self._routes.get((method, route))) is None:
+            histograms = self._routes[method, route] = (
+                BucketCounts(LATENCY_BUCKETS),
+                BucketCounts(SIZE_BUCKETS),
+            )
+        histograms[0].observe(duration)
+        histograms[1].observe(size)
+        if self.multiproc_dir is not None and not self._flushing:
+            now = time.monotonic()
+            if now - self._flushed_at >= self.flush_interval:
+                self._flushed_at = now
+                self.flush_in_background()
+
+    def snapshot(self) -> dict:
+        return {
+            "in_progress": self.in_progress,
+            "requests": [
+                [*request_key, count]
+                for request_key, count in self._requests.items()
+            ],
+            "routes": [
+                [
+                    method,
+                    route,
+                    list(durations.counts),
+                    durations.sum,
+                    list(sizes.counts),
+                    sizes.sum,
+                ]
+                for (method, route), (durations, sizes) in self._routes.items()
+            ],
+        }
+
+    def flush(self) -> None:
+        """Write this worker's totals to the shared directory."""
+        if (path := self.path) is not None:
+            self._snapshot_number += 1
+            self._write(path, self.snapshot(), self._snapshot_number)
+
+    def flush_in_background(self) -> None:
+        """Flush from the default executor, off the running event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self.flush()
+        if (path := self.path) is None:
+            return
+        self._flushing = True
+        self._snapshot_number += 1
+        write = loop.run_in_executor(
+            None, self._write, path, self.snapshot(), self._snapshot_number
+        )
+        write.add_done_callback(self._flush_done)
+
+    def _flush_done(self, write: asyncio.Future) -> None:
+        self._flushing = False
+
+    def _write(self, path: Path, snapshot: dict, number: int) -> None:
+        temporary_path = path.with_suffix(".tmp")
+        with self._write_lock:
+            if number <= self._written_number:
+                return
+            try:
+                temporary_path.write_text(json.dumps(snapshot))
+                temporary_path.replace(path)
+            except OSError as error:
+                logger.error(
+                    f"Request metrics not written to {path}: {error}"
+                )
+                return
+            self._written_number = number
+
+    def _load_snapshots(self) -> list[dict]:
+        """This worker's totals and the files of all the others."""
+        snapshots = [self.snapshot()]
+        if self.multiproc_dir is None:
+            return snapshots
+        for path in self.multiproc_dir.glob(
+            f"{REQUEST_METRICS_FILE_PREFIX}*.json"
+        ):
+            if path == self.path:
+                continue
+            try:
+                snapshot = json.loads(path.read_text())
+            except (OSError, ValueError) as error:
+                logger.error(f"Request metrics in {path} skipped: {error}")
+                continue
+            pid = path.stem.removeprefix(REQUEST_METRICS_FILE_PREFIX)
+            pid = pid.split("_")[0]
+            if pid.isdigit() and not is_process_alive(int(pid)):
+                snapshot["in_progress"] = 0
+            snapshots.append(snapshot)
+        return snapshots
+
+    def collect(self) -> Iterable[Metric]:
+        in_progress = 0
+        requests: dict[tuple[str, str, int], int] = {}
+        routes: dict[tuple[str, str], list] = {}
+        for snapshot in self._load_snapshots():
+            in_progress += snapshot["in_progress"]
+            for method, route, status_code, count in snapshot["requests"]:
+                request_key = (method, route, status_code)
+                requests[request_key] = requests.get(request_key, 0) + count
+            for method, route, *histograms in snapshot["routes"]:
+                if (totals := routes.get((method, route))) is None:
+                    routes[method, route] = histograms
+                    continue
+                for index in (0, 2):
+                    totals[index] = list(
+                        map(sum, zip(totals[index], histograms[index]))
+                    )
+                    totals[index + 1] += histograms[index + 1]
+
+        in_progress_metric = GaugeMetricFamily(
+            "http_requests_in_progress", "HTTP requests being served."
+        )
+        in_progress_metric.add_metric([], in_progress)
+        requests_metric = CounterMetricFamily(
+            "http_requests",
+            "HTTP requests by route template and status.",
+            labels=["method", "route", "status"],
+        )
+        for (method, route, status_code), count in requests.items():
+            requests_metric.add_metric(
+                [method, route, str(status_code)], count
+            )
+        duration_metric = HistogramMetricFamily(
+            "http_request_duration_seconds",
+            "HTTP request latency by route template.",
+            labels=["method", "route"],
+        )
+        size_metric = HistogramMetricFamily(
+            "http_response_size_bytes",
+            "HTTP response body size by route template.",
+            labels=["method", "route"],
+        )
+        for (method, route), histograms in routes.items():
+            durations, duration_sum, sizes, size_sum = histograms
+            add_histogram(
+                duration_metric,
+                [method, route],
+                LATENCY_BUCKETS,
+                durations,
+                duration_sum,
+            )
+            add_histogram(
+                size_metric, [method, route], SIZE_BUCKETS, sizes, size_sum
+            )
+        yield from (
+            in_progress_metric,
+            requests_metric,
+            duration_metric,
+            size_metric,
+        )
+
+
+class PoolStats:
+    """Checkouts and current state of an engine's connection pool."""
+
+    def __init__(self, engine: AsyncEngine):
+        # The engine replaces its pool on dispose, so the pool is looked
+        # up on every read and the listener is bound to the engine.
+        self.engine = engine.sync_engine
+        self.checkouts: int = 0
+        event.listen(self.engine, "checkout", self._count_checkout)
+
+    def _count_checkout(self, *args) -> None:
+        self.checkouts += 1
+
+    def get_stats(self) -> dict[str, int]:
+        pool = self.engine.pool
+        stats = {"checkouts": self.checkouts}
+        if hasattr(pool, "overflow"):
+            stats.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                overflow=max(pool.overflow(), 0),
+            )
+        return stats
+
+
+class StatsCollector(Collector):
+    """Export component get_stats() dicts at scrape time.
+
+    Caches report hits, misses, size and maxsize, as TTLCache.get_stats
+    does, and share the cache_* metrics labeled by cache name. Other
+    sources export each stat as a <prefix>_<stat> gauge; sources sharing
+    a prefix must use the same label names.
+    """
+
+    def __init__(self):
+        self._caches: dict[str, StatsGetter] = {}
+        self._sources: list[tuple[str, str, dict[str, str], StatsGetter]] = []
+
+    def add_cache(self, name: str, get_stats: StatsGetter) -> None:
+        self._caches[name] = get_stats
+
+    def add_source(
+        self,
+        prefix: str,
+        description: str,
+        get_stats: StatsGetter,
+        labels: dict[str, str] | None = None,
+    ) -> None:
+        self._sources.append((prefix, description, labels or {}, get_stats))
+
+    def collect(self) -> Iterable[Metric]:
+        process_labels = (
+            {"pid": str(os.getpid())} if is_multiprocess() else {}
+        )
+        cache_label_names = ["cache", *process_labels]
+        cache_metrics = {
+            "hits": CounterMetricFamily(
+                "cache_hits",
+                "Cache lookups that hit.",
+                labels=cache_label_names,
+            ),
+            "misses": CounterMetricFamily(
+                "cache_misses",
+                "Cache lookups that missed.",
+                labels=cache_label_names,
+            ),
+            "hit_ratio": GaugeMetricFamily(
+                "cache_hit_ratio",
+                "Share of cache lookups that hit.",
+                labels=cache_label_names,
+            ),
+            "size": GaugeMetricFamily(
+                "cache_size", "Entries in the cache.", labels=cache_label_names
+            ),
+            "maxsize": GaugeMetricFamily(
+                "cache_maxsize", "Cache capacity.", labels=cache_label_names
+            ),
+        }
+        for name, get_stats in self._caches.items():
+            stats = get_stats()
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+            for stat, metric in cache_metrics.items():
+                metric.add_metric(
+                    [name, *process_labels.values()], stats[stat]
+                )
+        yield from cache_metrics.values()
+
+        source_metrics: dict[str, GaugeMetricFamily] = {}
+        for prefix, description, labels, get_stats in self._sources:
+            labels = {**labels, **process_labels}
+            for stat, value in get_stats().items():
+                name = f"{prefix}_{stat}"
+                if (metric := source_metrics.get(name)) is None:
+                    metric = source_metrics[name] = GaugeMetricFamily(
+                        name, f"{description}: {stat}.", labels=list(labels)
+                    )
+                metric.add_metric(list(labels.values()), value)
+        yield from source_metrics.values()
+
+
+request_metrics = RequestMetrics(
+    multiproc_dir=settings.metrics.multiproc_dir,
+    flush_interval=settings.metrics.flush_interval,
+)
+stats_collector = StatsCollector()
+if not is_multiprocess():
+    REGISTRY.register(request_metrics)
+    REGISTRY.register(stats_collector)
+
+
+def generate_metrics() -> tuple[bytes, str]:
+    """Metrics in the text exposition format and its content type."""
+    if not is_multiprocess():
+        return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(request_metrics)
+    registry.register(stats_collector)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def shutdown_metrics() -> None:
+    """Write final request totals and drop this worker's live gauges."""
+    if is_multiprocess():
+        request_metrics.flush()
+        multiprocess.mark_process_dead(os.getpid())
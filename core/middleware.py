@@ -0,0 +1,134 @@
+import time
+from collections import Counter
+
+from loguru import logger
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .database import RequestDBStats, request_db_stats
+from .metrics import request_metrics
+
+# Route label of requests that matched no route, so that scanned paths
+# don't each create a series.
+UNMATCHED_ROUTE = "unmatched"
+
+
+class DBStatsMiddleware:
+    """Count DB connections, transactions, statements and rows per request.
+
+    The counters are returned in X-DB-Connections, X-DB-Transactions,
+    X-DB-Statements and X-DB-Rows response headers, and the time spent
+    in the database and in the whole request in a Server-Timing header.
+    The same numbers are logged as structured fields of a debug record.
+
+    With n_plus_one_threshold set, statements executed that many times
+    in one request are logged as N+1 patterns and counted in the
+    X-DB-Repeated-Statements header.
+    """
+
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int = 0):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        stats = RequestDBStats(
+            statement_counts=Counter() if self.n_plus_one_threshold else None
+        )
+        token = request_db_stats.set(stats)
+        started = time.perf_counter()
+        status_code = None
+
+        async def send_with_stats(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                total_ms = (time.perf_counter() - started) * 1000
+                message.setdefault("headers", [])
+                message["headers"] += [
+                    (b"x-db-connections", str(stats.connections).encode()),
+                    (b"x-db-transactions", str(stats.transactions).encode()),
+                    (b"x-db-statements", str(stats.statements).encode()),
+                    (b"x-db-rows", str(stats.rows).encode()),
+                    (
+                        b"server-timing",
+                        (
+                            f"db;dur={stats.db_time * 1000:.2f}, "
+                            f"total;dur={total_ms:.2f}"
+                        ).encode(),
+                    ),
+                ]
+                if self.n_plus_one_threshold:
+                    repeated = stats.repeated_statements(
+                        self.n_plus_one_threshold
+                    )
+                    message["headers"].append(
+                        (
+                            b"x-db-repeated-statements",
+                            str(len(repeated)).encode(),
+                        )
+                    )
+                    for statement, count in repeated.items():
+                        logger.warning(
+                            f"Possible N+1 in {scope['method']} "
+                            f"{scope['path']}: statement run {count} "
+                            f"times: {statement}"
+                        )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            request_db_stats.reset(token)
+            logger.bind(
+                method=scope["method"],
+                path=scope["path"],
+                status_code=status_code,
+                db_statements=stats.statements,
+                db_rows=stats.rows,
+                db_time_ms=round(stats.db_time * 1000, 3),
+                duration_ms=round((time.perf_counter() - started) * 1000, 3),
+            ).debug(
+                f"{scope['method']} {scope['path']} {status_code}: "
+                f"{stats.statements} statements, {stats.rows} rows, "
+                f"{stats.db_time * 1000:.2f} ms in db"
+            )
+
+
+class MetricsMiddleware:
+    """Record request count, latency, response size and requests in
+    progress in core.metrics.request_metrics.
+
+    Requests are labeled by the path template of the route they matched.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        started = time.perf_counter()
+        status_code = 500
+        response_size = 0
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            elif message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        request_metrics.in_progress += 1
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            request_metrics.in_progress -= 1
+            request_metrics.observe(
+                scope["method"],
+                getattr(scope.get("route"), "path", UNMATCHED_ROUTE),
+                status_code,
+                time.perf_counter() - started,
+                response_size,
+            )
@@ -1,5 +1,6 @@
 import datetime
 
+from sqlalchemy import Index
 from sqlalchemy.orm import Mapped
 
 from .base import BaseDbModel
@@ -8,6 +9,13 @@ from .mixins import VehicleRelationMixin
 
 class MileageEvent(VehicleRelationMixin, BaseDbModel):
     _vehicle_back_populates = "mileage_events"
+    __table_args__ = (
+        Index(
+            "ix_api_mileage_events_vehicle_id_mileage_date",
+            "vehicle_id",
+            "mileage_date",
+        ),
+    )
 
     mileage_date: Mapped[datetime.date]
     mileage: Mapped[int]
@@ -15,7 +15,7 @@ if TYPE_CHECKING:
 
 class Vehicle(BaseDbModel):
     owner_id: Mapped[int] = mapped_column(
-        ForeignKey(f"{DB_PREFIX}users.id", ondelete="CASCADE")
+        ForeignKey(f"{DB_PREFIX}users.id", ondelete="CASCADE"), index=True
     )
     owner: Mapped["User"] = relationship(back_populates="vehicles")
     vin_code: Mapped[str] = mapped_column(String(17), unique=True, index=True)
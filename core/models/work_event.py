@@ -1,12 +1,16 @@
 import datetime
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import DB_PREFIX, BaseDbModel
 
 
 class WorkEvent(BaseDbModel):
+    __table_args__ = (
+        Index("ix_api_work_events_work_id_mileage", "work_id", "mileage"),
+    )
+
     work_date: Mapped[datetime.date]
     mileage: Mapped[int]
     work_id: Mapped[int] = mapped_column(
@@ -1,6 +1,8 @@
+import datetime
 from enum import Enum
 from typing import TYPE_CHECKING
 
+from sqlalchemy import Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import BaseDbModel
@@ -18,10 +20,14 @@ class WorkType(Enum):
 
 class Work(VehicleRelationMixin, BaseDbModel):
     _vehicle_back_populates = "works"
+    __table_args__ = (Index("ix_api_works_vehicle_id", "vehicle_id"),)
 
     title: Mapped[str]
     interval_month: Mapped[int | None]
     interval_km: Mapped[int | None]
     work_type: Mapped[WorkType] = mapped_column(default=WorkType.MAINTENANCE)
     note: Mapped[str] = mapped_column(default="")
+    last_event_date: Mapped[datetime.date | None]
+    last_event_mileage: Mapped[int | None]
+    events_count: Mapped[int] = mapped_column(default=0, server_default="0")
     events: Mapped[list["WorkEvent"]] = relationship()
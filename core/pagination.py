@@ -0,0 +1,126 @@
+import base64
+import datetime
+import json
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+
+
+@dataclass(frozen=True)
+class PageParams:
+    limit: int = DEFAULT_PAGE_LIMIT
+    after: list | None = None
+
+
+@dataclass(frozen=True)
+class SortKey:
+    column: InstrumentedAttribute
+    descending: bool = False
+
+
+def encode_cursor(values: list) -> str:
+    data = json.dumps(values, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    padding = "=" * (-len(cursor) % 4)
+    values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    if not isinstance(values, list):
+        raise ValueError("Cursor must encode a list of values.")
+    return values
+
+
+def get_page_params(
+    cursor: str | None = None,
+    limit: int = Query(default=DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+) -> PageParams:
+    if cursor is None:
+        return PageParams(limit=limit)
+    try:
+        return PageParams(limit=limit, after=decode_cursor(cursor))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Incorrect pagination cursor.",
+        )
+
+
+def _cursor_value(sort_key: SortKey, value: Any) -> Any:
+    python_type = sort_key.column.type.python_type
+    if python_type in (datetime.date, datetime.datetime):
+        return python_type.fromisoformat(value)
+    return python_type(value)
+
+
+def _keyset_condition(sort_keys: list[SortKey], values: list):
+    """Rows strictly after values in the (sort_keys) ordering."""
+    conditions = []
+    for position, sort_key in enumerate(sort_keys):
+        equal_prefix = [
+            previous.column == values[index]
+            for index, previous in enumerate(sort_keys[:position])
+        ]
+        value = values[position]
+        after = (
+            sort_key.column < value
+            if sort_key.descending
+            else sort_key.column > value
+        )
+        conditions.append(and_(*equal_prefix, after))
+    return or_(*conditions)
+
+
+async def paginate(
+    session: AsyncSession,
+    statement: Select,
+    sort_keys: list[SortKey],
+    page: PageParams,
+) -> Page:
+    """Keyset-paginate an ORM select ordered by unique sort_keys."""
+    if page.after is not None:
+        if len(page.after) != len(sort_keys):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Incorrect pagination cursor.",
+            )
+        try:
+            values = [
+                _cursor_value(sort_key, value)
+                for sort_key, value in zip(sort_keys, page.after)
+            ]
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Incorrect pagination cursor.",
+            )
+        statement = statement.where(_keyset_condition(sort_keys, values))
+    statement = statement.order_by(
+        *(
+            sort_key.column.desc() if sort_key.descending else sort_key.column
+            for sort_key in sort_keys
+        )
+    ).limit(page.limit + 1)
+    items = list(await session.scalars(statement))
+    next_cursor = None
+    if len(items) > page.limit:
+        items = items[: page.limit]
+        next_cursor = encode_cursor(
+            [getattr(items[-1], sort_key.column.key) for sort_key in sort_keys]
+        )
+    return Page(items=items, next_cursor=next_cursor)
@@ -0,0 +1,28 @@
+import datetime
+
+from pydantic import BaseModel
+
+from core.models.works import WorkType
+
+
+class WorkDueSchema(BaseModel):
+    work_id: int
+    title: str
+    work_type: WorkType
+    interval_km: int | None = None
+    interval_month: int | None = None
+    last_event_date: datetime.date | None = None
+    last_event_mileage: int | None = None
+    due_mileage: int | None = None
+    due_date: datetime.date | None = None
+    due_mileage_date: datetime.date | None = None
+    remaining_km: int | None = None
+    remaining_days: int | None = None
+    urgency: float | None = None
+    overdue: bool = False
+
+
+class VehicleDueSchema(BaseModel):
+    vehicle_id: int
+    vehicle_mileage: int
+    works: list[WorkDueSchema]
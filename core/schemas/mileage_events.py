@@ -22,3 +22,28 @@ class MileageEventSchema(MileageEventBase):
     model_config = ConfigDict(from_attributes=True)
 
     id: int
+
+
+class MileageEventBatchItem(BaseModel):
+    index: int
+    id: int | None = None
+    error: str | None = None
+
+
+class MileageEventBatchResult(BaseModel):
+    created: int
+    failed: int
+    results: list[MileageEventBatchItem]
+
+
+class MileageEventFilter(BaseModel):
+    date_from: datetime.date | None = None
+    date_to: datetime.date | None = None
+
+
+class MileageForecastSchema(BaseModel):
+    vehicle_id: int
+    date: datetime.date
+    readings: int
+    daily_rate: float | None = None
+    mileage: int | None = None
@@ -1,8 +1,9 @@
 import datetime
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, model_validator
 
 from core.vin import VIN_Type
+from core.vin_decoder import vin_decoder
 
 
 class VehicleBase(BaseModel):
@@ -16,7 +17,23 @@ class VehicleBase(BaseModel):
 
 
 class VehicleCreate(VehicleBase):
-    pass
+    """Manufacturer and year left out are decoded from the VIN."""
+
+    vehicle_manufacturer: str | None = None
+    vehicle_year: int | None = None
+
+    @model_validator(mode="after")
+    def autofill_from_vin(self) -> "VehicleCreate":
+        if self.vehicle_manufacturer is None or self.vehicle_year is None:
+            decoded = vin_decoder.decode(self.vin_code)
+            if self.vehicle_manufacturer is None:
+                self.vehicle_manufacturer = decoded.manufacturer
+            if self.vehicle_year is None:
+                self.vehicle_year = decoded.model_year
+        for name in ("vehicle_manufacturer", "vehicle_year"):
+            if getattr(self, name) is None:
+                raise ValueError(f"{name} is not given and not in the VIN.")
+        return self
 
 
 class VehicleUpdate(BaseModel):
@@ -32,3 +49,31 @@ class VehicleSchema(VehicleBase):
     model_config = ConfigDict(from_attributes=True)
     id: int
     owner_id: int
+
+
+class VehicleFilter(BaseModel):
+    owner_id: int | None = None
+    vehicle_manufacturer: str | None = None
+    vehicle_model: str | None = None
+    year_from: int | None = None
+    year_to: int | None = None
+
+
+class VinValidationItem(BaseModel):
+    vin: str
+    valid: bool
+    error: str | None = None
+
+
+class VinValidationResult(BaseModel):
+    valid: int
+    invalid: int
+    results: list[VinValidationItem]
+
+
+class VinDecodeSchema(BaseModel):
+    vin: str
+    wmi: str
+    region: str | None = None
+    manufacturer: str | None = None
+    model_year: int | None = None
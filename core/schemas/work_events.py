@@ -28,3 +28,24 @@ class WorkEventSchema(WorkEventBase):
     model_config = ConfigDict(from_attributes=True)
 
     id: int
+
+
+class WorkEventFilter(BaseModel):
+    date_from: datetime.date | None = None
+    date_to: datetime.date | None = None
+
+
+class IntervalStatsSchema(BaseModel):
+    count: int = 0
+    mean: float | None = None
+    median: float | None = None
+    p90: float | None = None
+    min: float | None = None
+    max: float | None = None
+    stddev: float | None = None
+
+
+class WorkIntervalStatsSchema(BaseModel):
+    work_id: int
+    km: IntervalStatsSchema = IntervalStatsSchema()
+    days: IntervalStatsSchema = IntervalStatsSchema()
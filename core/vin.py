@@ -1,13 +1,28 @@
+from operator import mul
 from typing import Annotated
 
-from loguru import logger
 from pydantic import AfterValidator
 
 ALLOWED_VIN_LETTERS: str = "ABCDEFGHJKLMNPRSTUVWXYZ"
+VIN_LENGTH = 17
+VIN_CHECK_DIGIT_INDEX = 8
+VIN_WEIGHTS = (8, 7, 6, 5, 4, 3, 2, 10, 0, 9, 8, 7, 6, 5, 4, 3, 2)
+VIN_CHECK_DIGITS = "0123456789X"
 
+VIN_LENGTH_ERROR = "VIN length must be 17 characters."
+VIN_CHARACTERS_ERROR = "VIN code contains incorrect characters."
+VIN_CHECKSUM_ERROR = "VIN checksum is incorrect!"
 
-def translitering_vin_character_to_number(vin_char: str) -> int:
-    vin_translate_chars_tuple: tuple = (
+# Byte value of a character that may not appear in a VIN.
+INVALID_VIN_VALUE = 0xFF
+
+
+def _build_vin_values() -> bytes:
+    """256-entry table from an ASCII code to its transliterated value."""
+    table = bytearray([INVALID_VIN_VALUE]) * 256
+    for digit in range(10):
+        table[ord("0") + digit] = digit
+    for letters, number in (
         ("AJ", 1),
         ("BKS", 2),
         ("CLT", 3),
@@ -17,39 +32,61 @@ def translitering_vin_character_to_number(vin_char: str) -> int:
         ("GPX", 7),
         ("HY", 8),
         ("RZ", 9),
-    )
-    if vin_char.isdigit():
-        return int(vin_char)
-    elif vin_char.isalpha():
-        for chars, number in vin_translate_chars_tuple:
-            if vin_char.upper() in chars:
-                return number
-    return 0
+    ):
+        for letter in letters:
+            table[ord(letter)] = table[ord(letter.lower())] = number
+    return bytes(table)
+
+
+VIN_VALUES = _build_vin_values()
+# Same table with disallowed characters counted as 0.
+VIN_CHECKSUM_VALUES = VIN_VALUES.replace(bytes([INVALID_VIN_VALUE]), b"\0")
+
+
+def vin_values(vin_code: str) -> bytes:
+    """Transliterated value per character, INVALID_VIN_VALUE if not allowed.
+
+    Non-ASCII characters become "?", which is not allowed.
+    """
+    return vin_code.encode("ascii", "replace").translate(VIN_VALUES)
+
+
+def translitering_vin_character_to_number(vin_char: str) -> int:
+    return vin_char.encode("ascii", "replace").translate(
+        VIN_CHECKSUM_VALUES
+    )[0]
+
+
+def _check_digit(values: bytes) -> str:
+    return VIN_CHECK_DIGITS[sum(map(mul, values, VIN_WEIGHTS)) % 11]
 
 
 def vin_checksum_calc(vin_code: str) -> str:
-    weights_tuple: tuple = (8, 7, 6, 5, 4, 3, 2, 10, 0, 9, 8, 7, 6, 5, 4, 3, 2)
-    transliterated_list: list = [
-        translitering_vin_character_to_number(char) for char in vin_code
-    ]
-    result_numbers_list = [
-        translated_number * weight_number
-        for translated_number, weight_number in zip(
-            transliterated_list, weights_tuple
-        )
-    ]
-    remainder = sum(result_numbers_list) % 11
-    if remainder == 10:
-        return "X"
-    return str(remainder).upper()
+    return _check_digit(
+        vin_code.encode("ascii", "replace").translate(VIN_CHECKSUM_VALUES)
+    )
+
+
+def vin_error(
+    vin_code: str, checksum_verification: bool = True
+) -> str | None:
+    """Reason the VIN is invalid, or None, in one pass over it."""
+    if len(vin_code) != VIN_LENGTH:
+        return VIN_LENGTH_ERROR
+    values = vin_values(vin_code)
+    if INVALID_VIN_VALUE in values:
+        return VIN_CHARACTERS_ERROR
+    if (
+        checksum_verification
+        and _check_digit(values) != vin_code[VIN_CHECK_DIGIT_INDEX]
+    ):
+        return VIN_CHECKSUM_ERROR
+    return None
 
 
 def vin_format_checking(vin_code: str) -> bool:
-    assert len(vin_code) == 17, f"VIN length must be 17 characters."
-    assert all(
-        vin_char.isdigit() or vin_char.upper() in ALLOWED_VIN_LETTERS
-        for vin_char in vin_code
-    ), f"VIN code contains incorrect characters."
+    error = vin_error(vin_code, checksum_verification=False)
+    assert error is None, error
     return True
 
 
@@ -57,13 +94,8 @@ def vin_code_validator(
     vin_code: str, checksum_verification: bool = True
 ) -> str:
     """Check VIN code format and calculation checksum."""
-    assert vin_format_checking(vin_code)
-    logger.debug(f"{vin_code}: format is correct.")
-    if checksum_verification:
-        assert (
-            vin_checksum_calc(vin_code) == vin_code[8]
-        ), f"VIN checksum is incorrect!"
-        logger.debug(f"VIN {vin_code} checksum is correct.")
+    error = vin_error(vin_code, checksum_verification)
+    assert error is None, error
     return vin_code
 
 
@@ -0,0 +1,132 @@
+"""Offline VIN decoding: manufacturer from the WMI, model year.
+
+The WMI index is core/data/wmi.txt: fixed-width records sorted by key,
+each a 3-character WMI, a space and the manufacturer name padded to
+WMI_RECORD_SIZE bytes with the newline. A 2-character key padded with
+a space covers a whole prefix and is used when the WMI itself is not
+listed. The file is memory-mapped on the first lookup and searched in
+place, so nothing is parsed at startup.
+"""
+
+import datetime
+import mmap
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from core.config import BASE_DIR, settings
+
+WMI_INDEX_PATH = BASE_DIR / "core" / "data" / "wmi.txt"
+WMI_RECORD_SIZE = 32
+WMI_LENGTH = 3
+
+# Model year codes in order; the cycle repeats every 30 years.
+MODEL_YEAR_CODES = "ABCDEFGHJKLMNPRSTVWXY123456789"
+MODEL_YEAR_BASE = 1980
+
+REGIONS = (
+    ("ABCDEFGH", "Africa"),
+    ("JKLMNPR", "Asia"),
+    ("STUVWXYZ", "Europe"),
+    ("12345", "North America"),
+    ("67", "Oceania"),
+    ("89", "South America"),
+)
+
+
+@dataclass(frozen=True)
+class DecodedVin:
+    wmi: str
+    region: str | None
+    manufacturer: str | None
+    model_year: int | None
+
+
+def decode_region(vin_code: str) -> str | None:
+    first = vin_code[0].upper()
+    for characters, region in REGIONS:
+        if first in characters:
+            return region
+    return None
+
+
+def decode_model_year(
+    vin_code: str, today: datetime.date | None = None
+) -> int | None:
+    """Model year from position 10.
+
+    A letter in position 7 selects the 2010-2039 cycle, as in North
+    American VINs. A year more than one year ahead goes back 30 years.
+    """
+    position = MODEL_YEAR_CODES.find(vin_code[9].upper())
+    if position < 0:
+        return None
+    year = MODEL_YEAR_BASE + position
+    if vin_code[6].isalpha():
+        year += len(MODEL_YEAR_CODES)
+    if year > (today or datetime.date.today()).year + 1:
+        year -= len(MODEL_YEAR_CODES)
+    return year
+
+
+class VinDecoder:
+    """Lazily memory-mapped WMI index with an LRU cache of lookups."""
+
+    def __init__(self, path: Path, cache_size: int):
+        self.path = path
+        self._index: mmap.mmap | None = None
+        self.find_manufacturer = lru_cache(maxsize=cache_size)(
+            self._find_manufacturer
+        )
+
+    def _load_index(self) -> mmap.mmap:
+        if self._index is None:
+            with open(self.path, "rb") as index_file:
+                self._index = mmap.mmap(
+                    index_file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+        return self._index
+
+    def _search(self, key: bytes) -> str | None:
+        index = self._load_index()
+        low, high = 0, len(index) // WMI_RECORD_SIZE
+        while low < high:
+            middle = (low + high) // 2
+            offset = middle * WMI_RECORD_SIZE
+            record_key = index[offset : offset + WMI_LENGTH]
+            if record_key < key:
+                low = middle + 1
+            elif record_key > key:
+                high = middle
+            else:
+                record = index[offset : offset + WMI_RECORD_SIZE]
+                return record[WMI_LENGTH:].decode().strip()
+        return None
+
+    def _find_manufacturer(self, wmi: str) -> str | None:
+        key = wmi.upper().encode("ascii", "replace")
+        return self._search(key) or self._search(key[:2] + b" ")
+
+    def get_stats(self) -> dict[str, int]:
+        cache_info = self.find_manufacturer.cache_info()
+        return {
+            "size": cache_info.currsize,
+            "maxsize": cache_info.maxsize,
+            "hits": cache_info.hits,
+            "misses": cache_info.misses,
+        }
+
+    def decode(self, vin_code: str) -> DecodedVin:
+        """Decode a VIN that passed core.vin.vin_error."""
+        wmi = vin_code[:WMI_LENGTH].upper()
+        return DecodedVin(
+            wmi=wmi,
+            region=decode_region(vin_code),
+            manufacturer=self.find_manufacturer(wmi),
+            model_year=decode_model_year(vin_code),
+        )
+
+
+vin_decoder = VinDecoder(
+    path=WMI_INDEX_PATH, cache_size=settings.cache.vin_decoder_cache_size
+)
@@ -1,29 +1,97 @@
 from contextlib import asynccontextmanager
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.openapi.docs import (
     get_swagger_ui_html,
     get_swagger_ui_oauth2_redirect_html,
 )
+from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 
 from api_v1 import router as router_v1
+from api_v1.mileage_events.forecast import mileage_forecaster
+from api_v1.users.cache import user_cache
+from api_v1.vehicles.vin_filter import vin_filter
+from auth.password_operators import PasswordHashingBusyError, password_service
+from auth.utils import verified_tokens_cache
 from core.config import settings
-from core.lifespan import add_workpatterns_models_to_db
+from core.database import WriteQueueFullError, db_handler
+from core.lifespan import add_workpatterns_models_to_db, build_vin_filter
+from core.metrics import (
+    PoolStats,
+    generate_metrics,
+    shutdown_metrics,
+    stats_collector,
+)
+from core.middleware import DBStatsMiddleware, MetricsMiddleware
+from core.vin_decoder import vin_decoder
+
+for engine_name, engine in (
+    ("write", db_handler.engine),
+    ("read", db_handler.read_engine),
+):
+    stats_collector.add_source(
+        "db_pool",
+        "DB connection pool",
+        PoolStats(engine).get_stats,
+        labels={"engine": engine_name},
+    )
+stats_collector.add_cache("user", user_cache.get_stats)
+stats_collector.add_cache("verified_token", verified_tokens_cache.get_stats)
+stats_collector.add_cache("mileage_forecast", mileage_forecaster.get_stats)
+stats_collector.add_cache("vin_decoder", vin_decoder.get_stats)
+stats_collector.add_source(
+    "vin_filter", "VIN Bloom filter", vin_filter.get_stats
+)
+stats_collector.add_source(
+    "db_writer", "DB write queue", db_handler.writer.get_metrics
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    await db_handler.get_pragmas_report()
+    user_cache.clear()
+    mileage_forecaster.clear()
     await add_workpatterns_models_to_db()
+    await build_vin_filter()
+    await db_handler.writer.start()
     yield
+    await db_handler.writer.stop()
+    password_service.shutdown()
+    shutdown_metrics()
 
 
 app = FastAPI(lifespan=lifespan, docs_url=None)
+app.add_middleware(
+    DBStatsMiddleware, n_plus_one_threshold=settings.db.n_plus_one_threshold
+)
+app.add_middleware(MetricsMiddleware)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 app.include_router(router=router_v1, prefix=settings.api_v1_prefix)
 
 
+@app.exception_handler(WriteQueueFullError)
+async def write_queue_full_handler(request: Request, exc: WriteQueueFullError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Service is busy, try again later."},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(PasswordHashingBusyError)
+async def password_hashing_busy_handler(
+    request: Request, exc: PasswordHashingBusyError
+):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Service is busy, try again later."},
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.get("/docs", include_in_schema=False)
 async def custom_swagger_ui_html():
     return get_swagger_ui_html(
@@ -42,6 +110,12 @@ if app.swagger_ui_oauth2_redirect_url:
         return get_swagger_ui_oauth2_redirect_html()
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    content, media_type = generate_metrics()
+    return Response(content=content, media_type=media_type)
+
+
 @app.get("/")
 async def main_page():
     return {"message": "Vehicle maintenance API main page."}
@@ -2,11 +2,13 @@ import random
 from typing import AsyncGenerator
 
 import pytest
+import pytest_asyncio
 from asgi_lifespan import LifespanManager
 from faker import Faker
 from httpx import ASGITransport, AsyncClient
 
 from api_v1.auth.validate import get_current_active_user
+from api_v1.vehicles.vin_filter import vin_filter
 from core.database import db_handler
 from core.models import BaseDbModel
 from core.models.user import User
@@ -19,6 +21,14 @@ from main import app
 fake = Faker()
 
 
+def pytest_collection_modifyitems(items):
+    # Tests share the session loop with the app lifespan and its writer task.
+    session_loop_marker = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if pytest_asyncio.is_async_test(item):
+            item.add_marker(session_loop_marker, append=False)
+
+
 @pytest.fixture(autouse=True, scope="function")
 async def prepare_db():
     async with db_handler.engine.begin() as conn:
@@ -107,6 +117,8 @@ async def vehicles_add_to_db(
         async with db_session as session:
             session.add_all(vehicle_test_models_list)
             await session.commit()
+            # Inserted behind the crud, so the VIN filter must catch up.
+            await vin_filter.rebuild(session)
 
 
 @pytest.fixture(scope="function")
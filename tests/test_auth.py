@@ -0,0 +1,153 @@
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from jwt import ExpiredSignatureError
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api_v1.auth.validate import (
+    get_current_active_user,
+    get_current_active_user_read_only,
+)
+from api_v1.users.cache import user_cache
+from api_v1.users.crud import create_user
+from auth.utils import decode_jwt, encode_jwt, verified_tokens_cache
+from core.database import db_handler
+from core.middleware import DBStatsMiddleware
+from core.models.user import User
+from core.schemas.users import UserCreate, UserSchema
+from main import app
+
+from .conftest import fake
+
+AUTH_API_URL: str = "/api/v1/auth"
+
+
+@pytest.fixture(scope="function")
+async def user_credentials() -> dict:
+    user_data = UserCreate(
+        username=fake.user_name(),
+        first_name=fake.first_name(),
+        last_name=fake.last_name(),
+        email=fake.email(),
+        password=fake.password(),
+    )
+    async for db_session in db_handler.get_db():
+        async with db_session as session:
+            await create_user(session=session, user_data=user_data)
+    return {"username": user_data.username, "password": user_data.password}
+
+
+@pytest.fixture(scope="function")
+async def access_token(user_credentials: dict, async_conn: AsyncClient):
+    response = await async_conn.post(
+        f"{AUTH_API_URL}/login/", data=user_credentials
+    )
+    return response.json()["access_token"]
+
+
+@pytest.fixture(scope="function")
+def real_auth(monkeypatch):
+    monkeypatch.delitem(app.dependency_overrides, get_current_active_user)
+
+
+async def test_login_uses_one_connection(
+    user_credentials: dict, async_conn: AsyncClient
+):
+    response = await async_conn.post(
+        f"{AUTH_API_URL}/login/", data=user_credentials
+    )
+    assert response.status_code == 200
+    assert response.headers["x-db-connections"] == "1"
+    assert response.headers["x-db-transactions"] == "1"
+
+
+async def test_login_with_wrong_password(
+    user_credentials: dict, async_conn: AsyncClient
+):
+    user_credentials.update(password="wrong" + user_credentials["password"])
+    response = await async_conn.post(
+        f"{AUTH_API_URL}/login/", data=user_credentials
+    )
+    assert response.status_code == 401
+
+
+async def test_authenticated_request_uses_one_connection(
+    access_token: str, real_auth, async_conn: AsyncClient
+):
+    user_cache.clear()
+    response = await async_conn.get(
+        f"{AUTH_API_URL}/users/me/",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == 200
+    assert response.headers["x-db-connections"] == "1"
+    assert response.headers["x-db-transactions"] == "1"
+
+
+async def test_read_only_route_shares_session_with_auth(access_token: str):
+    read_app = FastAPI()
+    read_app.add_middleware(DBStatsMiddleware)
+
+    @read_app.get("/users/count")
+    async def count_users(
+        user: UserSchema = Depends(get_current_active_user_read_only),
+        session: AsyncSession = Depends(db_handler.get_read_db),
+    ):
+        return await session.scalar(select(func.count()).select_from(User))
+
+    user_cache.clear()
+    async with AsyncClient(
+        transport=ASGITransport(app=read_app), base_url="http://localhost"
+    ) as client:
+        response = await client.get(
+            "/users/count",
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+    assert response.status_code == 200
+    assert response.headers["x-db-connections"] == "1"
+    assert response.headers["x-db-statements"] == "2"
+
+
+async def test_authenticated_request_served_from_user_cache(
+    access_token: str, real_auth, async_conn: AsyncClient
+):
+    hits_before = user_cache.hits
+    response = await async_conn.get(
+        f"{AUTH_API_URL}/users/me/",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == 200
+    assert response.headers["x-db-connections"] == "0"
+    assert user_cache.hits == hits_before + 1
+
+
+async def test_user_update_invalidates_cache(
+    user_credentials: dict, access_token: str, async_conn: AsyncClient
+):
+    username = user_credentials["username"]
+    cached_user = user_cache.get(username)
+    assert cached_user is not None
+    response = await async_conn.patch(
+        f"/api/v1/users/{cached_user.id}/",
+        json={"first_name": fake.first_name()},
+    )
+    assert response.status_code == 200
+    assert user_cache.get(username) is None
+
+
+async def test_decode_jwt_caches_verified_payload():
+    token = await encode_jwt({"username": fake.user_name()})
+    hits_before = verified_tokens_cache.hits
+    first_payload = await decode_jwt(token)
+    second_payload = await decode_jwt(token)
+    assert first_payload == second_payload
+    assert verified_tokens_cache.hits == hits_before + 1
+
+
+async def test_decode_jwt_rejects_expired_token():
+    token = await encode_jwt(
+        {"username": fake.user_name()}, expire_minutes=-1
+    )
+    with pytest.raises(ExpiredSignatureError):
+        await decode_jwt(token)
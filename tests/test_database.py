@@ -0,0 +1,134 @@
+import asyncio
+import datetime
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import DatabaseError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import SQLITE_PRAGMA_PROFILES, settings
+from core.database import (
+    RequestDBStats,
+    WriteQueue,
+    WriteQueueFullError,
+    db_handler,
+    request_db_stats,
+)
+from core.models.mileage_event import MileageEvent
+from core.models.vehicle import Vehicle
+
+
+async def test_profile_pragmas_applied_on_connect():
+    profile = SQLITE_PRAGMA_PROFILES[settings.db.profile]
+    async with db_handler.engine.connect() as connection:
+        journal_mode = await connection.scalar(text("PRAGMA journal_mode"))
+        busy_timeout = await connection.scalar(text("PRAGMA busy_timeout"))
+    assert journal_mode == str(profile["journal_mode"]).lower()
+    assert busy_timeout == profile["busy_timeout"]
+
+
+async def test_pragmas_report():
+    report = await db_handler.get_pragmas_report()
+    assert set(report) == set(settings.db.pragmas)
+    assert report["foreign_keys"] == int(settings.db.foreign_keys)
+
+
+async def test_writer_group_commits_concurrent_units(
+    vehicle_test_models_list: list[Vehicle], vehicles_add_to_db
+):
+    vehicle = vehicle_test_models_list[0]
+    writer = db_handler.writer
+    commits_before = writer.metrics.commits
+    rows = [
+        {
+            "vehicle_id": vehicle.id,
+            "mileage_date": datetime.date.today(),
+            "mileage": mileage,
+        }
+        for mileage in range(10)
+    ]
+    await asyncio.gather(
+        *(writer.submit_insert(MileageEvent, [row]) for row in rows)
+    )
+    assert writer.metrics.commits - commits_before < len(rows)
+    assert writer.metrics.max_batch_size > 1
+    assert writer.get_metrics()["queue_depth"] == 0
+    async for db_session in db_handler.get_db():
+        async with db_session as session:
+            events_count = await session.scalar(
+                select(func.count()).select_from(MileageEvent)
+            )
+    assert events_count == len(rows)
+
+
+async def test_writer_isolates_failed_unit():
+    async def failing_work(session: AsyncSession) -> None:
+        await session.execute(text("SELECT * FROM non_existent_table"))
+
+    async def work(session: AsyncSession) -> int:
+        return await session.scalar(text("SELECT 1"))
+
+    results = await asyncio.gather(
+        db_handler.writer.submit(failing_work),
+        db_handler.writer.submit(work),
+        return_exceptions=True,
+    )
+    assert isinstance(results[0], DatabaseError)
+    assert results[1] == 1
+
+
+async def test_writer_enqueue_timeout_when_queue_is_full():
+    writer = WriteQueue(
+        engine=db_handler.engine, max_size=1, enqueue_timeout=0.05
+    )
+    await writer.start()
+    release = asyncio.Event()
+
+    async def blocking_work(session: AsyncSession) -> None:
+        await release.wait()
+
+    running = asyncio.create_task(writer.submit(blocking_work))
+    await asyncio.sleep(0.01)
+    queued = asyncio.create_task(writer.submit(blocking_work))
+    await asyncio.sleep(0.01)
+    assert writer.queue_depth == 1
+    with pytest.raises(WriteQueueFullError):
+        await writer.submit(blocking_work)
+    release.set()
+    await asyncio.gather(running, queued)
+    assert writer.get_metrics()["queue_depth"] == 0
+    await writer.stop()
+
+
+async def test_writer_runs_units_standalone_after_stop():
+    writer = WriteQueue(engine=db_handler.engine)
+    await writer.start()
+    await writer.stop()
+    assert not writer.is_running
+    result = await writer.submit(
+        lambda session: session.scalar(text("SELECT 1"))
+    )
+    assert result == 1
+
+
+async def test_read_session_is_query_only():
+    async for session in db_handler.get_read_db():
+        assert await session.scalar(text("PRAGMA query_only")) == 1
+        with pytest.raises(DatabaseError):
+            await session.execute(
+                text("DELETE FROM api_vehicles WHERE id = -1")
+            )
+
+
+async def test_request_stats_count_rows(
+    vehicle_test_models_list: list[Vehicle], vehicles_add_to_db
+):
+    stats = RequestDBStats()
+    token = request_db_stats.set(stats)
+    try:
+        async with db_handler.read_session_factory() as session:
+            await session.scalars(select(Vehicle.id))
+    finally:
+        request_db_stats.reset(token)
+    assert stats.statements == 1
+    assert stats.rows == len(vehicle_test_models_list)
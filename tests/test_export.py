@@ -0,0 +1,87 @@
+import csv
+import datetime
+import io
+import json
+
+from httpx import AsyncClient
+
+from core.database import db_handler
+from core.models.mileage_event import MileageEvent
+from core.models.user import User
+from core.models.vehicle import Vehicle
+from core.models.works import Work
+
+EXPORT_API_URL: str = "/api/v1/export"
+
+
+async def test_export_vehicles_ndjson(
+    vehicle_test_models_list: list[Vehicle],
+    vehicles_add_to_db,
+    async_conn: AsyncClient,
+):
+    response = await async_conn.get(f"{EXPORT_API_URL}/vehicles")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["vin_code"] for row in rows] == [
+        vehicle.vin_code
+        for vehicle in sorted(vehicle_test_models_list, key=lambda x: x.id)
+    ]
+
+
+async def test_export_vehicles_owner_filter(
+    random_user_from_list: User,
+    vehicles_add_to_db,
+    async_conn: AsyncClient,
+):
+    response = await async_conn.get(
+        f"{EXPORT_API_URL}/vehicles",
+        params={"owner_id": random_user_from_list.id},
+    )
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows
+    assert {row["owner_id"] for row in rows} == {random_user_from_list.id}
+
+
+async def test_export_works_csv(
+    works_test_list: list[Work],
+    works_add_to_db,
+    async_conn: AsyncClient,
+):
+    response = await async_conn.get(
+        f"{EXPORT_API_URL}/works", params={"format": "csv"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == len(works_test_list)
+    assert {row["work_type"] for row in rows} <= {
+        work.work_type.value for work in works_test_list
+    }
+
+
+async def test_export_mileage_events_since(
+    random_vehicle_from_list: Vehicle,
+    vehicles_add_to_db,
+    async_conn: AsyncClient,
+):
+    async for db_session in db_handler.get_db():
+        async with db_session as session:
+            session.add_all(
+                MileageEvent(
+                    vehicle_id=random_vehicle_from_list.id,
+                    mileage_date=datetime.date(2024, 1, day),
+                    mileage=day * 1000,
+                )
+                for day in range(1, 11)
+            )
+            await session.commit()
+    response = await async_conn.get(
+        f"{EXPORT_API_URL}/mileage_events", params={"since": "2024-01-08"}
+    )
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["mileage_date"] for row in rows] == [
+        "2024-01-08",
+        "2024-01-09",
+        "2024-01-10",
+    ]
@@ -0,0 +1,152 @@
+import datetime
+import json
+import random
+from types import SimpleNamespace
+
+import numpy as np
+from httpx import AsyncClient
+
+from api_v1.maintenance.fleet import (
+    FleetColumns,
+    compute_fleet_due,
+    select_due,
+)
+from api_v1.maintenance.utils import compute_work_due
+from api_v1.works.last_event import refresh_last_event
+from core.database import db_handler
+from core.models.user import User
+from core.models.vehicle import Vehicle
+from core.models.work_event import WorkEvent
+from core.models.works import Work, WorkType
+
+FLEET_API_URL: str = "/api/v1/fleet"
+
+
+def random_work_row(work_id: int) -> SimpleNamespace:
+    last_event_date = random.choice(
+        [None, datetime.date(2020, 1, 31) + datetime.timedelta(days=work_id)]
+    )
+    return SimpleNamespace(
+        work_id=work_id,
+        title="",
+        work_type=WorkType.MAINTENANCE,
+        interval_km=random.choice([None, 0, 5000, 15000]),
+        interval_month=random.choice([None, 0, 1, 6, 12]),
+        vehicle_mileage=random.randint(0, 200000),
+        last_event_mileage=(
+            random.randint(0, 200000) if last_event_date else None
+        ),
+        last_event_date=last_event_date,
+    )
+
+
+def test_compute_fleet_due_matches_per_work_computation():
+    today = datetime.date(2024, 3, 31)
+    rows = [random_work_row(work_id) for work_id in range(1, 2001)]
+    columns = FleetColumns(
+        work_id=np.array([row.work_id for row in rows]),
+        vehicle_id=np.ones(len(rows), dtype=np.int64),
+        interval_km=np.array([row.interval_km for row in rows], np.float64),
+        interval_month=np.array(
+            [row.interval_month for row in rows], np.float64
+        ),
+        vehicle_mileage=np.array([row.vehicle_mileage for row in rows]),
+        last_event_mileage=np.array(
+            [row.last_event_mileage for row in rows], np.float64
+        ),
+        last_event_ordinal=np.array(
+            [
+                row.last_event_date and row.last_event_date.toordinal()
+                for row in rows
+            ],
+            np.float64,
+        ),
+    )
+    fleet_due = compute_fleet_due(columns=columns, today=today)
+    for index, row in enumerate(rows):
+        expected = compute_work_due(
+            row=row, vehicle_mileage=row.vehicle_mileage, today=today
+        )
+        due_mileage = fleet_due.due_mileage[index]
+        assert (expected.due_mileage is None) == np.isnan(due_mileage)
+        if expected.due_mileage is not None:
+            assert expected.due_mileage == due_mileage
+        due_date = fleet_due.due_date[index]
+        assert (expected.due_date is None) == np.isnan(due_date)
+        if expected.due_date is not None:
+            assert expected.due_date == datetime.date(1970, 1, 1) + (
+                datetime.timedelta(days=int(due_date))
+            )
+        urgency = fleet_due.urgency[index]
+        assert (expected.urgency is None) == np.isnan(urgency)
+        if expected.urgency is not None:
+            assert abs(expected.urgency - urgency) < 1e-9
+    selected = select_due(fleet_due=fleet_due, max_urgency=0.0)
+    assert np.all(np.diff(fleet_due.urgency[selected]) >= 0)
+    assert np.all(fleet_due.urgency[selected] <= 0)
+
+
+async def test_get_fleet_due(
+    vehicle_test_models_list: list[Vehicle],
+    random_user_from_list: User,
+    vehicles_add_to_db,
+    async_conn: AsyncClient,
+):
+    works = []
+    for vehicle in vehicle_test_models_list:
+        works += [
+            Work(
+                id=vehicle.id * 10 + 1,
+                vehicle_id=vehicle.id,
+                title="Overdue",
+                interval_km=1,
+                work_type=WorkType.MAINTENANCE,
+            ),
+            Work(
+                id=vehicle.id * 10 + 2,
+                vehicle_id=vehicle.id,
+                title="Fresh",
+                interval_km=10000,
+                interval_month=12,
+                work_type=WorkType.MAINTENANCE,
+            ),
+        ]
+    async for db_session in db_handler.get_db():
+        async with db_session as session:
+            session.add_all(works)
+            session.add_all(
+                WorkEvent(
+                    work_id=vehicle.id * 10 + 2,
+                    work_date=datetime.date.today(),
+                    mileage=vehicle.vehicle_mileage,
+                    part_price=0,
+                    work_price=0,
+                    note="",
+                )
+                for vehicle in vehicle_test_models_list
+            )
+            await session.flush()
+            await refresh_last_event(session)
+            await session.commit()
+
+    response = await async_conn.get(f"{FLEET_API_URL}/due")
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert {row["work_id"] for row in rows} == {
+        vehicle.id * 10 + 1 for vehicle in vehicle_test_models_list
+    }
+    assert all(row["overdue"] for row in rows)
+
+    response = await async_conn.get(
+        f"{FLEET_API_URL}/due",
+        params={"owner_id": random_user_from_list.id, "max_urgency": 1},
+    )
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    owner_vehicle_ids = {
+        vehicle.id
+        for vehicle in vehicle_test_models_list
+        if vehicle.owner_id == random_user_from_list.id
+    }
+    assert {row["vehicle_id"] for row in rows} == owner_vehicle_ids
+    assert len(rows) == 2 * len(owner_vehicle_ids)
+    assert rows[0]["overdue"] and not rows[-1]["overdue"]
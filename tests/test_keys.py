@@ -0,0 +1,49 @@
+import pytest
+from jwt import InvalidTokenError
+
+from auth.keys import (
+    SUPPORTED_ALGORITHMS,
+    KeyRing,
+    generate_private_key,
+    load_key_ring,
+    make_signing_key,
+    write_private_key,
+)
+
+PAYLOAD = {"username": "test", "exp": 2**31}
+
+
+@pytest.mark.parametrize("algorithm", SUPPORTED_ALGORITHMS)
+def test_sign_and_verify(algorithm: str):
+    key = make_signing_key("kid", generate_private_key(algorithm))
+    key_ring = KeyRing([key], active_kid="kid")
+    assert key.algorithm == algorithm
+    assert key_ring.verify(key_ring.sign(PAYLOAD)) == PAYLOAD
+
+
+def test_rotated_key_still_verifies_old_tokens(tmp_path):
+    write_private_key(generate_private_key("RS256"), tmp_path, "2024-rs256")
+    old_token = load_key_ring(tmp_path, "2024-rs256").sign(PAYLOAD)
+    write_private_key(generate_private_key("ES256"), tmp_path, "2025-es256")
+    key_ring = load_key_ring(tmp_path, active_kid=None)
+    assert key_ring.active.kid == "2025-es256"
+    assert key_ring.verify(old_token) == PAYLOAD
+
+
+def test_algorithm_must_match_active_key(tmp_path):
+    write_private_key(generate_private_key("ES256"), tmp_path, "es256")
+    key_ring = load_key_ring(tmp_path, None, algorithm="ES256")
+    assert key_ring.active.algorithm == "ES256"
+    with pytest.raises(ValueError):
+        load_key_ring(tmp_path, None, algorithm="RS256")
+
+
+def test_unknown_kid_is_rejected():
+    signer = KeyRing(
+        [make_signing_key("a", generate_private_key("ES256"))], "a"
+    )
+    verifier = KeyRing(
+        [make_signing_key("b", generate_private_key("ES256"))], "b"
+    )
+    with pytest.raises(InvalidTokenError):
+        verifier.verify(signer.sign(PAYLOAD))
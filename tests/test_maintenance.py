@@ -0,0 +1,145 @@
+import datetime
+
+from httpx import AsyncClient
+
+from api_v1.maintenance.utils import add_months
+from api_v1.works.last_event import refresh_last_event
+from core.database import db_handler
+from core.models.vehicle import Vehicle
+from core.models.work_event import WorkEvent
+from core.models.works import Work, WorkType
+
+MAINTENANCE_API_URL: str = "/api/v1/vehicle"
+
+
+def make_event(work_id: int, work_date: datetime.date, mileage: int):
+    return WorkEvent(
+        work_id=work_id,
+        work_date=work_date,
+        mileage=mileage,
+        part_price=0,
+        work_price=0,
+        note="",
+    )
+
+
+def test_add_months_clamps_day():
+    assert add_months(datetime.date(2024, 1, 31), 1) == datetime.date(
+        2024, 2, 29
+    )
+    assert add_months(datetime.date(2024, 11, 15), 14) == datetime.date(
+        2026, 1, 15
+    )
+
+
+async def test_get_vehicle_due(
+    random_vehicle_from_list: Vehicle,
+    vehicles_add_to_db,
+    async_conn: AsyncClient,
+):
+    vehicle_id = random_vehicle_from_list.id
+    vehicle_mileage = random_vehicle_from_list.vehicle_mileage
+    today = datetime.date.today()
+    async for db_session in db_handler.get_db():
+        async with db_session as session:
+            session.add_all(
+                [
+                    Work(
+                        id=1,
+                        vehicle_id=vehicle_id,
+                        title="Oil",
+                        interval_km=10000,
+                        interval_month=12,
+                        work_type=WorkType.MAINTENANCE,
+                    ),
+                    Work(
+                        id=2,
+                        vehicle_id=vehicle_id,
+                        title="Brake fluid",
+                        interval_month=24,
+                        work_type=WorkType.MAINTENANCE,
+                    ),
+                    Work(
+                        id=3,
+                        vehicle_id=vehicle_id,
+                        title="Tuning",
+                        work_type=WorkType.TUNING,
+                    ),
+                    make_event(1, today, vehicle_mileage - 12000),
+                    make_event(1, today, vehicle_mileage - 9000),
+                    make_event(1, today - datetime.timedelta(days=30), 0),
+                    make_event(2, add_months(today, -12), 0),
+                ]
+            )
+            await session.flush()
+            await refresh_last_event(session)
+            await session.commit()
+    response = await async_conn.get(
+        f"{MAINTENANCE_API_URL}/{vehicle_id}/due"
+    )
+    assert response.status_code == 200
+    assert int(response.headers["x-db-statements"]) <= 2
+    due = response.json()
+    assert due["vehicle_mileage"] == vehicle_mileage
+    assert [work["work_id"] for work in due["works"]] == [1, 2, 3]
+    oil = due["works"][0]
+    assert oil["last_event_mileage"] == vehicle_mileage - 9000
+    assert oil["due_mileage"] == vehicle_mileage + 1000
+    assert oil["remaining_km"] == 1000
+    assert oil["urgency"] == 0.1
+    assert not oil["overdue"]
+    assert due["works"][1]["due_date"] == str(add_months(today, 12))
+    assert due["works"][2]["urgency"] is None
+
+
+async def test_get_vehicle_due_overdue_first(
+    random_vehicle_from_list: Vehicle,
+    vehicles_add_to_db,
+    async_conn: AsyncClient,
+):
+    vehicle_id = random_vehicle_from_list.id
+    long_interval = 10 * random_vehicle_from_list.vehicle_mileage
+    async for db_session in db_handler.get_db():
+        async with db_session as session:
+            session.add_all(
+                [
+                    Work(
+                        id=1,
+                        vehicle_id=vehicle_id,
+                        title="Filter",
+                        interval_km=long_interval,
+                        work_type=WorkType.MAINTENANCE,
+                    ),
+                    Work(
+                        id=2,
+                        vehicle_id=vehicle_id,
+                        title="Belt",
+                        interval_km=1,
+                        work_type=WorkType.MAINTENANCE,
+                    ),
+                ]
+            )
+            await session.commit()
+    response = await async_conn.get(
+        f"{MAINTENANCE_API_URL}/{vehicle_id}/due"
+    )
+    works = response.json()["works"]
+    assert [work["work_id"] for work in works] == [2, 1]
+    assert works[0]["overdue"]
+
+
+async def test_get_vehicle_due_without_works(
+    random_vehicle_from_list: Vehicle,
+    vehicles_add_to_db,
+    async_conn: AsyncClient,
+):
+    response = await async_conn.get(
+        f"{MAINTENANCE_API_URL}/{random_vehicle_from_list.id}/due"
+    )
+    assert response.status_code == 200
+    assert response.json()["works"] == []
+
+
+async def test_get_non_existent_vehicle_due(async_conn: AsyncClient):
+    response = await async_conn.get(f"{MAINTENANCE_API_URL}/10000/due")
+    assert response.status_code == 404
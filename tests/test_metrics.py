@@ -0,0 +1,128 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+from prometheus_client.parser import text_string_to_metric_families
+
+from auth.password_operators import get_password_hash, password_service
+from auth.utils import decode_jwt, encode_jwt
+from core.metrics import LATENCY_BUCKETS, RequestMetrics
+from core.middleware import UNMATCHED_ROUTE
+from core.models.works import Work
+
+METRICS_URL: str = "/metrics"
+
+
+async def get_samples(async_conn: AsyncClient) -> dict[tuple, float]:
+    """Scrape /metrics into {(sample name, sorted labels): value}."""
+    response = await async_conn.get(METRICS_URL)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    return {
+        (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+        for family in text_string_to_metric_families(response.text)
+        for sample in family.samples
+    }
+
+
+async def test_metrics_record_routes(
+    random_work_model: Work, works_add_to_db, async_conn: AsyncClient
+):
+    route = "/api/v1/works/{work_id}/"
+    labels = (("method", "GET"), ("route", route))
+    before = await get_samples(async_conn)
+    for _ in range(3):
+        response = await async_conn.get(
+            f"/api/v1/works/{random_work_model.id}/"
+        )
+    response_size = len(response.content)
+    await async_conn.get("/api/v1/no/such/path")
+    samples = await get_samples(async_conn)
+
+    def increase(name: str, labels: tuple) -> float:
+        return samples[name, labels] - before.get((name, labels), 0)
+
+    assert increase("http_requests_total", (*labels, ("status", "200"))) == 3
+    assert increase("http_request_duration_seconds_count", labels) == 3
+    assert increase("http_response_size_bytes_sum", labels) == (
+        3 * response_size
+    )
+    assert (
+        increase(
+            "http_requests_total",
+            (("method", "GET"), ("route", UNMATCHED_ROUTE), ("status", "404")),
+        )
+        == 1
+    )
+    assert samples["http_requests_in_progress", ()] == 1
+    assert samples["db_pool_checkouts", (("engine", "write"),)] >= 3
+    assert ("db_pool_overflow", (("engine", "read"),)) in samples
+    assert ("cache_hit_ratio", (("cache", "user"),)) in samples
+    assert ("vin_filter_lookups", ()) in samples
+    assert ("db_writer_commits", ()) in samples
+
+
+async def test_auth_timings_are_recorded():
+    def count(name: str, operation: str) -> float:
+        value = REGISTRY.get_sample_value(
+            f"{name}_count", {"operation": operation}
+        )
+        return value or 0
+
+    before_verify = count("password_hashing_duration_seconds", "verify")
+    before_sign = count("jwt_duration_seconds", "sign")
+    await password_service.verify("password", get_password_hash("password"))
+    await decode_jwt(await encode_jwt({"sub": "metrics"}))
+    assert count("password_hashing_duration_seconds", "verify") == (
+        before_verify + 1
+    )
+    assert count("jwt_duration_seconds", "sign") == before_sign + 1
+
+
+def test_request_metrics_sum_worker_files(tmp_path: Path):
+    worker = RequestMetrics(multiproc_dir=str(tmp_path), flush_interval=60)
+    other_worker = RequestMetrics(multiproc_dir=None, flush_interval=60)
+    for metrics, duration in ((worker, 0.002), (other_worker, 20.0)):
+        metrics.observe("GET", "/route", 200, duration, 10)
+    other_worker.in_progress = 2
+    (tmp_path / f"http_requests_{os.getppid()}_a.json").write_text(
+        json.dumps(other_worker.snapshot())
+    )
+    dead_worker = subprocess.Popen([sys.executable, "-c", ""])
+    dead_worker.wait()
+    (tmp_path / f"http_requests_{dead_worker.pid}_b.json").write_text(
+        json.dumps({"in_progress": 5, "requests": [], "routes": []})
+    )
+    worker.observe("GET", "/route", 500, 0.002, 10)
+
+    families = list(worker.collect())
+    samples = {
+        (name, labels.get("status"), labels.get("le")): value
+        for family in families
+        for name, labels, value, *_ in family.samples
+    }
+    assert samples["http_requests_total", "200", None] == 2
+    assert samples["http_requests_total", "500", None] == 1
+    assert samples["http_requests_in_progress", None, None] == 2
+    assert samples["http_request_duration_seconds_count", None, None] == 3
+    bucket = "http_request_duration_seconds_bucket"
+    assert samples[bucket, None, "0.0025"] == 2
+    assert samples[bucket, None, str(LATENCY_BUCKETS[-1])] == 2
+    assert samples[bucket, None, "+Inf"] == 3
+    assert samples["http_response_size_bytes_sum", None, None] == 30
+
+
+async def test_request_metrics_flush_off_event_loop(tmp_path: Path):
+    worker = RequestMetrics(multiproc_dir=str(tmp_path), flush_interval=0)
+    worker.observe("GET", "/route", 200, 0.002, 10)
+    assert worker.path.parent == tmp_path
+    assert worker.path.name.startswith(f"http_requests_{os.getpid()}_")
+    while worker._flushing:
+        await asyncio.sleep(0.001)
+    snapshot = json.loads(worker.path.read_text())
+    assert snapshot["requests"] == [["GET", "/route", 200, 1]]
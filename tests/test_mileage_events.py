@@ -0,0 +1,232 @@
+import datetime
+import json
+
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from api_v1.vehicles.utils import raise_vehicles_mileage
+
+from core.config import settings
+from core.database import WriteQueueFullError, db_handler
+from core.models.mileage_event import MileageEvent
+from core.models.vehicle import Vehicle
+
+MILEAGE_EVENTS_API_URL: str = "/api/v1/mileage_events"
+
+
+async def test_create_mileage_event_raises_vehicle_mileage(
+    random_vehicle_from_list: Vehicle,
+    vehicles_add_to_db,
+    async_conn: AsyncClient,
+):
+    new_mileage = random_vehicle_from_list.vehicle_mileage + 1000
+    response = await async_conn.post(
+        f"{MILEAGE_EVENTS_API_URL}/",
+        json={
+            "vehicle_id": random_vehicle_from_list.id,
+            "mileage_date": str(datetime.date.today()),
+            "mileage": new_mileage,
+        },
+    )
+    assert response.status_code == 201
+    assert response.headers["x-db-statements"] == "2"
+    async for db_session in db_handler.get_db():
+        async with db_session as session:
+            event = await session.get(MileageEvent, response.json()["id"])
+            vehicle = await session.get(
+                Vehicle, random_vehicle_from_list.id
+            )
+    assert event.mileage == new_mileage
+    assert vehicle.vehicle_mileage == new_mileage
+
+
+async def test_create_mileage_event_keeps_higher_vehicle_mileage(
+    random_vehicle_from_list: Vehicle,
+    vehicles_add_to_db,
+    async_conn: AsyncClient,
+):
+    response = await async_conn.post(
+        f"{MILEAGE_EVENTS_API_URL}/",
+        json={
+            "vehicle_id": random_vehicle_from_list.id,
+            "mileage_date": str(datetime.date.today()),
+            "mileage": random_vehicle_from_list.vehicle_mileage - 1,
+        },
+    )
+    assert response.status_code == 201
+    async for db_session in db_handler.get_db():
+        async with db_session as session:
+            vehicle = await session.get(
+                Vehicle, random_vehicle_from_list.id
+            )
+    assert vehicle.vehicle_mileage == random_vehicle_from_list.vehicle_mileage
+
+
+async def test_create_mileage_event_returns_503_when_writer_is_busy(
+    random_vehicle_from_list: Vehicle,
+    vehicles_add_to_db,
+    async_conn: AsyncClient,
+    monkeypatch,
+):
+    async def full_queue(unit) -> None:
+        raise WriteQueueFullError("Database writer queue is full.")
+
+    monkeypatch.setattr(db_handler.writer, "_enqueue", full_queue)
+    response = await async_conn.post(
+        f"{MILEAGE_EVENTS_API_URL}/",
+        json={
+            "vehicle_id": random_vehicle_from_list.id,
+            "mileage_date": str(datetime.date.today()),
+            "mileage": 1,
+        },
+    )
+    assert response.status_code == 503
+
+
+async def test_create_mileage_events_batch(
+    vehicle_test_models_list: list[Vehicle],
+    vehicles_add_to_db,
+    async_conn: AsyncClient,
+):
+    vehicle = vehicle_test_models_list[0]
+    today = str(datetime.date.today())
+    items = [
+        {
+            "vehicle_id": vehicle.id,
+            "mileage_date": today,
+            "mileage": vehicle.vehicle_mileage + 500,
+        },
+        {"vehicle_id": vehicle.id, "mileage_date": today},
+        {
+            "vehicle_id": 10_000,
+            "mileage_date": today,
+            "mileage": 1,
+        },
+        {
+            "vehicle_id": vehicle.id,
+            "mileage_date": today,
+            "mileage": vehicle.vehicle_mileage + 1000,
+        },
+    ]
+    response = await async_conn.post(
+        f"{MILEAGE_EVENTS_API_URL}/batch", json=items
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["created"], result["failed"]) == (2, 2)
+    assert [item["index"] for item in result["results"]] == [0, 1, 2, 3]
+    assert result["results"][1]["error"].startswith("mileage")
+    assert result["results"][2]["error"] == "Vehicle not found."
+    async for db_session in db_handler.get_db():
+        async with db_session as session:
+            saved = await session.get(Vehicle, vehicle.id)
+            event = await session.get(
+                MileageEvent, result["results"][3]["id"]
+            )
+    assert saved.vehicle_mileage == vehicle.vehicle_mileage + 1000
+    assert event.mileage == vehicle.vehicle_mileage + 1000
+
+
+async def test_raise_vehicles_mileage_only_raises(
+    random_vehicle_from_list: Vehicle, vehicles_add_to_db
+):
+    vehicle = random_vehicle_from_list
+    async for db_session in db_handler.get_db():
+        async with db_session as session:
+            for mileage in (vehicle.vehicle_mileage - 1, 10**7):
+                await raise_vehicles_mileage(
+                    session=session,
+                    mileage_by_vehicle={vehicle.id: mileage},
+                )
+                await session.commit()
+                saved_mileage, saved_date = (
+                    await session.execute(
+                        select(
+                            Vehicle.vehicle_mileage,
+                            Vehicle.vehicle_last_update_date,
+                        ).where(Vehicle.id == vehicle.id)
+                    )
+                ).one()
+                if mileage < vehicle.vehicle_mileage:
+                    assert saved_mileage == vehicle.vehicle_mileage
+                    assert saved_date == vehicle.vehicle_last_update_date
+                else:
+                    assert saved_mileage == mileage
+
+
+async def test_create_mileage_events_batch_ndjson(
+    random_vehicle_from_list: Vehicle,
+    vehicles_add_to_db,
+    async_conn: AsyncClient,
+):
+    lines = [
+        json.dumps(
+            {
+                "vehicle_id": random_vehicle_from_list.id,
+                "mileage_date": str(datetime.date.today()),
+                "mileage": mileage,
+            }
+        )
+        for mileage in (1, 2, 3)
+    ]
+    response = await async_conn.post(
+        f"{MILEAGE_EVENTS_API_URL}/batch",
+        content="\n".join(lines),
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    assert response.json()["created"] == 3
+    async for db_session in db_handler.get_db():
+        async with db_session as session:
+            vehicle = await session.get(
+                Vehicle, random_vehicle_from_list.id
+            )
+    assert vehicle.vehicle_mileage == random_vehicle_from_list.vehicle_mileage
+
+
+async def test_create_mileage_events_batch_ndjson_bad_line(
+    random_vehicle_from_list: Vehicle,
+    vehicles_add_to_db,
+    async_conn: AsyncClient,
+):
+    line = json.dumps(
+        {
+            "vehicle_id": random_vehicle_from_list.id,
+            "mileage_date": str(datetime.date.today()),
+            "mileage": 1,
+        }
+    )
+    response = await async_conn.post(
+        f"{MILEAGE_EVENTS_API_URL}/batch",
+        content="\n".join([line, "", "{not json", line]),
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["created"], result["failed"]) == (2, 1)
+    assert result["results"][1]["error"].startswith("line 3: ")
+
+
+async def test_create_mileage_events_batch_rejects_large_body(
+    monkeypatch, async_conn: AsyncClient
+):
+    monkeypatch.setattr(settings.ingest, "mileage_batch_max_bytes", 10)
+    response = await async_conn.post(
+        f"{MILEAGE_EVENTS_API_URL}/batch", json=[{"vehicle_id": 1}]
+    )
+    assert response.status_code == 413
+
+
+async def test_create_mileage_events_batch_rejects_bad_body(
+    async_conn: AsyncClient,
+):
+    response = await async_conn.post(
+        f"{MILEAGE_EVENTS_API_URL}/batch",
+        content="{not json",
+        headers={"content-type": "application/json"},
+    )
+    assert response.status_code == 400
+    response = await async_conn.post(
+        f"{MILEAGE_EVENTS_API_URL}/batch", json={"vehicle_id": 1}
+    )
+    assert response.status_code == 400
@@ -0,0 +1,128 @@
+import datetime
+import math
+
+from httpx import AsyncClient
+
+from api_v1.mileage_events.forecast import (
+    MileageFit,
+    MileageForecaster,
+    fit_readings,
+)
+from core.cache import TTLCache
+from core.database import db_handler
+from core.models.vehicle import Vehicle
+from core.models.works import Work
+
+VEHICLE_API_URL: str = "/api/v1/vehicle"
+MILEAGE_EVENTS_API_URL: str = "/api/v1/mileage_events"
+
+START = datetime.date(2024, 1, 1)
+
+
+def test_fit_readings_ignores_outlier():
+    ordinal = START.toordinal()
+    readings = [(ordinal + day, 1000 + 40 * day) for day in range(20)]
+    readings.insert(10, (ordinal + 9, 90000))
+    fit = fit_readings(tuple(readings))
+    assert fit.daily_rate == 40
+    assert fit.predict(START + datetime.timedelta(days=30)) == 2200
+
+
+def test_fit_readings_needs_two_days():
+    ordinal = START.toordinal()
+    fit = fit_readings(((ordinal, 100), (ordinal, 200)))
+    assert fit.daily_rate is None
+    assert fit.predict(START) is None
+
+
+def test_add_reading_refits_window_only():
+    forecaster = MileageForecaster(window_size=3, cache=TTLCache(10, 60))
+    ordinal = START.toordinal()
+    forecaster._fits.set(
+        1, MileageFit(readings=((ordinal, 0), (ordinal + 1, 10)))
+    )
+    for day, mileage in ((3, 100), (2, 90), (4, 110)):
+        forecaster.add_reading(
+            1, START + datetime.timedelta(days=day), mileage
+        )
+    forecaster.add_reading(2, START, 5)
+    fit = forecaster._fits.get(1)
+    assert [mileage for _, mileage in fit.readings] == [90, 100, 110]
+    assert fit.daily_rate == 10
+    assert forecaster._fits.get(2) is None
+
+
+async def post_reading(
+    async_conn: AsyncClient, vehicle_id: int, day: int, mileage: int
+) -> None:
+    response = await async_conn.post(
+        f"{MILEAGE_EVENTS_API_URL}/",
+        json={
+            "vehicle_id": vehicle_id,
+            "mileage_date": str(START + datetime.timedelta(days=day)),
+            "mileage": mileage,
+        },
+    )
+    assert response.status_code == 201
+
+
+async def test_get_mileage_forecast(
+    random_vehicle_from_list: Vehicle,
+    vehicles_add_to_db,
+    async_conn: AsyncClient,
+):
+    vehicle_id = random_vehicle_from_list.id
+    base = random_vehicle_from_list.vehicle_mileage
+    for day in range(5):
+        await post_reading(async_conn, vehicle_id, day, base + 50 * day)
+    forecast_url = f"{VEHICLE_API_URL}/{vehicle_id}/mileage_forecast"
+    date = str(START + datetime.timedelta(days=10))
+
+    response = await async_conn.get(forecast_url, params={"date": date})
+    assert response.status_code == 200
+    assert response.json() == {
+        "vehicle_id": vehicle_id,
+        "date": date,
+        "readings": 5,
+        "daily_rate": 50.0,
+        "mileage": base + 500,
+    }
+
+    await post_reading(async_conn, vehicle_id, 5, base + 250)
+    response = await async_conn.get(forecast_url, params={"date": date})
+    assert response.headers["x-db-statements"] == "0"
+    assert response.json()["readings"] == 6
+
+    async for db_session in db_handler.get_db():
+        async with db_session as session:
+            session.add(
+                Work(vehicle_id=vehicle_id, title="Oil", interval_km=10000)
+            )
+            await session.commit()
+    response = await async_conn.get(f"{VEHICLE_API_URL}/{vehicle_id}/due")
+    work_due = response.json()["works"][0]
+    assert work_due["due_mileage_date"] == str(
+        datetime.date.today()
+        + datetime.timedelta(days=math.ceil(work_due["remaining_km"] / 50))
+    )
+
+
+async def test_get_mileage_forecast_without_readings(
+    random_vehicle_from_list: Vehicle,
+    vehicles_add_to_db,
+    async_conn: AsyncClient,
+):
+    response = await async_conn.get(
+        f"{VEHICLE_API_URL}/{random_vehicle_from_list.id}/mileage_forecast"
+    )
+    assert response.status_code == 200
+    assert response.json()["mileage"] is None
+
+
+async def test_get_non_existent_vehicle_mileage_forecast(
+    async_conn: AsyncClient,
+):
+    response = await async_conn.get(
+        f"{VEHICLE_API_URL}/10000/mileage_forecast"
+    )
+    assert response.status_code == 404
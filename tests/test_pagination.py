@@ -0,0 +1,123 @@
+import datetime
+import json
+import random
+
+from httpx import AsyncClient
+
+from core.database import db_handler
+from core.models.mileage_event import MileageEvent
+from core.models.vehicle import Vehicle
+from core.pagination import decode_cursor, encode_cursor
+from core.schemas.vehicles import VehicleCreate
+
+from .conftest import fake
+
+VEHICLES_API_URL: str = "/api/v1/vehicle"
+MILEAGE_EVENTS_API_URL: str = "/api/v1/mileage_events"
+
+
+async def create_vehicles(async_conn: AsyncClient, years: list[int]) -> list:
+    vehicles_data = [
+        json.loads(
+            VehicleCreate(
+                vin_code=fake.vin(),
+                vehicle_manufacturer="Lada" if year % 2 else "Volvo",
+                vehicle_model=fake.random_letter(),
+                vehicle_body="",
+                vehicle_year=year,
+                vehicle_mileage=random.randint(1000, 100000),
+                vehicle_last_update_date=fake.date_object(),
+            ).model_dump_json()
+        )
+        for year in years
+    ]
+    response = await async_conn.post(
+        f"{VEHICLES_API_URL}/bulk", json=vehicles_data
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+async def collect_pages(async_conn: AsyncClient, url: str, **params) -> list:
+    pages: list[list] = []
+    cursor = None
+    while True:
+        if cursor is not None:
+            params["cursor"] = cursor
+        response = await async_conn.get(url, params=params)
+        assert response.status_code == 200
+        pages.append(response.json()["items"])
+        cursor = response.json()["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip():
+    values = ["2024-01-31", 42]
+    assert decode_cursor(encode_cursor(values)) == values
+
+
+async def test_vehicles_pages_cover_all_rows_once(async_conn: AsyncClient):
+    created = await create_vehicles(async_conn, list(range(2001, 2006)))
+    pages = await collect_pages(async_conn, f"{VEHICLES_API_URL}/", limit=2)
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [vehicle["id"] for page in pages for vehicle in page] == sorted(
+        vehicle["id"] for vehicle in created
+    )
+
+
+async def test_vehicles_filters(async_conn: AsyncClient):
+    await create_vehicles(async_conn, list(range(2001, 2006)))
+    response = await async_conn.get(
+        f"{VEHICLES_API_URL}/",
+        params={
+            "year_from": 2002,
+            "year_to": 2004,
+            "vehicle_manufacturer": "Volvo",
+        },
+    )
+    assert response.status_code == 200
+    assert [
+        vehicle["vehicle_year"] for vehicle in response.json()["items"]
+    ] == [2002, 2004]
+
+
+async def test_incorrect_cursor(async_conn: AsyncClient):
+    for cursor in ("not-a-cursor", encode_cursor(["x", "y"])):
+        response = await async_conn.get(
+            f"{VEHICLES_API_URL}/", params={"cursor": cursor}
+        )
+        assert response.status_code == 400
+
+
+async def test_mileage_events_pages_by_date(
+    random_vehicle_from_list: Vehicle,
+    vehicles_add_to_db,
+    async_conn: AsyncClient,
+):
+    dates = [datetime.date(2024, 1, day) for day in (1, 2, 2, 2, 3, 4)]
+    async for db_session in db_handler.get_db():
+        async with db_session as session:
+            session.add_all(
+                MileageEvent(
+                    vehicle_id=random_vehicle_from_list.id,
+                    mileage_date=mileage_date,
+                    mileage=index * 1000,
+                )
+                for index, mileage_date in enumerate(dates)
+            )
+            await session.commit()
+    pages = await collect_pages(
+        async_conn,
+        f"{MILEAGE_EVENTS_API_URL}/{random_vehicle_from_list.id}/",
+        limit=2,
+        date_from="2024-01-02",
+    )
+    events = [event for page in pages for event in page]
+    assert [(event["mileage_date"], event["id"]) for event in events] == [
+        ("2024-01-04", 6),
+        ("2024-01-03", 5),
+        ("2024-01-02", 4),
+        ("2024-01-02", 3),
+        ("2024-01-02", 2),
+    ]
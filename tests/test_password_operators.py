@@ -0,0 +1,28 @@
+import asyncio
+
+from auth.password_operators import (
+    PasswordHashingBusyError,
+    PasswordHashingService,
+)
+
+
+async def test_password_service_hash_and_verify():
+    service = PasswordHashingService(
+        workers=2, max_concurrency=2, queue_timeout=1
+    )
+    password_hash = await service.hash("secret")
+    assert await service.verify(password="secret", hash=password_hash)
+    assert not await service.verify(password="wrong", hash=password_hash)
+    service.shutdown()
+
+
+async def test_password_service_busy_after_queue_timeout():
+    service = PasswordHashingService(
+        workers=1, max_concurrency=1, queue_timeout=0.001
+    )
+    results = await asyncio.gather(
+        *(service.hash("secret") for _ in range(3)), return_exceptions=True
+    )
+    assert any(isinstance(r, PasswordHashingBusyError) for r in results)
+    assert any(isinstance(r, str) for r in results)
+    service.shutdown()
@@ -0,0 +1,228 @@
+"""EXPLAIN QUERY PLAN checks for crud queries.
+
+Every statement a case executes is explained afterwards and the case
+fails if SQLite plans a full scan of a model table. Unfiltered listings
+(all users, all vehicles, the whole fleet) scan by design and are not
+listed here.
+"""
+
+import datetime
+from typing import Awaitable, Callable
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api_v1.export import crud as export_crud
+from api_v1.maintenance.crud import (
+    fleet_due_statement,
+    get_vehicle_works_with_last_event,
+)
+from api_v1.mileage_events import crud as mileage_events_crud
+from api_v1.users.crud import get_user, get_user_by_username
+from api_v1.vehicles.crud import (
+    get_user_vehicles,
+    get_vehicle_by_id,
+    get_vehicle_by_vin,
+)
+from api_v1.work_events import crud as work_events_crud
+from api_v1.works.crud import get_work_by_id, get_works_by_vehicle_id
+from api_v1.works.last_event import refresh_last_event
+from core.database import db_handler
+from core.models import BaseDbModel, MileageEvent, Vehicle, Work, WorkEvent
+from core.models.works import WorkType
+from core.pagination import PageParams
+from core.schemas.mileage_events import (
+    MileageEventCreate,
+    MileageEventFilter,
+)
+from core.schemas.work_events import (
+    WorkEventCreate,
+    WorkEventFilter,
+    WorkEventUpdate,
+)
+
+DATE = datetime.date(2024, 1, 1)
+CURSOR_PAGE = PageParams(limit=10, after=["2024-01-01", 1])
+
+Case = Callable[[AsyncSession], Awaitable[object]]
+
+
+async def get_work_event(session: AsyncSession) -> WorkEvent:
+    return await work_events_crud.get_event_by_id(1, session)
+
+
+async def stream_export(session: AsyncSession) -> None:
+    for statement in (
+        export_crud.vehicles_statement(owner_id=1),
+        export_crud.works_statement(owner_id=1),
+        export_crud.work_events_statement(owner_id=1),
+        export_crud.mileage_events_statement(owner_id=1),
+    ):
+        await session.execute(statement)
+
+
+CASES: dict[str, Case] = {
+    "get_user": lambda session: get_user(session, 1),
+    "get_user_by_username": lambda session: get_user_by_username(
+        session, "user"
+    ),
+    "get_vehicle_by_id": lambda session: get_vehicle_by_id(1, session),
+    "get_vehicle_by_vin": lambda session: get_vehicle_by_vin(
+        session, "1HGCM82633A004352"
+    ),
+    "get_user_vehicles": lambda session: get_user_vehicles(1, session),
+    "get_works_by_vehicle_id": lambda session: get_works_by_vehicle_id(
+        session, 1, work_type=WorkType.MAINTENANCE
+    ),
+    "get_work_by_id": lambda session: get_work_by_id(1, session),
+    "get_interval_stats": lambda session: (
+        work_events_crud.get_interval_stats(session, Work.vehicle_id == 1)
+    ),
+    "get_work_events_page": lambda session: (
+        work_events_crud.get_work_events_page(
+            1,
+            session,
+            PageParams(limit=10, after=[100, 1]),
+            WorkEventFilter(date_from=DATE),
+        )
+    ),
+    "create_work_event": lambda session: work_events_crud.create_work_event(
+        session,
+        WorkEventCreate(
+            work_date=DATE,
+            mileage=100,
+            work_id=1,
+            part_price=0,
+            work_price=0,
+            note="",
+        ),
+    ),
+    "update_work_event": lambda session: get_work_event(session),
+    "refresh_last_event": lambda session: refresh_last_event(
+        session, work_ids=[1]
+    ),
+    "get_vehicle_mileage_events": lambda session: (
+        mileage_events_crud.get_vehicle_mileage_events(
+            1, session, CURSOR_PAGE, MileageEventFilter(date_to=DATE)
+        )
+    ),
+    "get_latest_mileage_readings": lambda session: (
+        mileage_events_crud.get_latest_mileage_readings(session, 1, 30)
+    ),
+    "create_mileage_event": lambda session: (
+        mileage_events_crud.create_mileage_event(
+            session,
+            MileageEventCreate(vehicle_id=1, mileage_date=DATE, mileage=1),
+        )
+    ),
+    "create_mileage_events_batch": lambda session: (
+        mileage_events_crud.create_mileage_events_batch(
+            session,
+            [
+                MileageEventCreate(vehicle_id=1, mileage_date=DATE, mileage=2),
+                MileageEventCreate(vehicle_id=9, mileage_date=DATE, mileage=3),
+            ],
+        )
+    ),
+    "get_vehicle_works_with_last_event": lambda session: (
+        get_vehicle_works_with_last_event(session, 1)
+    ),
+    "fleet_due_statement": lambda session: session.execute(
+        fleet_due_statement(owner_id=1)
+    ),
+    "export_statements": stream_export,
+}
+
+# The sort of these pages should come from an index, not a temp B-tree.
+INDEX_ORDERED_CASES = {
+    "get_user_vehicles",
+    "get_works_by_vehicle_id",
+    "get_work_events_page",
+    "get_vehicle_mileage_events",
+    "get_latest_mileage_readings",
+}
+
+
+async def add_rows() -> None:
+    async with db_handler.session_factory() as session:
+        session.add(
+            Vehicle(
+                id=1,
+                owner_id=1,
+                vin_code="1HGCM82633A004352",
+                vehicle_manufacturer="",
+                vehicle_model="",
+                vehicle_body="",
+                vehicle_year=2020,
+                vehicle_mileage=0,
+                vehicle_last_update_date=DATE,
+            )
+        )
+        session.add(Work(id=1, vehicle_id=1, title=""))
+        session.add(
+            WorkEvent(
+                id=1,
+                work_id=1,
+                work_date=DATE,
+                mileage=0,
+                part_price=0,
+                work_price=0,
+                note="",
+            )
+        )
+        session.add(MileageEvent(vehicle_id=1, mileage_date=DATE, mileage=0))
+        await session.commit()
+
+
+def plan_problems(
+    plan: list[tuple], case_name: str, statement: str
+) -> list[str]:
+    problems = []
+    for *_, detail in plan:
+        words = detail.split()
+        if words[0] == "SCAN" and words[1] in BaseDbModel.metadata.tables:
+            problems.append(f"{detail}: {statement}")
+        if case_name in INDEX_ORDERED_CASES and detail.startswith(
+            "USE TEMP B-TREE FOR ORDER BY"
+        ):
+            problems.append(f"{detail}: {statement}")
+    return problems
+
+
+@pytest.mark.parametrize("case_name", sorted(CASES))
+async def test_crud_query_plan_uses_indexes(case_name: str):
+    await add_rows()
+    executed: list[tuple[str, object]] = []
+
+    def collect(conn, cursor, statement, parameters, context, executemany):
+        if executemany:
+            parameters = parameters[0]
+        executed.append((statement, parameters))
+
+    sync_engine = db_handler.engine.sync_engine
+    async with db_handler.session_factory() as session:
+        event.listen(sync_engine, "before_cursor_execute", collect)
+        try:
+            result = await CASES[case_name](session)
+            if case_name == "update_work_event":
+                await work_events_crud.update_work_event(
+                    session, result, WorkEventUpdate(mileage=5)
+                )
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", collect)
+        await session.rollback()
+
+        problems = []
+        connection = await session.connection()
+        for statement, parameters in executed:
+            if not statement.lstrip().startswith(
+                ("SELECT", "UPDATE", "DELETE", "WITH")
+            ):
+                continue
+            result = await connection.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement}", parameters
+            )
+            problems += plan_problems(result.all(), case_name, statement)
+    assert executed
+    assert not problems, "\n".join(problems)
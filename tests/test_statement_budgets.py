@@ -0,0 +1,127 @@
+import datetime
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient, Response
+from sqlalchemy import func, select
+
+from core.database import db_handler
+from core.middleware import DBStatsMiddleware
+from core.models.works import Work
+
+from .conftest import fake
+
+API_URL: str = "/api/v1"
+
+# Endpoint -> most statements it may run. Paths are formatted with the
+# work and vehicle ids of random_work_model. Paginated lists may add a
+# count query.
+STATEMENT_BUDGETS: dict[tuple[str, str], int] = {
+    ("GET", "/vehicle/"): 2,
+    ("GET", "/vehicle/{vehicle_id}/"): 1,
+    ("GET", "/vehicle/{vehicle_id}/due"): 2,
+    ("GET", "/vehicle/{vehicle_id}/mileage_forecast"): 2,
+    ("GET", "/fleet/due"): 1,
+    ("GET", "/works/{work_id}/"): 1,
+    ("GET", "/works/vehicle_id/{vehicle_id}/"): 2,
+    ("GET", "/work_events/by_work_id/{work_id}/"): 2,
+    ("GET", "/work_events/interval_stats/by_vehicle/{vehicle_id}/"): 1,
+    ("POST", "/mileage_events/"): 2,
+    ("POST", "/work_events/"): 3,
+    ("POST", "/vehicle/bulk"): 2,
+}
+
+
+def assert_statement_budget(response: Response, budget: int) -> None:
+    statements = int(response.headers["x-db-statements"])
+    assert statements <= budget, (
+        f"{response.request.method} {response.request.url.path} ran "
+        f"{statements} statements, budget is {budget}"
+    )
+    assert response.headers["x-db-repeated-statements"] == "0"
+
+
+def request_body(method: str, path: str, work: Work) -> object:
+    if path == "/mileage_events/":
+        return {
+            "vehicle_id": work.vehicle_id,
+            "mileage_date": str(datetime.date.today()),
+            "mileage": 999999,
+        }
+    if path == "/work_events/":
+        return {
+            "work_date": str(datetime.date.today()),
+            "mileage": 999999,
+            "work_id": work.id,
+            "part_price": 0,
+            "work_price": 0,
+            "note": "",
+        }
+    if path == "/vehicle/bulk":
+        return [
+            {
+                "vin_code": fake.vin(),
+                "vehicle_manufacturer": fake.company(),
+                "vehicle_model": fake.last_name(),
+                "vehicle_body": "",
+                "vehicle_year": 2015,
+                "vehicle_mileage": 1000,
+                "vehicle_last_update_date": "2024-01-01",
+            }
+            for _ in range(20)
+        ]
+    return None
+
+
+@pytest.mark.parametrize("method, path", list(STATEMENT_BUDGETS))
+async def test_statement_budget(
+    method: str,
+    path: str,
+    random_work_model: Work,
+    works_add_to_db,
+    async_conn: AsyncClient,
+):
+    response = await async_conn.request(
+        method,
+        API_URL
+        + path.format(
+            work_id=random_work_model.id,
+            vehicle_id=random_work_model.vehicle_id,
+        ),
+        json=request_body(method, path, random_work_model),
+    )
+    assert response.status_code < 300
+    assert_statement_budget(response, STATEMENT_BUDGETS[method, path])
+
+
+async def test_request_db_timing_headers(
+    random_work_model: Work, works_add_to_db, async_conn: AsyncClient
+):
+    response = await async_conn.get(
+        f"{API_URL}/works/vehicle_id/{random_work_model.vehicle_id}/"
+    )
+    assert int(response.headers["x-db-rows"]) >= 1
+    timings = dict(
+        metric.split(";dur=")
+        for metric in response.headers["server-timing"].split(", ")
+    )
+    assert 0 < float(timings["db"]) <= float(timings["total"])
+
+
+async def test_repeated_statements_are_flagged():
+    app = FastAPI()
+    app.add_middleware(DBStatsMiddleware, n_plus_one_threshold=3)
+
+    @app.get("/n_plus_one")
+    async def n_plus_one():
+        async with db_handler.read_session_factory() as session:
+            for work_id in range(3):
+                await session.scalar(select(Work).where(Work.id == work_id))
+            await session.scalar(select(func.count()).select_from(Work))
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://localhost"
+    ) as client:
+        response = await client.get("/n_plus_one")
+    assert response.headers["x-db-statements"] == "4"
+    assert response.headers["x-db-repeated-statements"] == "1"
@@ -80,7 +80,10 @@ async def test_get_users(
         key=lambda x: x.id,
     )
     response_schemas_list = sorted(
-        [UserSchema(**user_schema) for user_schema in response.json()],
+        [
+            UserSchema(**user_schema)
+            for user_schema in response.json()["items"]
+        ],
         key=lambda x: x.id,
     )
     assert response_schemas_list == response_reference_list
@@ -89,7 +92,7 @@ async def test_get_users(
 async def test_get_blank_users_list(async_conn: AsyncClient):
     response = await async_conn.get(f"{USERS_API_URL}/")
     assert response.status_code == 200
-    assert response.json() == []
+    assert response.json() == {"items": [], "next_cursor": None}
 
 
 async def test_get_user_by_username(
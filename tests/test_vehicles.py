@@ -5,10 +5,13 @@ import random
 import pytest
 from httpx import AsyncClient
 from pydantic import field_serializer
+from sqlalchemy import func, select
 
+from api_v1.workpatterns.catalog import work_pattern_catalog
 from core.database import db_handler
 from core.models.user import User
 from core.models.vehicle import Vehicle
+from core.models.works import Work
 from core.schemas.vehicles import VehicleCreate, VehicleSchema, VehicleUpdate
 
 from .conftest import fake
@@ -57,6 +60,26 @@ async def test_create_vehicle(vehicle_create_dict, async_conn: AsyncClient):
     )
 
 
+async def test_create_vehicle_autofill_from_vin(
+    vehicle_create_dict, async_conn: AsyncClient
+):
+    del vehicle_create_dict["vehicle_manufacturer"]
+    del vehicle_create_dict["vehicle_year"]
+    vehicle_create_dict["vin_code"] = "1HGCM82633A004352"
+    response = await async_conn.post(
+        f"{VEHICLES_API_URL}/", json=vehicle_create_dict
+    )
+    assert response.status_code == 201
+    assert response.json()["vehicle_manufacturer"] == "Honda"
+    assert response.json()["vehicle_year"] == 2003
+
+    vehicle_create_dict["vin_code"] = "9ZZ11111411111111"
+    response = await async_conn.post(
+        f"{VEHICLES_API_URL}/", json=vehicle_create_dict
+    )
+    assert response.status_code == 422
+
+
 async def test_create_duplicated_vehicle(
     random_vehicle_from_list: Vehicle,
     vehicles_add_to_db,
@@ -95,7 +118,7 @@ async def test_get_all_vehicles(
     response_schemas_list = sorted(
         [
             VehicleSchema(**vehicle_schema)
-            for vehicle_schema in response.json()
+            for vehicle_schema in response.json()["items"]
         ],
         key=lambda x: x.id,
     )
@@ -105,7 +128,7 @@ async def test_get_all_vehicles(
 async def test_get_all_non_existent_vehicles(async_conn: AsyncClient):
     response = await async_conn.get(f"{VEHICLES_API_URL}/")
     assert response.status_code == 200
-    assert response.json() == []
+    assert response.json() == {"items": [], "next_cursor": None}
 
 
 async def test_get_vehicle_by_id(
@@ -149,7 +172,7 @@ async def test_get_non_existent_user_vehicles(
         f"{VEHICLES_API_URL}/by_user_id/{random_user_from_list.id}/"
     )
     assert response.status_code == 200
-    assert response.json() == []
+    assert response.json() == {"items": [], "next_cursor": None}
 
 
 async def test_update_vehicle_partial(
@@ -239,3 +262,66 @@ async def test_get_vehicle_by_vin(
 async def test_get_unexistent_vin_vehicle(async_conn: AsyncClient):
     response = await async_conn.get(f"{VEHICLES_API_URL}/by_vin/{fake.vin()}/")
     assert response.status_code == 404
+
+
+async def test_create_vehicle_in_one_transaction(
+    vehicle_create_dict, async_conn: AsyncClient
+):
+    response = await async_conn.post(
+        f"{VEHICLES_API_URL}/", json=vehicle_create_dict
+    )
+    assert response.status_code == 201
+    assert response.headers["x-db-connections"] == "1"
+    assert response.headers["x-db-transactions"] == "1"
+    async for db_session in db_handler.get_db():
+        async with db_session as session:
+            works_count = await session.scalar(
+                select(func.count())
+                .select_from(Work)
+                .where(Work.vehicle_id == response.json()["id"])
+            )
+    assert works_count == len(work_pattern_catalog)
+
+
+async def test_create_vehicles_bulk(async_conn: AsyncClient):
+    vehicles_data = [
+        json.loads(
+            VehicleCreate(
+                vin_code=fake.vin(),
+                vehicle_manufacturer=fake.name(),
+                vehicle_model=fake.random_letter(),
+                vehicle_body="",
+                vehicle_year=random.randint(2000, 2023),
+                vehicle_mileage=random.randint(1000, 100000),
+                vehicle_last_update_date=fake.date_object(),
+            ).model_dump_json()
+        )
+        for _ in range(5)
+    ]
+    response = await async_conn.post(
+        f"{VEHICLES_API_URL}/bulk", json=vehicles_data
+    )
+    assert response.status_code == 201
+    assert response.headers["x-db-transactions"] == "1"
+    created = response.json()
+    assert [vehicle["vin_code"] for vehicle in created] == [
+        vehicle["vin_code"].upper() for vehicle in vehicles_data
+    ]
+    async for db_session in db_handler.get_db():
+        async with db_session as session:
+            works_count = await session.scalar(
+                select(func.count()).select_from(Work)
+            )
+    assert works_count == len(created) * len(work_pattern_catalog)
+
+
+async def test_create_vehicles_bulk_duplicated_vin(
+    vehicle_create_dict, async_conn: AsyncClient
+):
+    response = await async_conn.post(
+        f"{VEHICLES_API_URL}/bulk",
+        json=[vehicle_create_dict, vehicle_create_dict],
+    )
+    assert response.status_code == 400
+    response = await async_conn.get(f"{VEHICLES_API_URL}/")
+    assert response.json()["items"] == []
@@ -0,0 +1,154 @@
+import datetime
+import random
+
+import pytest
+from httpx import AsyncClient
+
+from api_v1.vehicles.vin_batch import vin_errors_numpy
+from core.vin import (
+    VIN_CHARACTERS_ERROR,
+    VIN_CHECKSUM_ERROR,
+    VIN_LENGTH_ERROR,
+    translitering_vin_character_to_number,
+    vin_checksum_calc,
+    vin_code_validator,
+    vin_error,
+)
+from core.vin_decoder import (
+    WMI_INDEX_PATH,
+    WMI_LENGTH,
+    WMI_RECORD_SIZE,
+    decode_model_year,
+    vin_decoder,
+)
+
+from .conftest import fake
+
+VIN_VALIDATE_API_URL: str = "/api/v1/vehicle/vin/validate"
+VIN_API_URL: str = "/api/v1/vehicle/vin"
+
+
+@pytest.mark.parametrize(
+    "vin_code, error",
+    [
+        ("1HGCM82633A004352", None),
+        ("1hgcm82633a004352", None),
+        ("11111111111111111", None),
+        ("1HGCM82643A004352", VIN_CHECKSUM_ERROR),
+        ("1HGCM82633A00435", VIN_LENGTH_ERROR),
+        ("1HGCM82633A0043521", VIN_LENGTH_ERROR),
+        ("1HGCM82633A00435I", VIN_CHARACTERS_ERROR),
+        ("1HGCM82633A00435é", VIN_CHARACTERS_ERROR),
+        ("1HGCM82633A00435-", VIN_CHARACTERS_ERROR),
+    ],
+)
+def test_vin_error(vin_code: str, error: str | None):
+    assert vin_error(vin_code) == error
+    assert vin_errors_numpy([vin_code]) == [error]
+    if error is None:
+        assert vin_code_validator(vin_code) == vin_code
+    else:
+        with pytest.raises(AssertionError, match=error):
+            vin_code_validator(vin_code)
+
+
+def test_vin_transliteration():
+    assert [
+        translitering_vin_character_to_number(char) for char in "0A9zIé"
+    ] == [0, 1, 9, 9, 0, 0]
+    assert vin_checksum_calc("1M8GDM9AXKP042788") == "X"
+
+
+def test_vin_errors_numpy_matches_vin_error():
+    characters = "0123456789ABCDEFGHJKLMNPRSTUVWXYZabxyIOQ-é"
+    vin_codes = [fake.vin() for _ in range(500)] + [
+        "".join(random.choices(characters, k=random.choice([16, 17, 18])))
+        for _ in range(500)
+    ]
+    for checksum_verification in (True, False):
+        assert vin_errors_numpy(vin_codes, checksum_verification) == [
+            vin_error(vin_code, checksum_verification)
+            for vin_code in vin_codes
+        ]
+
+
+async def test_validate_vin_codes(async_conn: AsyncClient):
+    vin_codes = [fake.vin() for _ in range(200)] + ["1HGCM82643A004352"]
+    response = await async_conn.post(VIN_VALIDATE_API_URL, json=vin_codes)
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["valid"], result["invalid"]) == (200, 1)
+    assert result["results"][-1] == {
+        "vin": "1HGCM82643A004352",
+        "valid": False,
+        "error": VIN_CHECKSUM_ERROR,
+    }
+
+    response = await async_conn.post(
+        VIN_VALIDATE_API_URL,
+        params={"checksum": False},
+        json=["1HGCM82643A004352"],
+    )
+    assert response.json()["valid"] == 1
+
+
+async def test_validate_vin_codes_empty_batch(async_conn: AsyncClient):
+    response = await async_conn.post(VIN_VALIDATE_API_URL, json=[])
+    assert response.status_code == 422
+
+
+def test_wmi_index_is_sorted_fixed_width():
+    data = WMI_INDEX_PATH.read_bytes()
+    assert len(data) % WMI_RECORD_SIZE == 0
+    records = [
+        data[offset : offset + WMI_RECORD_SIZE]
+        for offset in range(0, len(data), WMI_RECORD_SIZE)
+    ]
+    assert all(record.endswith(b"\n") for record in records)
+    keys = [record[:WMI_LENGTH] for record in records]
+    assert keys == sorted(set(keys))
+
+
+@pytest.mark.parametrize(
+    "vin_code, manufacturer, model_year",
+    [
+        ("1HGCM82633A004352", "Honda", 2003),
+        ("5YJ3E1EA7KF317000", "Tesla", 2019),
+        ("jt9zzz1z1z1111111", "Toyota", None),
+        ("9ZZ11111111111111", None, 2001),
+    ],
+)
+def test_vin_decoder(
+    vin_code: str, manufacturer: str | None, model_year: int | None
+):
+    decoded = vin_decoder.decode(vin_code)
+    assert decoded.wmi == vin_code[:3].upper()
+    assert (decoded.manufacturer, decoded.model_year) == (
+        manufacturer,
+        model_year,
+    )
+
+
+def test_decode_model_year_stays_in_the_past():
+    today = datetime.date(2024, 6, 1)
+    assert decode_model_year("1FAZZZAZZS1111111", today) == 2025
+    assert decode_model_year("1FAZZZAZZT1111111", today) == 1996
+
+
+async def test_decode_vin_code(async_conn: AsyncClient):
+    response = await async_conn.get(
+        f"{VIN_API_URL}/1hgcm82633a004352/decode"
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "vin": "1HGCM82633A004352",
+        "wmi": "1HG",
+        "region": "North America",
+        "manufacturer": "Honda",
+        "model_year": 2003,
+    }
+    response = await async_conn.get(
+        f"{VIN_API_URL}/1HGCM82643A004352/decode"
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == VIN_CHECKSUM_ERROR
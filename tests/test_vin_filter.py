@@ -0,0 +1,130 @@
+import asyncio
+
+from httpx import AsyncClient
+
+from api_v1.vehicles.vin_filter import vin_filter
+from core.bloom import CountingBloomFilter
+from core.config import settings
+from core.database import db_handler
+from core.lifespan import build_vin_filter
+from core.models.vehicle import Vehicle
+
+from .conftest import fake
+
+VEHICLES_API_URL: str = "/api/v1/vehicle"
+
+
+def test_counting_bloom_filter():
+    bloom_filter = CountingBloomFilter(capacity=10000, error_rate=0.01)
+    vin_codes = list({fake.vin() for _ in range(10000)})
+    for vin_code in vin_codes:
+        bloom_filter.add(vin_code)
+    assert len(bloom_filter) == len(vin_codes)
+    assert all(vin_code in bloom_filter for vin_code in vin_codes)
+
+    others = {fake.vin() for _ in range(20000)} - set(vin_codes)
+    false_positives = sum(vin_code in bloom_filter for vin_code in others)
+    assert false_positives / len(others) < 0.02
+    assert 0.005 < bloom_filter.estimated_false_positive_rate < 0.015
+
+    for vin_code in vin_codes[:5000]:
+        bloom_filter.remove(vin_code)
+    assert len(bloom_filter) == len(vin_codes) - 5000
+    assert all(vin_code in bloom_filter for vin_code in vin_codes[5000:])
+    assert sum(vin_code in bloom_filter for vin_code in vin_codes[:5000]) < 50
+
+
+async def test_unknown_vin_is_checked_in_db(
+    vehicles_add_to_db, async_conn: AsyncClient
+):
+    unknown_vin = next(
+        vin_code
+        for vin_code in iter(fake.vin, None)
+        if not vin_filter.might_contain(vin_code)
+    )
+    misses = vin_filter.get_stats()["misses"]
+    response = await async_conn.get(
+        f"{VEHICLES_API_URL}/by_vin/{unknown_vin}/"
+    )
+    assert response.status_code == 404
+    assert response.headers["x-db-statements"] == "1"
+    stats = vin_filter.get_stats()
+    assert stats["misses"] == misses + 1
+    assert stats["false_negatives"] == 0
+
+
+async def test_vin_missing_from_filter_is_found(
+    random_vehicle_from_list: Vehicle,
+    vehicles_add_to_db,
+    async_conn: AsyncClient,
+):
+    vin_code = random_vehicle_from_list.vin_code
+    vin_filter.remove(vin_code)
+    false_negatives = vin_filter.get_stats()["false_negatives"]
+    response = await async_conn.get(f"{VEHICLES_API_URL}/by_vin/{vin_code}/")
+    assert response.status_code == 200
+    assert vin_filter.get_stats()["false_negatives"] == false_negatives + 1
+    assert vin_filter.might_contain(vin_code)
+
+
+async def test_rebuild_keeps_vins_added_meanwhile(vehicles_add_to_db):
+    vin_code = fake.vin()
+    async with db_handler.read_session_factory() as session:
+        rebuild = asyncio.create_task(vin_filter.rebuild(session))
+        await asyncio.sleep(0)
+        vin_filter.add(vin_code)
+        await rebuild
+    assert vin_filter.might_contain(vin_code)
+
+
+async def test_vin_filter_follows_vehicle_changes(
+    random_vehicle_from_list: Vehicle,
+    vehicles_add_to_db,
+    async_conn: AsyncClient,
+):
+    url = f"{VEHICLES_API_URL}/by_vin"
+    old_vin = random_vehicle_from_list.vin_code
+    new_vin = fake.vin()
+    assert (await async_conn.get(f"{url}/{old_vin}/")).status_code == 200
+
+    response = await async_conn.patch(
+        f"{VEHICLES_API_URL}/{random_vehicle_from_list.id}/",
+        json={"vin_code": new_vin},
+    )
+    assert response.status_code == 200
+    assert (await async_conn.get(f"{url}/{new_vin}/")).status_code == 200
+    assert not vin_filter.might_contain(old_vin)
+
+    await async_conn.delete(
+        f"{VEHICLES_API_URL}/{random_vehicle_from_list.id}/"
+    )
+    response = await async_conn.get(f"{url}/{new_vin}/")
+    assert response.status_code == 404
+    assert not vin_filter.might_contain(new_vin)
+
+
+async def test_created_vehicle_is_found_by_vin(async_conn: AsyncClient):
+    vin_code = fake.vin()
+    response = await async_conn.post(
+        f"{VEHICLES_API_URL}/",
+        json={
+            "vin_code": vin_code,
+            "vehicle_manufacturer": fake.company(),
+            "vehicle_model": fake.last_name(),
+            "vehicle_body": "",
+            "vehicle_year": 2015,
+            "vehicle_mileage": 1000,
+            "vehicle_last_update_date": "2024-01-01",
+        },
+    )
+    assert response.status_code == 201
+    assert vin_filter.get_stats()["items"] == 1
+    response = await async_conn.get(f"{VEHICLES_API_URL}/by_vin/{vin_code}/")
+    assert response.status_code == 200
+
+
+async def test_vin_filter_off_with_several_workers(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings.metrics, "multiproc_dir", str(tmp_path))
+    await build_vin_filter()
+    assert vin_filter.get_stats()["capacity"] == 0
+    assert vin_filter.might_contain(fake.vin())
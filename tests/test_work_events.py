@@ -0,0 +1,215 @@
+import datetime
+import random
+
+import numpy as np
+from httpx import AsyncClient
+from sqlalchemy import update
+
+from api_v1.works.last_event import refresh_last_event
+
+from core.database import db_handler
+from core.models.vehicle import Vehicle
+from core.models.work_event import WorkEvent
+from core.models.works import Work
+
+WORK_EVENTS_API_URL: str = "/api/v1/work_events"
+
+
+async def test_create_work_event(
+    random_work_model: Work, works_add_to_db, async_conn: AsyncClient
+):
+    response = await async_conn.post(
+        f"{WORK_EVENTS_API_URL}/",
+        json={
+            "work_date": str(datetime.date.today()),
+            "mileage": 999999,
+            "work_id": random_work_model.id,
+            "part_price": 10.5,
+            "work_price": 20.0,
+            "note": "",
+        },
+    )
+    assert response.status_code == 201
+    assert response.headers["x-db-statements"] == "3"
+    async for db_session in db_handler.get_db():
+        async with db_session as session:
+            event = await session.get(WorkEvent, response.json()["id"])
+            vehicle = await session.get(Vehicle, random_work_model.vehicle_id)
+    assert event.work_id == random_work_model.id
+    assert vehicle.vehicle_mileage == 999999
+
+
+async def test_get_work_events_by_work_id(
+    random_work_model: Work, works_add_to_db, async_conn: AsyncClient
+):
+    for mileage in (3000, 1000, 2000):
+        response = await async_conn.post(
+            f"{WORK_EVENTS_API_URL}/",
+            json={
+                "work_date": str(datetime.date.today()),
+                "mileage": mileage,
+                "work_id": random_work_model.id,
+                "part_price": 0,
+                "work_price": 0,
+                "note": "",
+            },
+        )
+        assert response.status_code == 201
+    response = await async_conn.get(
+        f"{WORK_EVENTS_API_URL}/by_work_id/{random_work_model.id}/"
+    )
+    assert response.status_code == 200
+    assert [event["mileage"] for event in response.json()["items"]] == [
+        1000,
+        2000,
+        3000,
+    ]
+
+
+async def post_work_event(
+    async_conn: AsyncClient, work_id: int, work_date: str, mileage: int
+) -> int:
+    response = await async_conn.post(
+        f"{WORK_EVENTS_API_URL}/",
+        json={
+            "work_date": work_date,
+            "mileage": mileage,
+            "work_id": work_id,
+            "part_price": 0,
+            "work_price": 0,
+            "note": "",
+        },
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+async def get_work(work_id: int) -> Work:
+    async for db_session in db_handler.get_db():
+        async with db_session as session:
+            return await session.get(Work, work_id)
+
+
+async def test_work_last_event_columns_follow_events(
+    random_work_model: Work, works_add_to_db, async_conn: AsyncClient
+):
+    work_id = random_work_model.id
+    latest_id = await post_work_event(async_conn, work_id, "2024-05-01", 500)
+    await post_work_event(async_conn, work_id, "2024-01-01", 900)
+    work = await get_work(work_id)
+    assert (work.events_count, work.last_event_mileage) == (2, 500)
+    assert work.last_event_date == datetime.date(2024, 5, 1)
+
+    response = await async_conn.patch(
+        f"{WORK_EVENTS_API_URL}/{latest_id}/",
+        json={"work_date": "2023-01-01"},
+    )
+    assert response.status_code == 200
+    work = await get_work(work_id)
+    assert work.last_event_date == datetime.date(2024, 1, 1)
+    assert work.last_event_mileage == 900
+
+    for event_id in (latest_id, latest_id + 1):
+        response = await async_conn.delete(
+            f"{WORK_EVENTS_API_URL}/{event_id}/"
+        )
+        assert response.status_code == 204
+    work = await get_work(work_id)
+    assert work.events_count == 0
+    assert work.last_event_date is work.last_event_mileage is None
+
+
+async def test_refresh_last_event_repairs_all_works(
+    random_work_model: Work, works_add_to_db, async_conn: AsyncClient
+):
+    await post_work_event(async_conn, random_work_model.id, "2024-05-01", 5)
+    async for db_session in db_handler.get_db():
+        async with db_session as session:
+            await session.execute(
+                update(Work).values(events_count=7, last_event_mileage=1)
+            )
+            await refresh_last_event(session)
+            await session.commit()
+    work = await get_work(random_work_model.id)
+    assert (work.events_count, work.last_event_mileage) == (1, 5)
+
+
+def expected_interval_stats(values: list[float]) -> dict:
+    intervals = np.diff(sorted(values))
+    return {
+        "count": len(intervals),
+        "mean": np.mean(intervals),
+        "median": np.median(intervals),
+        "p90": np.percentile(intervals, 90),
+        "min": np.min(intervals),
+        "max": np.max(intervals),
+        "stddev": np.std(intervals),
+    }
+
+
+async def test_get_interval_stats(
+    random_work_model: Work,
+    works_test_list: list[Work],
+    works_add_to_db,
+    async_conn: AsyncClient,
+):
+    start = datetime.date(2020, 1, 1)
+    events = [
+        WorkEvent(
+            work_id=random_work_model.id,
+            work_date=start + datetime.timedelta(days=random.randint(0, 900)),
+            mileage=random.randint(0, 100000),
+            part_price=0,
+            work_price=0,
+            note="",
+        )
+        for _ in range(random.randint(2, 30))
+    ]
+    async for db_session in db_handler.get_db():
+        async with db_session as session:
+            session.add_all(events)
+            await session.commit()
+    expected = {
+        "km": expected_interval_stats([event.mileage for event in events]),
+        "days": expected_interval_stats(
+            [event.work_date.toordinal() for event in events]
+        ),
+    }
+
+    response = await async_conn.get(
+        f"{WORK_EVENTS_API_URL}/interval_stats/{random_work_model.id}/"
+    )
+    assert response.status_code == 200
+    stats = response.json()
+    for kind, kind_expected in expected.items():
+        for name, value in kind_expected.items():
+            assert abs(stats[kind][name] - value) < 1e-6, (kind, name)
+
+    response = await async_conn.get(
+        f"{WORK_EVENTS_API_URL}/interval_stats/by_vehicle/"
+        f"{random_work_model.vehicle_id}/"
+    )
+    assert response.headers["x-db-statements"] == "1"
+    by_work = {item["work_id"]: item for item in response.json()}
+    assert set(by_work) == {
+        work.id
+        for work in works_test_list
+        if work.vehicle_id == random_work_model.vehicle_id
+    }
+    assert by_work.pop(random_work_model.id) == stats
+    assert all(
+        item["km"]["count"] == item["days"]["count"] == 0
+        for item in by_work.values()
+    )
+
+    response = await async_conn.get(
+        f"{WORK_EVENTS_API_URL}/average_interval/{random_work_model.id}/"
+    )
+    assert response.json() == int(expected["km"]["mean"])
+
+
+async def test_get_interval_stats_of_missing_work(async_conn: AsyncClient):
+    response = await async_conn.get(
+        f"{WORK_EVENTS_API_URL}/interval_stats/10000/"
+    )
+    assert response.status_code == 404
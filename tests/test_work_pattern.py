@@ -3,6 +3,7 @@ import random
 import pytest
 from httpx import AsyncClient
 
+from api_v1.workpatterns.catalog import work_pattern_catalog
 from core.database import db_handler
 from core.models.workpattern import WorkPattern
 from core.schemas.workpattern import WorkPatternBase, WorkPatternSchema
@@ -41,6 +42,21 @@ async def test_create_workpattern(
     )
 
 
+async def test_workpattern_changes_rebuild_catalog(
+    workpattern_create_dict, async_conn: AsyncClient
+):
+    catalog_size = len(work_pattern_catalog)
+    response = await async_conn.post(
+        f"{VEHICLES_API_URL}/", json=workpattern_create_dict
+    )
+    assert len(work_pattern_catalog) == catalog_size + 1
+    assert work_pattern_catalog.get_work_rows(vehicle_id=1)[-1] == dict(
+        workpattern_create_dict, note="", vehicle_id=1
+    )
+    await async_conn.delete(f"{VEHICLES_API_URL}/{response.json()['id']}/")
+    assert len(work_pattern_catalog) == catalog_size
+
+
 async def test_create_blank_workpattern(async_conn: AsyncClient):
     response = await async_conn.post(f"{VEHICLES_API_URL}/", json={})
     assert response.status_code == 422
@@ -63,7 +79,7 @@ async def test_get_all_workpatterns(
     response_schemas_list = sorted(
         [
             WorkPatternSchema(**workpattern_dict)
-            for workpattern_dict in response.json()
+            for workpattern_dict in response.json()["items"]
         ],
         key=lambda x: x.id,
     )
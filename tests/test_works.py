@@ -109,7 +109,7 @@ async def test_get_works_by_vehicle_id(
         json.loads(WorkSchema.model_validate(work).model_dump_json())
         for work in works_model_by_vehicle_id_list
     ]
-    assert response.json() == sorted_works_list
+    assert response.json()["items"] == sorted_works_list
 
 
 async def test_get_non_existent_works_by_vehicle_id(async_conn: AsyncClient):
@@ -117,7 +117,7 @@ async def test_get_non_existent_works_by_vehicle_id(async_conn: AsyncClient):
         f"{WORKS_API_URL}/vehicle_id/{random.randint(1,100)}/",
     )
     assert response.status_code == 200
-    assert response.json() == []
+    assert response.json() == {"items": [], "next_cursor": None}
 
 
 async def test_update_work(